@@ -16,7 +16,7 @@ INSTALL_REQUIRES = [
     'configparser',
     'tqdm',
     'click',
-    'pandas',
+    'pandas>=0.24',
     'flasgger',
     'flask',
     'passlib',
@@ -24,6 +24,10 @@ INSTALL_REQUIRES = [
     'flask-cors'
 ]
 
+EXTRAS_REQUIRE = {
+    'parquet': ['pyarrow'],
+}
+
 ENTRY_POINTS = {
     'console_scripts': [
         'pyhgnc = pyhgnc.cli:main',
@@ -74,6 +78,7 @@ setup(
     packages=PACKAGES,
     include_package_data=True,
     install_requires=INSTALL_REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     package_dir={'': 'src'},
     classifiers=[
         'Development Status :: 5 - Production/Stable',
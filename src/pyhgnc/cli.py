@@ -9,7 +9,7 @@ from . import constants
 
 from .webserver.web import get_app
 from .constants import PYHGNC_DIR
-from .manager import database
+from .manager import database, defaults, columnar
 
 from sqlalchemy import create_engine
 
@@ -62,6 +62,30 @@ def test_connection(conn_str):
         click.secho('\n\n'.join(hint_connection_string))
 
 
+def parse_taxids(ctx, param, value):
+    """parses comma separated NCBI taxonomy identifiers"""
+    if not value:
+        return None
+    try:
+        return [int(taxid) for taxid in value.split(',') if taxid.strip()]
+    except ValueError:
+        raise click.BadParameter('comma separated NCBI taxonomy IDs expected, e.g. 10090,10116,7955')
+
+
+def parse_size(ctx, param, value):
+    """parses a memory size in bytes with optional unit K, M or G (e.g. 800M)"""
+    if not value:
+        return None
+    units = {'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30}
+    value = value.strip().upper().rstrip('B')
+    try:
+        if value[-1:] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(value)
+    except ValueError:
+        raise click.BadParameter('memory size expected, e.g. 800M or 1G')
+
+
 @click.group(help="PyHGNC Command Line Utilities on {}".format(sys.executable))
 @click.version_option()
 def main():
@@ -71,16 +95,60 @@ def main():
 @main.command()
 @click.option('-c', '--connection', help='SQL Alchemy connection string')
 @click.option('-s', '--silent', help="True if want no output (e.g. cron job)", is_flag=True)
-@click.option('--hgnc_file_path', help="Load data from path HGNC")
-@click.option('--hcop_file_path', help="Load data from path HCOP")
-@click.option('-l', '--low_memory', help="set this if you have very low memory available", is_flag=True)
-def update(connection, silent, hgnc_file_path, hcop_file_path, low_memory):
+@click.option('--hgnc_file_path', help="Load data from path (or URL) HGNC")
+@click.option('--hcop_file_path', help="Load data from path (or URL) HCOP")
+@click.option('-l', '--low_memory', help="bounded-memory import: commit in chunks (ORM import)", is_flag=True)
+@click.option('--orm', help="use the (slower) ORM import instead of the bulk insert engine", is_flag=True)
+@click.option('--incremental', help="only update new, changed and withdrawn genes of an existing import",
+              is_flag=True)
+@click.option('--shadow', help="import into a side database/schema and swap it in atomically when finished",
+              is_flag=True)
+@click.option('--hcop_chunksize', type=int, default=defaults.HCOP_CHUNKSIZE, show_default=True,
+              help="number of HCOP rows processed at once (limits memory usage)")
+@click.option('-j', '--jobs', type=int, default=1, show_default=True,
+              help="number of processes which transform the HGNC documents")
+@click.option('-f', '--force', help="import even if HGNC and HCOP have not changed since the last import",
+              is_flag=True)
+@click.option('--no_cache', help="do not cache downloads, stream files from the server", is_flag=True)
+@click.option('--no_sqlite_fast', help="SQLite: keep journal and synchronous writes during full imports",
+              is_flag=True)
+@click.option('--sqlite_in_memory', help="SQLite: build the database in memory and write it to disk when finished",
+              is_flag=True)
+@click.option('--report', 'report_path', type=click.Path(dir_okay=False, writable=True),
+              help="write a JSON report with time, rows and memory per import stage to this path")
+@click.option('--hcop_species', '--hcop-species', callback=parse_taxids,
+              help="only import orthologs of these comma separated NCBI taxonomy IDs (e.g. 10090,10116,7955)")
+@click.option('--no_pipeline', help="run download, parsing and inserting one after another", is_flag=True)
+@click.option('--memory_budget', callback=parse_size,
+              help="target memory of the import (e.g. 800M), chunk sizes are adjusted to it")
+@click.option('--resume', help="continue an interrupted import of the same source files at its last checkpoint "
+                               "(SQLite: disables the fast import pragmas to record checkpoints)", is_flag=True)
+@click.option('--from_snapshot', '--from-snapshot', 'snapshot_path', type=click.Path(exists=True, dir_okay=False),
+              help="restore a snapshot (see 'pyhgnc snapshot export') instead of importing the source files")
+def update(connection, silent, hgnc_file_path, hcop_file_path, low_memory, orm, incremental, shadow, hcop_chunksize,
+           jobs, force, no_cache, no_sqlite_fast, sqlite_in_memory, report_path, hcop_species, no_pipeline,
+           memory_budget, resume, snapshot_path):
     """Update the database"""
     database.update(connection=connection,
                     silent=silent,
                     hgnc_file_path=hgnc_file_path,
                     hcop_file_path=hcop_file_path,
-                    low_memory=low_memory)
+                    low_memory=low_memory,
+                    orm=orm,
+                    incremental=incremental,
+                    shadow=shadow,
+                    hcop_chunksize=hcop_chunksize,
+                    jobs=jobs,
+                    force=force,
+                    cache=not no_cache,
+                    sqlite_fast=not no_sqlite_fast,
+                    sqlite_in_memory=sqlite_in_memory,
+                    report_path=report_path,
+                    hcop_species=hcop_species,
+                    pipelined=not no_pipeline,
+                    memory_budget=memory_budget,
+                    resume=resume,
+                    snapshot_path=snapshot_path)
 
 
 @main.command(help="Set SQL Alchemy connection string, change default " +
@@ -125,6 +193,31 @@ def getcon():
     click.echo(database.BaseDbManager.get_connection_string())
 
 
+@main.group()
+def snapshot():
+    """Export database snapshots"""
+
+
+@snapshot.command('export')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('-c', '--connection', help='SQL Alchemy connection string')
+@click.option('-s', '--silent', help="True if want no output (e.g. cron job)", is_flag=True)
+def export_snapshot(path, connection, silent):
+    """Export all tables and the release into a compressed snapshot file (restore with update --from_snapshot)"""
+    database.export_snapshot(path, connection=connection, silent=silent)
+
+
+@main.command('export')
+@click.argument('directory', type=click.Path(file_okay=False, writable=True))
+@click.option('-f', '--format', 'file_format', type=click.Choice(sorted(columnar.EXPORT_FORMATS)), default='parquet',
+              show_default=True, help="parquet (compressed) or arrow (uncompressed, memory-mappable)")
+@click.option('-c', '--connection', help='SQL Alchemy connection string')
+@click.option('-s', '--silent', help="True if want no output (e.g. cron job)", is_flag=True)
+def export_tables(directory, file_format, connection, silent):
+    """Export every table into a Parquet or Arrow file in DIRECTORY (needs pyarrow)"""
+    database.export_tables(directory, file_format=file_format, connection=connection, silent=silent)
+
+
 @main.group(help="PyBEL Data Manager Utilities")
 def manage():
     pass
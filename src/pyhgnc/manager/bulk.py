@@ -0,0 +1,536 @@
+# -*- coding: utf-8 -*-
+"""Bulk insert engine for HGNC data.
+
+Instead of building a graph of ORM objects for every HGNC document, the documents are converted into flat records
+of plain tuples. Primary keys are assigned up front and the rows are written with batched `executemany` inserts
+using SQLAlchemy Core.
+"""
+
+import re
+import sys
+import logging
+import itertools
+
+from collections import defaultdict, Counter
+from datetime import date
+
+from sqlalchemy import select, func, bindparam
+
+from . import models
+from . import defaults
+from .report import get_rss
+
+log = logging.getLogger('pyhgnc')
+
+DEFAULT_BATCH_SIZE = 10000
+
+REGEX_MGDID = re.compile(r"MGI:(?P<mgdid>\d+)")
+
+# (column in pyhgnc_hgnc, key in HGNC JSON document)
+HGNC_COLUMNS = (
+    ('symbol', 'symbol'),
+    ('name', 'name'),
+    ('status', 'status'),
+    ('orphanet', 'orphanet'),
+    ('uuid', 'uuid'),
+    ('locus_group', 'locus_group'),
+    ('locus_type', 'locus_type'),
+    ('ensembl_gene', 'ensembl_gene_id'),
+    ('horde', 'horde_id'),
+    ('vega', 'vega_id'),
+    ('lncrnadb', 'lncrnadb'),
+    ('entrez', 'entrez_id'),
+    ('mirbase', 'mirbase'),
+    ('iuphar', 'iuphar'),
+    ('ucsc', 'ucsc_id'),
+    ('snornabase', 'snornabase'),
+    ('pseudogeneorg', 'pseudogene.org'),
+    ('bioparadigmsslc', 'bioparadigms_slc'),
+    ('locationsortable', 'location_sortable'),
+    ('merops', 'merops'),
+    ('location', 'location'),
+    ('cosmic', 'cosmic'),
+    ('imgt', 'imgt'),
+)
+
+HGNC_DATE_COLUMNS = (
+    'date_name_changed',
+    'date_modified',
+    'date_symbol_changed',
+    'date_approved_reserved',
+)
+
+# lookup attributes (e.g. status) are written as foreign keys to their lookup tables (see models.HGNC_LOOKUPS)
+HGNC_LOOKUP_MODELS = dict(models.HGNC_LOOKUPS)
+
+HGNC_ROW_COLUMNS = ('id', 'identifier') + tuple(
+    column + '_id' if column in HGNC_LOOKUP_MODELS else column for column, _ in HGNC_COLUMNS
+) + HGNC_DATE_COLUMNS
+
+# (position in the HGNC row (primary key, identifier, HGNC_COLUMNS, ...), lookup table)
+HGNC_LOOKUP_POSITIONS = tuple(
+    (position, HGNC_LOOKUP_MODELS[column].__table__)
+    for position, (column, _) in enumerate(HGNC_COLUMNS, start=2) if column in HGNC_LOOKUP_MODELS
+)
+
+# (key in record, model, columns without id and hgnc_id)
+ONE_TO_MANY = (
+    ('alias_symbols', models.AliasSymbol, ('alias_symbol', 'is_previous_symbol')),
+    ('alias_names', models.AliasName, ('alias_name', 'is_previous_name')),
+    ('omims', models.OMIM, ('omimid',)),
+    ('ccdss', models.CCDS, ('ccdsid',)),
+    ('lsdbs', models.LSDB, ('lsdb', 'url')),
+)
+
+# (key in record, model, association table, columns without id). The first column is the natural key.
+MANY_TO_MANY = (
+    ('gene_families', models.GeneFamily, models.hgnc_gene_family, ('family_identifier', 'family_name')),
+    ('refseqs', models.RefSeq, models.hgnc_refseq, ('accession',)),
+    ('mgds', models.MGD, models.hgnc_mgd, ('mgdid',)),
+    ('rgds', models.RGD, models.hgnc_rgd, ('rgdid',)),
+    ('uniprots', models.UniProt, models.hgnc_uniprot, ('uniprotid',)),
+    ('pubmeds', models.PubMed, models.hgnc_pubmed, ('pubmedid',)),
+    ('enas', models.ENA, models.hgnc_ena, ('enaid',)),
+    ('enzymes', models.Enzyme, models.hgnc_enzyme, ('ec_number',)),
+)
+
+
+def executemany(connection, table, keys, rows):
+    """inserts rows (tuples in the order of `keys`) into a table with one `executemany`
+
+    If the DBAPI uses positional parameters, the tuples are passed directly to the DBAPI cursor (only columns which
+    need type processing are converted), otherwise SQLAlchemy Core is used.
+
+    :param connection: SQLAlchemy connection
+    :param table: :class:`sqlalchemy.Table`
+    :param tuple keys: column names
+    :param list rows: list of tuples
+    """
+    dialect = connection.dialect
+    statement = table.insert()
+    compiled = statement.compile(dialect=dialect, column_keys=list(keys))
+
+    if not compiled.positional or connection.get_execution_options().get('schema_translate_map'):
+        connection.execute(statement, [dict(zip(keys, row)) for row in rows])
+        return
+
+    positions = [keys.index(name) for name in compiled.positiontup]
+    processors = [table.c[keys[i]].type.dialect_impl(dialect).bind_processor(dialect) for i in positions]
+
+    if any(processors):
+        columns = list(zip(positions, processors))
+        rows = [tuple(processor(row[i]) if processor else row[i] for i, processor in columns) for row in rows]
+    elif positions != list(range(len(keys))):
+        rows = [tuple(row[i] for i in positions) for row in rows]
+
+    cursor = connection.connection.cursor()
+    try:
+        cursor.executemany(compiled.string, rows)
+    finally:
+        cursor.close()
+
+
+def get_date(hgnc, key):
+    """returns the date (format: YYYY-mm-dd) of `key` in a HGNC document as :class:`datetime.date` or None"""
+    date_value = hgnc.get(key)
+    if date_value:
+        year, month, day = date_value.split('-')
+        return date(int(year), int(month), int(day))
+
+
+def get_identifier(hgnc):
+    """returns the HGNC identifier (e.g. 5 for 'HGNC:5') of a HGNC document"""
+    return int(hgnc['hgnc_id'].split(':')[-1])
+
+
+def _unique(values):
+    """removes duplicates, but keeps order"""
+    seen = set()
+    return [x for x in values if not (x in seen or seen.add(x))]
+
+
+def doc_to_record(hgnc):
+    """Converts a HGNC JSON document into a flat record of plain values.
+
+    The record only contains builtin types, so it can be pickled and passed between processes.
+
+    :param dict hgnc: one document of the HGNC JSON file (response.docs)
+    :return: record with the keys 'hgnc' and all keys of :data:`ONE_TO_MANY` and :data:`MANY_TO_MANY`
+    :rtype: dict
+    """
+    row = [get_identifier(hgnc)]
+    row += [hgnc.get(json_key) for _, json_key in HGNC_COLUMNS]
+    row += [get_date(hgnc, column) for column in HGNC_DATE_COLUMNS]
+
+    mgds = []
+    for mgd in hgnc.get('mgd_id', ()):
+        mgdid_found = REGEX_MGDID.search(mgd)
+        if mgdid_found:
+            mgds.append((int(mgdid_found.group('mgdid')),))
+
+    return {
+        'hgnc': tuple(row),
+        'alias_symbols': [(x, False) for x in hgnc.get('alias_symbol', ())] +
+                         [(x, True) for x in hgnc.get('prev_symbol', ())],
+        'alias_names': [(x, False) for x in hgnc.get('alias_name', ())] +
+                       [(x, True) for x in hgnc.get('prev_name', ())],
+        'omims': [(int(x),) for x in hgnc.get('omim_id', ())],
+        'ccdss': [(x,) for x in hgnc.get('ccds_id', ())],
+        'lsdbs': [tuple(x.split('|', 1)) for x in hgnc.get('lsdb', ())],
+        'gene_families': _unique(zip(hgnc.get('gene_family_id', ()), hgnc.get('gene_family', ()))),
+        'refseqs': _unique((x,) for x in hgnc.get('refseq_accession', ())),
+        'mgds': _unique(mgds),
+        'rgds': _unique((int(x.split(':')[-1]),) for x in hgnc.get('rgd_id', ())),
+        'uniprots': _unique((x,) for x in hgnc.get('uniprot_ids', ())),
+        'pubmeds': _unique((int(x),) for x in hgnc.get('pubmed_id', ())),
+        'enas': _unique((x,) for x in hgnc.get('ena', ())),
+        'enzymes': _unique((x,) for x in hgnc.get('enzyme_id', ())),
+    }
+
+
+def get_support_rows(prediction_pks, support, resource_pks):
+    """Splits the HCOP column `support` (comma separated resources, e.g. 'Ensembl,HomoloGene') into association
+    rows between predictions and :class:`.models.SupportResource`.
+
+    Every distinct value is split only once (the column is categorical).
+
+    :param list prediction_pks: primary keys of the predictions
+    :param pandas.Series support: column `support` in the order of `prediction_pks`, missing values allowed
+    :param dict resource_pks: primary key per resource name, new resources are added
+    :return: number of resources per prediction, new resource rows (id, name) and association rows
+             (prediction primary key, resource primary key)
+    :rtype: tuple(list, list, list)
+    """
+    support = support.astype('category')
+    next_pk = max(list(resource_pks.values()) or [0]) + 1
+
+    new_resources = []
+    pks_per_code = []
+    for value in support.cat.categories:
+        pks = []
+        for name in value.split(','):
+            name = name.strip()
+            if not name:
+                continue
+            pk = resource_pks.get(name)
+            if pk is None:
+                pk = resource_pks[name] = next_pk
+                next_pk += 1
+                new_resources.append((pk, name))
+            if pk not in pks:
+                pks.append(pk)
+        pks_per_code.append(pks)
+
+    codes = support.cat.codes.tolist()
+    counts = [len(pks_per_code[code]) if code >= 0 else 0 for code in codes]
+    rows = [(pk, resource_pk) for pk, code in zip(prediction_pks, codes) if code >= 0
+            for resource_pk in pks_per_code[code]]
+    return counts, new_resources, rows
+
+
+def iter_chunks(iterable, size):
+    """splits an iterable lazily into chunks (iterators) of `size` items, the last chunk can be smaller
+
+    :param iter iterable: e.g. HGNC records
+    :param int size: items per chunk
+    :return: generator of iterators
+    """
+    iterator = iter(iterable)
+    for first in iterator:
+        chunk = itertools.chain([first], itertools.islice(iterator, size - 1))
+        yield chunk
+        # consume what the caller left over
+        for _ in chunk:
+            pass
+
+
+class InternRegistry(object):
+    """Import-scoped registry of shared entities (RefSeq, UniProt, PubMed, ...) which maps their natural keys to
+    primary keys. Every import creates its own registry and releases it after commit, so repeated imports in one
+    process do not accumulate entries.
+    """
+
+    def __init__(self):
+        self.entries = defaultdict(dict)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, key):
+        """returns the registered value of a natural key or None
+
+        :param str kind: kind of entity (e.g. table name)
+        :param key: natural key
+        """
+        value = self.entries[kind].get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def add(self, kind, key, value):
+        """registers the value (e.g. primary key) of a natural key"""
+        self.entries[kind][key] = value
+
+    def load(self, kind, items):
+        """replaces all entries of a kind with (natural key, value) pairs"""
+        self.entries[kind] = dict(items)
+
+    def discard(self, kind):
+        """removes all entries of a kind"""
+        self.entries.pop(kind, None)
+
+    def clear(self):
+        """releases all entries"""
+        self.entries.clear()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.entries.values())
+
+    @property
+    def hit_rate(self):
+        """fraction of lookups which found an already registered entity"""
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def memory_size(self):
+        """approximate memory size of the registry in bytes (dictionaries, keys and values)"""
+        size = sys.getsizeof(self.entries)
+        for entries in self.entries.values():
+            size += sys.getsizeof(entries)
+            size += sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in entries.items())
+        return size
+
+    def stats(self):
+        """number of entries, hits, misses, hit rate and memory size
+
+        :rtype: dict
+        """
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'memory_size': self.memory_size(),
+        }
+
+
+class AdaptiveChunkSize(object):
+    """Chunk size of a bounded-memory import.
+
+    Without memory budget the chunk size is constant. With a budget the resident memory of the process is checked
+    after every chunk: the chunk size is halved if more than 90% of the budget are used and doubled (up to
+    `maximum`) while less than 50% are used.
+    """
+
+    def __init__(self, size, memory_budget=None, minimum=None, maximum=None):
+        """
+        :param int size: initial chunk size
+        :param int memory_budget: target memory in bytes or None
+        :param int minimum: smallest chunk size; default :data:`defaults.MIN_CHUNKSIZE`
+        :param int maximum: largest chunk size; default :data:`defaults.MAX_CHUNKSIZE`
+        """
+        self.minimum = minimum or defaults.MIN_CHUNKSIZE
+        self.maximum = maximum or defaults.MAX_CHUNKSIZE
+        self.size = max(self.minimum, min(size, self.maximum))
+        self.memory_budget = memory_budget
+
+    def adjust(self):
+        """adjusts the chunk size to the current memory usage (called after every chunk)
+
+        :return: new chunk size
+        :rtype: int
+        """
+        if not self.memory_budget:
+            return self.size
+
+        rss = get_rss()
+        if rss is None:
+            return self.size
+
+        size = self.size
+        if rss > 0.9 * self.memory_budget:
+            size = max(self.minimum, size // 2)
+        elif rss < 0.5 * self.memory_budget:
+            size = min(self.maximum, size * 2)
+
+        if size != self.size:
+            log.info('memory {:.0f} MiB of {:.0f} MiB budget, chunk size {} -> {}'.format(
+                rss / 2.0 ** 20, self.memory_budget / 2.0 ** 20, self.size, size))
+            self.size = size
+        return size
+
+
+class BulkLoader(object):
+    """Assigns primary keys to HGNC records and writes them in batches with `executemany`.
+
+    Shared entities (RefSeq, UniProt, PubMed, ...) are interned by their natural key in an :class:`InternRegistry`,
+    so every entity is inserted only once and all association rows point to the same primary key.
+    """
+
+    def __init__(self, connection, batch_size=DEFAULT_BATCH_SIZE, memory_budget=None):
+        """
+        :param connection: SQLAlchemy connection (should be in a transaction)
+        :param int batch_size: number of buffered rows which triggers a write of all tables
+        :param int memory_budget: target memory in bytes, the batch size is adjusted after every write
+                                  (see :class:`AdaptiveChunkSize`)
+        """
+        self.connection = connection
+        self.batch_size = batch_size
+        self.chunk_size = AdaptiveChunkSize(batch_size, memory_budget=memory_budget,
+                                            maximum=max(batch_size, defaults.MAX_CHUNKSIZE))
+        self.next_id = defaultdict(lambda: 1)
+        self.registry = InternRegistry()
+        self.buffers = defaultdict(list)
+        self.updates = []
+        self.buffered = 0
+        self.row_counts = Counter()
+
+        # tables in the order they have to be written (parent before child) with their column names
+        self.tables = [(model.__table__, ('id', 'name')) for _, model in models.HGNC_LOOKUPS]
+        self.tables.append((models.HGNC.__table__, HGNC_ROW_COLUMNS))
+        for _, model, columns in ONE_TO_MANY:
+            self.tables.append((model.__table__, ('id',) + columns + ('hgnc_id',)))
+        for _, model, association_table, columns in MANY_TO_MANY:
+            self.tables.append((model.__table__, ('id',) + columns))
+            self.tables.append((association_table, tuple(column.name for column in association_table.columns)))
+
+    def load_existing(self):
+        """continues primary keys and interned shared entities of rows already in the database"""
+        for table, _ in self.tables:
+            if 'id' in table.columns:
+                max_id = self.connection.execute(select([func.max(table.c.id)])).scalar()
+                self.next_id[table.name] = (max_id or 0) + 1
+
+        natural_keys = [(model.__table__, 'name') for _, model in models.HGNC_LOOKUPS]
+        natural_keys += [(model.__table__, columns[0]) for _, model, _, columns in MANY_TO_MANY]
+        for table, column in natural_keys:
+            self.registry.load(
+                table.name, ((key, pk) for pk, key in self.connection.execute(select([table.c.id, table.c[column]])))
+            )
+
+    def _new_id(self, table):
+        pk = self.next_id[table.name]
+        self.next_id[table.name] += 1
+        return pk
+
+    def _buffer(self, table, row):
+        self.buffers[table].append(row)
+        self.buffered += 1
+
+    def _lookup_id(self, table, name):
+        """returns the primary key of a lookup table entry (e.g. status 'Approved'), new names are inserted"""
+        if name is None:
+            return None
+        pk = self.registry.entries[table.name].get(name)
+        if pk is None:
+            pk = self._new_id(table)
+            self.registry.add(table.name, name, pk)
+            self._buffer(table, (pk, name))
+        return pk
+
+    def _hgnc_row(self, hgnc_pk, values):
+        """HGNC row of a record with the names of lookup attributes replaced by foreign keys"""
+        row = [hgnc_pk]
+        row.extend(values)
+        for position, table in HGNC_LOOKUP_POSITIONS:
+            row[position] = self._lookup_id(table, row[position])
+        return tuple(row)
+
+    def add(self, record, hgnc_pk=None):
+        """assigns primary keys to a record (see :func:`doc_to_record`) and buffers its rows
+
+        :param dict record: flat HGNC record
+        :param int hgnc_pk: primary key of an existing HGNC row which is updated instead of inserted (child and
+                            association rows of this HGNC row have to be deleted before)
+        :return: primary key of the HGNC row
+        :rtype: int
+        """
+        hgnc_table = models.HGNC.__table__
+        if hgnc_pk is None:
+            hgnc_pk = self._new_id(hgnc_table)
+            self._buffer(hgnc_table, self._hgnc_row(hgnc_pk, record['hgnc']))
+        else:
+            self.updates.append(self._hgnc_row(hgnc_pk, record['hgnc']))
+            self.buffered += 1
+
+        for key, model, _ in ONE_TO_MANY:
+            table = model.__table__
+            for values in record[key]:
+                self._buffer(table, (self._new_id(table),) + values + (hgnc_pk,))
+
+        for key, model, association_table, _ in MANY_TO_MANY:
+            table = model.__table__
+            for values in record[key]:
+                pk = self.registry.get(table.name, values[0])
+                if pk is None:
+                    pk = self._new_id(table)
+                    self.registry.add(table.name, values[0], pk)
+                    self._buffer(table, (pk,) + values)
+                self._buffer(association_table, (hgnc_pk, pk))
+
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+        return hgnc_pk
+
+    def flush(self):
+        """writes all buffered rows with one `executemany` per table"""
+        for table, keys in self.tables:
+            rows = self.buffers.pop(table, None)
+            if rows:
+                executemany(self.connection, table, keys, rows)
+                self.row_counts[table.name] += len(rows)
+
+        if self.updates:
+            hgnc_table = models.HGNC.__table__
+            statement = hgnc_table.update().where(hgnc_table.c.id == bindparam('hgnc_pk'))
+            keys = ('hgnc_pk',) + HGNC_ROW_COLUMNS[1:]
+            self.connection.execute(statement, [dict(zip(keys, row)) for row in self.updates])
+            self.updates = []
+
+        self.buffered = 0
+        self.batch_size = self.chunk_size.adjust()
+
+    def release(self):
+        """logs the statistics of the interning registry and releases it (call after commit)
+
+        :return: statistics of the registry (see :meth:`InternRegistry.stats`)
+        :rtype: dict
+        """
+        stats = self.registry.stats()
+        log.info('interned {entries} shared entities ({memory_size} bytes), hit rate {hit_rate:.1%}'.format(**stats))
+        self.registry.clear()
+        return stats
+
+    def delete_hgncs(self, hgnc_pks, keep_hgnc=False):
+        """deletes HGNC rows with all child and association rows and best orthologs, unlinks their orthology
+        predictions and removes orphaned shared entities
+
+        :param list hgnc_pks: primary keys of HGNC rows
+        :param bool keep_hgnc: only delete child and association rows, but keep the HGNC rows
+        """
+        hgnc_pks = list(hgnc_pks)
+        child_tables = [model.__table__ for _, model, _ in ONE_TO_MANY]
+        child_tables += [association_table for _, _, association_table, _ in MANY_TO_MANY]
+
+        for start in range(0, len(hgnc_pks), self.batch_size):
+            chunk = hgnc_pks[start:start + self.batch_size]
+            for table in child_tables:
+                self.connection.execute(table.delete().where(table.c.hgnc_id.in_(chunk)))
+            if not keep_hgnc:
+                # best orthologs reference the HGNC rows, they are rebuilt by the import (insert_best_orthologs)
+                best_table = models.BestOrtholog.__table__
+                self.connection.execute(best_table.delete().where(best_table.c.hgnc_id.in_(chunk)))
+                # orthology predictions without HGNC entry are kept unlinked (as in a full import)
+                hcop_table = models.OrthologyPrediction.__table__
+                self.connection.execute(hcop_table.update().where(hcop_table.c.hgnc_id.in_(chunk)).values(hgnc_id=None))
+                hgnc_table = models.HGNC.__table__
+                self.connection.execute(hgnc_table.delete().where(hgnc_table.c.id.in_(chunk)))
+
+        for _, model, association_table, _ in MANY_TO_MANY:
+            table = model.__table__
+            foreign_key = [column for column in association_table.columns if column.name != 'hgnc_id'][0]
+            linked = select([foreign_key]).where(foreign_key.isnot(None))
+            self.connection.execute(table.delete().where(~table.c.id.in_(linked)))
+            self.registry.discard(table.name)
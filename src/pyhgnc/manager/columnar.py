@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Columnar export of all tables into Parquet or Arrow IPC files with explicit column types.
+
+Tables are read and written in batches, so the export needs memory for one batch only. Arrow files are written
+uncompressed and can be memory-mapped directly (`pyarrow.ipc.open_file(pyarrow.memory_map(path))`), Parquet files
+are compressed and read with `pyarrow.parquet.read_table(path, memory_map=True)`.
+
+Needs pyarrow (`pip install pyhgnc[parquet]`).
+"""
+
+import os
+import logging
+
+from sqlalchemy import select
+from sqlalchemy import types
+
+from . import snapshot
+from .download import replace_file
+
+log = logging.getLogger('pyhgnc')
+
+# file extension per export format
+EXPORT_FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+EXPORT_BATCH_SIZE = 50000
+
+PARQUET_COMPRESSION = 'snappy'
+
+
+def import_pyarrow():
+    """imports pyarrow (optional dependency)
+
+    :raises ImportError: with installation hint if pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('the columnar export needs pyarrow: pip install pyarrow (or pip install pyhgnc[parquet])')
+    return pyarrow
+
+
+def get_arrow_type(column):
+    """Arrow type of a SQLAlchemy column
+
+    :param sqlalchemy.Column column: table column
+    :rtype: pyarrow.DataType
+    """
+    pyarrow = import_pyarrow()
+
+    column_type = column.type
+    if isinstance(column_type, types.BigInteger):
+        return pyarrow.int64()
+    if isinstance(column_type, types.Integer):
+        return pyarrow.int32()
+    if isinstance(column_type, types.Boolean):
+        return pyarrow.bool_()
+    if isinstance(column_type, types.DateTime):
+        return pyarrow.timestamp('us')
+    if isinstance(column_type, types.Date):
+        return pyarrow.date32()
+    if isinstance(column_type, types.Float):
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+def get_arrow_schema(table):
+    """Arrow schema of a table, primary keys and NOT NULL columns are not nullable
+
+    :param sqlalchemy.Table table: table
+    :rtype: pyarrow.Schema
+    """
+    pyarrow = import_pyarrow()
+    return pyarrow.schema([pyarrow.field(column.name, get_arrow_type(column), nullable=column.nullable)
+                           for column in table.columns])
+
+
+def iter_record_batches(connection, table, schema, batch_size=EXPORT_BATCH_SIZE):
+    """yields the rows of a table as Arrow record batches
+
+    :param connection: SQLAlchemy connection
+    :param sqlalchemy.Table table: table
+    :param pyarrow.Schema schema: schema of the table (see :func:`get_arrow_schema`)
+    :param int batch_size: number of rows per batch
+    :return: generator of pyarrow.RecordBatch
+    """
+    pyarrow = import_pyarrow()
+
+    query = select([table]).order_by(*table.primary_key.columns)
+    result = connection.execution_options(stream_results=True).execute(query)
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            break
+        columns = zip(*rows)
+        arrays = [pyarrow.array(values, type=field.type) for values, field in zip(columns, schema)]
+        yield pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def open_writer(path, schema, file_format):
+    """opens a Parquet or Arrow IPC file writer with `write_table` and `close`"""
+    pyarrow = import_pyarrow()
+
+    if file_format == 'parquet':
+        return pyarrow.parquet.ParquetWriter(path, schema, compression=PARQUET_COMPRESSION)
+    return pyarrow.ipc.new_file(path, schema)
+
+
+def export_tables(engine, directory, file_format='parquet', batch_size=EXPORT_BATCH_SIZE):
+    """exports every table (except app users and import checkpoints) into one Parquet or Arrow file per table
+
+    Every file is written to a temporary file and renamed when finished.
+
+    :param engine: SQLAlchemy engine
+    :param str directory: output directory, created if it does not exist
+    :param str file_format: 'parquet' or 'arrow'
+    :param int batch_size: number of rows read and written at once
+    :return: path and number of rows per table name
+    :rtype: dict
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError('unknown export format {}, use one of {}'.format(file_format, ', '.join(EXPORT_FORMATS)))
+    pyarrow = import_pyarrow()
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    exported = {}
+    with engine.connect() as connection:
+        for table in snapshot.get_snapshot_tables():
+            path = os.path.join(directory, table.name + EXPORT_FORMATS[file_format])
+            part_path = path + '.part'
+            schema = get_arrow_schema(table)
+            number_of_rows = 0
+
+            writer = open_writer(part_path, schema, file_format)
+            try:
+                for batch in iter_record_batches(connection, table, schema, batch_size):
+                    writer.write_table(pyarrow.Table.from_batches([batch]))
+                    number_of_rows += batch.num_rows
+            finally:
+                writer.close()
+            replace_file(part_path, path)
+
+            log.info('exported {} rows of {} to {}'.format(number_of_rows, table.name, path))
+            exported[table.name] = {'path': path, 'rows': number_of_rows}
+
+    return exported
@@ -2,31 +2,38 @@
 """PyHGNC loads HGNC contant into a relational database and provides a RESTFull API."""
 
 import os
-import re
-import sys
 import time
 import logging
 import json
+import sqlite3
+import itertools
+import tempfile
+import multiprocessing
 import pandas
-import numpy
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session, load_only
+from contextlib import contextmanager
+from datetime import datetime
 
-from tqdm import tqdm
-if sys.version_info[0] == 3:
-    from urllib.request import urlopen
-else:
-    from urllib import urlopen
+from sqlalchemy import create_engine, select, func, event, inspect
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.orm import sessionmaker, scoped_session, make_transient_to_detached
 
-from datetime import datetime
+from tqdm import tqdm
 
 from configparser import RawConfigParser, ConfigParser
 
 from pyhgnc import constants
 from . import models
 from . import defaults
-from ..constants import PYHGNC_LOG_DIR, HGNC_JSON
+from . import bulk
+from . import reader
+from . import download
+from . import pipeline
+from . import snapshot
+from . import columnar
+from .report import ImportReport
+from .download import replace_file
+from ..constants import PYHGNC_LOG_DIR, HGNC_JSON, HCOP_GZIP
 
 
 log = logging.getLogger('pyhgnc')
@@ -40,28 +47,82 @@ log.addHandler(fh)
 class BaseDbManager(object):
     """Creates a connection to database and a persistient session using SQLAlchemy"""
 
-    def __init__(self, connection=None, echo=False):
+    def __init__(self, connection=None, echo=False, schema=None):
         """
         :param str connection: SQLAlchemy
         :param bool echo: True or False for SQL output of SQLAlchemy engine
+        :param str schema: use tables in this schema (database in MySQL) instead of the default schema
         """
         try:
             self.connection = self.get_connection_string(connection)
+            self.schema = schema
             self.engine = create_engine(self.connection, echo=echo)
+            if schema:
+                self.engine = self.engine.execution_options(schema_translate_map={None: schema})
             self.sessionmaker = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
             self.session = scoped_session(self.sessionmaker)
         except:
             log.warning('No valid database connection. Execute `pyhgnc connection` on command line')
 
-    def _create_tables(self, checkfirst=True):
+    def _create_tables(self, checkfirst=True, indexes=True):
         """creates all tables from models in your database
 
         :param checkfirst: True or False check if tables already exists
         :type checkfirst: bool
+        :param bool indexes: if False tables are created without indexes (faster bulk loads), create them after the
+                             load with :meth:`_create_indexes`
         :return:
         """
         log.info('create tables in {}'.format(self.engine.url))
-        models.Base.metadata.create_all(self.engine, checkfirst=checkfirst)
+        if indexes:
+            models.Base.metadata.create_all(self.engine, checkfirst=checkfirst)
+            return
+
+        with self.engine.begin() as connection:
+            for table in models.Base.metadata.sorted_tables:
+                if checkfirst and self.engine.dialect.has_table(connection, table.name, schema=self.schema):
+                    continue
+                connection.execute(CreateTable(table))
+
+    def _create_indexes(self):
+        """creates the indexes (incl. unique indexes) of all tables in one pass
+
+        :return:
+        """
+        log.info('create indexes in {}'.format(self.engine.url))
+        with self.engine.begin() as connection:
+            for table in models.Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(connection)
+
+    def optimize(self):
+        """updates the statistics of the query planner (`ANALYZE`) and rebuilds SQLite database files (`VACUUM`)
+
+        :return:
+        """
+        dialect = self.engine.dialect.name
+        tables = [table.name for table in models.Base.metadata.sorted_tables]
+        log.info('optimize {}'.format(self.engine.url))
+
+        if dialect == 'sqlite':
+            # VACUUM is not allowed inside a transaction
+            with self.engine.connect() as connection:
+                connection.execute('ANALYZE')
+                connection.execute('VACUUM')
+
+        elif dialect == 'mysql':
+            prefix = '`{}`.'.format(self.schema) if self.schema else ''
+            with self.engine.begin() as connection:
+                connection.execute('ANALYZE TABLE ' + ', '.join('{}`{}`'.format(prefix, table) for table in tables))
+
+        elif dialect == 'postgresql':
+            prefix = '"{}".'.format(self.schema) if self.schema else ''
+            with self.engine.begin() as connection:
+                for table in tables:
+                    connection.execute('ANALYZE {}"{}"'.format(prefix, table))
+
+        else:
+            log.info('no statistics update for {}'.format(dialect))
 
     def _drop_tables(self):
         """drops all tables in the database
@@ -96,37 +157,676 @@ class BaseDbManager(object):
 
 
 class DbManager(BaseDbManager):
-    enzymes = {}
-    gene_families = {}
-    refseqs = {}
-    mgds = {}
-    uniprots = {}
-    pubmeds = {}
-    enas = {}
-    rgds = {}
-
-    def __init__(self, connection=None):
+
+    def __init__(self, connection=None, schema=None):
         """The DbManager implements all function to upload HGNC data into the database. Prefered SQL Alchemy
         database is MySQL with pymysql.
 
         :param connection: custom database connection SQL Alchemy string
         :type connection: str
+        :param str schema: import into this schema (database in MySQL) instead of the default schema
+        """
+
+        super(DbManager, self).__init__(connection=connection, schema=schema)
+
+        # shared entities of the running ORM import, see insert_hgnc
+        self.registry = None
+
+        # stages of the running (or last) import
+        self.report = ImportReport()
+
+        # source tasks of the running full import if progress is recorded, see _save_checkpoint
+        self.checkpoint_sources = None
+
+    def db_import(self, silent=False, hgnc_file_path=None, hcop_file_path=None, low_memory=False, orm=False,
+                  incremental=False, shadow=False, hcop_chunksize=defaults.HCOP_CHUNKSIZE, jobs=1, force=False,
+                  cache=True, sqlite_fast=True, sqlite_in_memory=False, hcop_species=None, pipelined=True,
+                  memory_budget=None, resume=False):
+        """imports HGNC and HCOP into the database
+
+        Downloads are stored in a cache (:class:`.download.DownloadCache`) and only fetched again if the remote
+        file has changed. If both source files are identical (MD5 checksum) to the already imported release the
+        import is skipped.
+
+        The import is pipelined (see :mod:`.pipeline`): both files are downloaded concurrently, the HGNC import
+        starts as soon as the HGNC file is available (if it has changed), documents are parsed in a background
+        thread while the database writes the previous batch and the HCOP file is parsed while HGNC is inserted.
+        All queues between the stages are bounded.
+
+        Full imports with the bulk insert engine commit every :data:`defaults.CHECKPOINT_INTERVAL` HGNC documents
+        and every HCOP chunk together with a checkpoint (:class:`.models.ImportCheckpoint`). With `resume` an
+        interrupted import of the same source files continues after the last checkpoint instead of starting from
+        scratch. SQLite records checkpoints only with a journal (an interrupted transaction has to be rolled back),
+        so `resume` disables the fast import pragmas (`sqlite_fast`).
+
+        Every stage (download, parse, transform, insert, commit, ...) is measured, see :class:`.report.ImportReport`.
+
+        :param bool silent: no output
+        :param str hgnc_file_path: path or URL of HGNC JSON file; if None :data:`HGNC_JSON` is downloaded
+        :param str hcop_file_path: path or URL of HCOP file; if None :data:`HCOP_GZIP` is downloaded
+        :param bool low_memory: bounded-memory import, the ORM import commits chunks of documents
+                                (see :meth:`insert_hgnc`)
+        :param bool orm: use the (slower) ORM import instead of the bulk insert engine
+        :param bool incremental: only update new, changed and withdrawn HGNC entries of an existing import
+                                 (orthology predictions are reloaded if the HCOP file has changed)
+        :param bool shadow: import into a side database/schema and swap it in atomically
+        :param int hcop_chunksize: number of HCOP rows processed at once
+        :param int jobs: number of processes which transform the HGNC documents
+        :param bool force: import even if the source files have not changed since the last import
+        :param bool cache: use the download cache; if False files are streamed from the server
+        :param bool sqlite_fast: SQLite only, use fast import pragmas for full imports
+                                 (see :meth:`sqlite_import_profile`)
+        :param bool sqlite_in_memory: SQLite only, build the database in memory and write it to the database file
+                                      with the SQLite backup API (full imports, needs memory for the whole database)
+        :param hcop_species: only import orthology predictions of these NCBI taxonomy identifiers
+                             (e.g. [10090, 10116, 7955])
+        :type hcop_species: iter[int] or None
+        :param bool pipelined: overlap download, parsing and inserting; if False all stages run one after another
+        :param int memory_budget: target memory of the process in bytes, chunk and batch sizes are adjusted to it
+                                  (implies `low_memory`)
+        :param bool resume: continue an interrupted import of the same source files at its last checkpoint
+                            (SQLite: implies `sqlite_fast=False`)
+        :return: import report with wall time, CPU time, rows, rows per second, peak RSS and downloaded bytes per
+                 stage; `imported` is False if the import was skipped because the release is already imported
+        :rtype: dict
+        """
+        self.report = ImportReport()
+
+        # a release imported with other species is not the same release
+        hcop_species = sorted(set(int(taxid) for taxid in hcop_species)) if hcop_species else None
+        hcop_parameters = json.dumps({'species': hcop_species}) if hcop_species else None
+
+        sources = self.fetch_sources(hgnc_file_path, hcop_file_path, cache=cache, silent=silent,
+                                     hcop_parameters=hcop_parameters, background=pipelined)
+
+        # a changed HGNC file is imported without waiting for the HCOP download
+        if not force and self.is_imported({'hgnc': sources['hgnc'].result()}) and self.is_imported(
+                {source: task.result() for source, task in sources.items()}):
+            log_text = 'HGNC and HCOP are unchanged since the last import, skip import (use force to import)'
+            log.info(log_text)
+            if not silent:
+                print(log_text)
+            self.report.finish(imported=False)
+            return self.report.to_dict()
+
+        import_kwargs = dict(silent=silent, low_memory=low_memory, orm=orm, hcop_chunksize=hcop_chunksize, jobs=jobs,
+                             sources=sources, sqlite_fast=sqlite_fast, hcop_species=hcop_species, pipelined=pipelined,
+                             memory_budget=memory_budget, resume=resume)
+
+        full_sqlite_import = self.engine.dialect.name == 'sqlite' and not (incremental and self._has_hgnc_data())
+
+        if shadow:
+            self.shadow_import(**import_kwargs)
+        elif sqlite_in_memory and full_sqlite_import:
+            self._memory_import_sqlite(**import_kwargs)
+        else:
+            self._import(incremental=incremental, **import_kwargs)
+
+        self.report.finish(imported=True)
+        self.report.log_summary()
+        return self.report.to_dict()
+
+    def _import(self, sources, silent=False, low_memory=False, orm=False, incremental=False,
+                hcop_chunksize=defaults.HCOP_CHUNKSIZE, jobs=1, sqlite_fast=True, hcop_species=None, pipelined=True,
+                memory_budget=None, resume=False):
+        """imports the sources (see :meth:`fetch_sources`) into this database and saves the release"""
+        hgnc_file_path = sources['hgnc'].result()['path']
+        docs = DbManager.iter_hgnc_docs(hgnc_file_path=hgnc_file_path)
+        incremental = incremental and self._has_hgnc_data()
+        fast_profile = sqlite_fast and not incremental and self.engine.dialect.name == 'sqlite'
+        if fast_profile and resume and not orm:
+            # without journal no checkpoints are recorded, there would be nothing to resume
+            log.info('resumable import: SQLite import pragmas are disabled to record checkpoints')
+            fast_profile = False
+        hcop_chunks = None
+
+        try:
+            with self.sqlite_import_profile(enabled=fast_profile):
+                if incremental:
+                    new_identifiers = self.insert_hgnc_incremental(docs, silent=silent)
+                    # a changed HCOP file is reloaded completely, otherwise predictions of new entries are relinked
+                    # (all others without HGNC entry are reloaded)
+                    hcop_changed = not self.is_imported({'hcop': sources['hcop'].result()})
+                    if hcop_changed or new_identifiers:
+                        self._delete_orthology_predictions(unlinked_only=not hcop_changed)
+                        hcop_chunks = self._iter_hcop_chunks(sources['hcop'], hcop_chunksize, hcop_species,
+                                                             pipelined)
+                        self.insert_hcop(silent=silent, hcop_file_path=sources['hcop'].result()['path'],
+                                         identifiers=None if hcop_changed else new_identifiers, chunks=hcop_chunks)
+                    self.insert_best_orthologs(silent=silent)
+                else:
+                    checkpoint = self.get_checkpoint(sources) if resume and not orm else None
+                    if checkpoint:
+                        log_text = 'Resume interrupted import: {} {} already committed'.format(
+                            checkpoint[1], 'HGNC documents' if checkpoint[0] == 'hgnc' else 'HCOP rows')
+                    else:
+                        log_text = 'No checkpoint of these source files, import from scratch' if resume else None
+                        with self.report.measure('create_tables'):
+                            self._drop_tables()
+                            self._create_tables(indexes=False)
+                    if log_text:
+                        log.info(log_text)
+                        if not silent:
+                            print(log_text)
+
+                    if orm or fast_profile:
+                        log.info('no checkpoints (ORM import or SQLite without journal)')
+                    else:
+                        self.checkpoint_sources = sources
+
+                    stage, committed = checkpoint or ('hgnc', 0)
+
+                    # HCOP is downloaded and parsed while HGNC is inserted
+                    hcop_chunks = self._iter_hcop_chunks(sources['hcop'], hcop_chunksize, hcop_species, pipelined)
+                    if stage == 'hgnc':
+                        self.insert_hgnc(hgnc_dict=docs, silent=silent, low_memory=low_memory, orm=orm, jobs=jobs,
+                                         pipelined=pipelined, memory_budget=memory_budget, skip=committed)
+                    self.insert_hcop(silent=silent, hcop_file_path=sources['hcop'].result()['path'],
+                                     chunks=hcop_chunks, skip=committed if stage == 'hcop' else 0)
+                    self.insert_best_orthologs(silent=silent)
+                    with self.report.measure('create_indexes'):
+                        self._create_indexes()
+
+                self.save_release({source: task.result() for source, task in sources.items()})
+
+                with self.report.measure('optimize'):
+                    self.optimize()
+        finally:
+            self.checkpoint_sources = None
+            if isinstance(hcop_chunks, pipeline.Prefetch):
+                hcop_chunks.close()
+
+    def _delete_orthology_predictions(self, unlinked_only=False):
+        """deletes orthology predictions with their supporting resource and best ortholog rows
+
+        :param bool unlinked_only: only delete predictions without HGNC entry
+        """
+        hcop_table = models.OrthologyPrediction.__table__
+        support_table = models.orthology_prediction_support_resource
+        best_table = models.BestOrtholog.__table__
+
+        with self.engine.begin() as connection:
+            if unlinked_only:
+                unlinked = select([hcop_table.c.id]).where(hcop_table.c.hgnc_id.is_(None))
+                connection.execute(best_table.delete().where(best_table.c.orthologyprediction_id.in_(unlinked)))
+                connection.execute(support_table.delete().where(support_table.c.orthologyprediction_id.in_(unlinked)))
+                connection.execute(hcop_table.delete().where(hcop_table.c.hgnc_id.is_(None)))
+            else:
+                for table in (best_table, support_table, hcop_table):
+                    connection.execute(table.delete())
+
+    def _iter_hcop_chunks(self, source, chunksize, species, pipelined):
+        """HCOP chunks (:func:`.reader.iter_hcop_chunks`) of a source task, parsing is measured as stage
+        'hcop_parse'; if `pipelined` the chunks are read in a background thread which waits for the download"""
+        def iter_chunks():
+            chunks = reader.iter_hcop_chunks(source.result()['path'], chunksize=chunksize, species=species)
+            for df_hcop in self.report.measure_iter('hcop_parse', chunks):
+                yield df_hcop
+
+        if pipelined:
+            return pipeline.Prefetch(iter_chunks(), size=defaults.PIPELINE_HCOP_QUEUE_SIZE)
+        return iter_chunks()
+
+    @contextmanager
+    def sqlite_import_profile(self, enabled=True):
+        """applies the SQLite pragmas :data:`defaults.SQLITE_IMPORT_PRAGMAS` (no rollback journal, no fsync, large
+        page cache, temporary tables in memory) to all connections while the context is active
+
+        Afterwards the pooled connections are closed and the previous journal mode is restored, so the database is
+        used with safe settings again. Only use it for a fresh database, a crash leaves a corrupt file behind.
+        Does nothing for other databases or if `enabled` is False.
+
+        :param bool enabled: apply the pragmas
+        """
+        if not enabled or self.engine.dialect.name != 'sqlite':
+            yield
+            return
+
+        with self.engine.connect() as connection:
+            journal_mode = connection.execute('PRAGMA journal_mode').scalar()
+
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in defaults.SQLITE_IMPORT_PRAGMAS:
+                cursor.execute('PRAGMA ' + pragma)
+            cursor.close()
+
+        log.info('apply SQLite import pragmas: {}'.format(', '.join(defaults.SQLITE_IMPORT_PRAGMAS)))
+        self.session.remove()
+        self.engine.dispose()
+        event.listen(self.engine.pool, 'connect', set_pragmas)
+
+        try:
+            yield
+        finally:
+            event.remove(self.engine.pool, 'connect', set_pragmas)
+            self.session.remove()
+            self.engine.dispose()
+
+            with self.engine.connect() as connection:
+                connection.execute('PRAGMA journal_mode = {}'.format(journal_mode))
+            log.info('restored SQLite journal mode {}'.format(journal_mode))
+
+    def _memory_import_sqlite(self, **import_kwargs):
+        """builds the database in memory and writes it with the SQLite backup API into a side file, which replaces
+        the database file"""
+        database_path = self.engine.url.database
+        if not database_path or database_path == ':memory:':
+            raise ValueError('in-memory import needs a SQLite database file')
+
+        if not hasattr(sqlite3.Connection, 'backup'):
+            log.warning('SQLite backup API not available (Python >= 3.7), import into {}'.format(database_path))
+            return self._import(**import_kwargs)
+
+        # pragmas are pointless in memory and disposing the engine would drop the database
+        memory = DbManager(connection='sqlite://')
+        memory.report = self.report
+        memory._import(**dict(import_kwargs, sqlite_fast=False))
+
+        side_path = database_path + defaults.SHADOW_SUFFIX
+        if os.path.exists(side_path):
+            os.remove(side_path)
+
+        log.info('write in-memory database to {}'.format(database_path))
+        raw_connection = memory.engine.raw_connection()
+        try:
+            with self.report.measure('backup'):
+                destination = sqlite3.connect(side_path)
+                try:
+                    raw_connection.connection.backup(destination)
+                finally:
+                    destination.close()
+        finally:
+            raw_connection.close()
+            memory.session.remove()
+            memory.engine.dispose()
+
+        self.session.remove()
+        replace_file(side_path, database_path)
+        self.engine.dispose()
+
+    def fetch_sources(self, hgnc_file_path=None, hcop_file_path=None, cache=True, silent=False,
+                      hcop_parameters=None, background=True):
+        """starts to resolve the HGNC and HCOP source files (see :meth:`get_source`), with `background` both are
+        downloaded concurrently; the time is measured as stage 'download'
+
+        :param str hgnc_file_path: path or URL of HGNC JSON file; if None :data:`HGNC_JSON`
+        :param str hcop_file_path: path or URL of HCOP file; if None :data:`HCOP_GZIP`
+        :param bool cache: use the download cache
+        :param bool silent: no output
+        :param str hcop_parameters: import parameters of HCOP saved with the release (e.g. selected species)
+        :param bool background: download in background threads
+        :return: dictionary with the keys 'hgnc' and 'hcop' and :class:`.pipeline.Task` as values, the result of
+                 a task is the fingerprint of the file
+        :rtype: dict
         """
+        download_cache = download.DownloadCache() if cache else None
+
+        def fetch(location, parameters=None):
+            with self.report.measure('download'):
+                fingerprint = self.get_source(location, download_cache=download_cache, silent=silent)
+            self.report.add_bytes_downloaded('download', fingerprint.get('bytes_downloaded') or 0)
+            fingerprint['parameters'] = parameters
+            return fingerprint
+
+        return {
+            'hgnc': pipeline.Task(fetch, (hgnc_file_path or HGNC_JSON,), background=background),
+            'hcop': pipeline.Task(fetch, (hcop_file_path or HCOP_GZIP, hcop_parameters), background=background),
+        }
+
+    @staticmethod
+    def get_source(location, download_cache=None, silent=False):
+        """resolves a source file to a local file with size, modification time and checksum
+
+        URLs are fetched with the download cache. Without cache the URLs are returned unchanged (streamed while
+        importing) and have no checksum.
+
+        :param str location: path or URL
+        :param download_cache: download cache or None
+        :type download_cache: :class:`.download.DownloadCache`
+        :param bool silent: no output
+        :return: fingerprint dictionary
+        :rtype: dict
+        """
+        if not download.is_url(location):
+            return download.file_fingerprint(location)
+        if download_cache:
+            return download_cache.fetch(location, silent=silent)
+        return {'location': location, 'path': location, 'size': None, 'last_modified': None, 'md5': None}
+
+    def is_imported(self, sources):
+        """checks if the checksums (and import parameters) of the source files are identical to the imported release
+
+        :param dict sources: source fingerprints (see :meth:`get_source`)
+        :rtype: bool
+        """
+        with self.engine.connect() as connection:
+            if not self.engine.dialect.has_table(connection, models.Release.__tablename__, schema=self.schema):
+                return False
+            release_table = models.Release.__table__
+            imported = {
+                source: (md5, parameters) for source, md5, parameters in connection.execute(
+                    select([release_table.c.source, release_table.c.md5, release_table.c.parameters])
+                )
+            }
+
+        return all(fingerprint['md5'] and imported.get(source) == (fingerprint['md5'], fingerprint.get('parameters'))
+                   for source, fingerprint in sources.items())
+
+    @staticmethod
+    def _get_checkpoint_key(sources, stage):
+        """checksums and parameters of the source files a checkpoint depends on as JSON (HGNC for stage 'hgnc', HGNC
+        and HCOP for stage 'hcop'), None if a checksum is unknown"""
+        names = ['hgnc'] if stage == 'hgnc' else ['hgnc', 'hcop']
+        fingerprints = [(name, sources[name].result()) for name in names]
+        if not all(fingerprint['md5'] for _, fingerprint in fingerprints):
+            return None
+        return json.dumps([[name, fingerprint['md5'], fingerprint.get('parameters')]
+                           for name, fingerprint in fingerprints])
+
+    def _save_checkpoint(self, connection, stage, committed):
+        """records the progress of a resumable import in the transaction of the imported rows
+
+        :param connection: connection in the transaction of the imported rows
+        :param str stage: 'hgnc' or 'hcop'
+        :param int committed: number of committed HGNC documents or HCOP rows
+        """
+        if self.checkpoint_sources is None:
+            return
+        key = self._get_checkpoint_key(self.checkpoint_sources, stage)
+        if key is None:
+            return
+
+        checkpoint_table = models.ImportCheckpoint.__table__
+        connection.execute(checkpoint_table.delete())
+        connection.execute(checkpoint_table.insert(), {'stage': stage, 'committed': committed, 'sources': key,
+                                                       'date_updated': datetime.now()})
+
+    def get_checkpoint(self, sources):
+        """returns the last checkpoint of an interrupted import of the same source files
+
+        :param dict sources: source tasks (see :meth:`fetch_sources`)
+        :return: stage ('hgnc' or 'hcop') and number of committed HGNC documents or HCOP rows or None
+        :rtype: tuple or None
+        """
+        checkpoint_table = models.ImportCheckpoint.__table__
+        with self.engine.connect() as connection:
+            if not self.engine.dialect.has_table(connection, checkpoint_table.name, schema=self.schema):
+                return None
+            row = connection.execute(select([checkpoint_table.c.stage, checkpoint_table.c.committed,
+                                             checkpoint_table.c.sources])).first()
+
+        if row is None or row.sources != self._get_checkpoint_key(sources, row.stage):
+            return None
+        return row.stage, row.committed
+
+    def save_release(self, sources):
+        """saves the fingerprints of the imported source files and removes the checkpoint of the import
+
+        :param dict sources: source fingerprints (see :meth:`get_source`)
+        """
+        release_table = models.Release.__table__
+        date_imported = datetime.now()
+        rows = [{'source': source,
+                 'location': fingerprint['location'],
+                 'size': fingerprint['size'],
+                 'last_modified': fingerprint['last_modified'],
+                 'md5': fingerprint['md5'],
+                 'parameters': fingerprint.get('parameters'),
+                 'date_imported': date_imported} for source, fingerprint in sorted(sources.items())]
+
+        with self.engine.begin() as connection:
+            connection.execute(release_table.delete())
+            connection.execute(release_table.insert(), rows)
+            connection.execute(models.ImportCheckpoint.__table__.delete())
+
+    def shadow_import(self, **import_kwargs):
+        """Imports into a side database file (SQLite) or a shadow schema (MySQL, PostgreSQL) and swaps it in
+        atomically. Readers see either the old or the new release, but never a partial import.
+
+        - SQLite: the import is written to `<database>_shadow` which replaces the database file with a file rename
+        - MySQL: tables are loaded into the database `<database>_shadow` and moved with one `RENAME TABLE`
+        - PostgreSQL: tables are loaded into the schema `pyhgnc_shadow` and moved in one transaction
+
+        .. hint::
+
+            For MySQL and PostgreSQL the database user needs the privilege to create databases/schemas.
+
+        :param import_kwargs: keyword arguments passed to :meth:`_import`
+        """
+        dialect = self.engine.dialect.name
+
+        if dialect == 'sqlite':
+            self._shadow_import_sqlite(**import_kwargs)
+
+        elif dialect in ('mysql', 'postgresql'):
+            self._shadow_import_schema(**import_kwargs)
+
+        else:
+            raise ValueError('shadow import is not supported for {}'.format(dialect))
+
+    def _shadow_import_sqlite(self, **import_kwargs):
+        database_path = self.engine.url.database
+        if not database_path or database_path == ':memory:':
+            raise ValueError('shadow import needs a SQLite database file')
+
+        shadow_path = database_path + defaults.SHADOW_SUFFIX
+        # an interrupted shadow import is resumed in its side file
+        if os.path.exists(shadow_path) and not import_kwargs.get('resume'):
+            os.remove(shadow_path)
+
+        shadow = DbManager(connection='sqlite:///' + shadow_path)
+        shadow.report = self.report
+        shadow._import(**import_kwargs)
+        shadow.session.remove()
+        shadow.engine.dispose()
+
+        log.info('replace {} with {}'.format(database_path, shadow_path))
+        self.session.remove()
+        replace_file(shadow_path, database_path)
+        self.engine.dispose()
+
+    def _shadow_import_schema(self, **import_kwargs):
+        dialect = self.engine.dialect.name
+        tables = [table.name for table in models.Base.metadata.sorted_tables]
+
+        if dialect == 'mysql':
+            target = self.engine.url.database
+            shadow_schema = target + defaults.SHADOW_SUFFIX
+            old_schema = target + defaults.OLD_SUFFIX
+            create_schema, drop_schema = 'CREATE DATABASE IF NOT EXISTS `{}`', 'DROP DATABASE IF EXISTS `{}`'
+        else:
+            with self.engine.connect() as connection:
+                target = connection.execute('SELECT current_schema()').scalar()
+            shadow_schema = 'pyhgnc' + defaults.SHADOW_SUFFIX
+            old_schema = 'pyhgnc' + defaults.OLD_SUFFIX
+            create_schema, drop_schema = 'CREATE SCHEMA IF NOT EXISTS "{}"', 'DROP SCHEMA IF EXISTS "{}" CASCADE'
+
+        with self.engine.begin() as connection:
+            # an interrupted shadow import is resumed in its schema
+            schemas = (old_schema,) if import_kwargs.get('resume') else (shadow_schema, old_schema)
+            for schema in schemas:
+                connection.execute(drop_schema.format(schema))
+            connection.execute(create_schema.format(shadow_schema))
+
+        shadow = DbManager(connection=self.connection, schema=shadow_schema)
+        shadow.report = self.report
+        shadow._import(**import_kwargs)
+        shadow.session.remove()
+        shadow.engine.dispose()
+
+        log.info('swap tables from {} into {}'.format(shadow_schema, target))
+        self.session.remove()
+
+        with self.engine.begin() as connection:
+            existing = [table for table in tables if self.engine.dialect.has_table(connection, table, schema=target)]
+
+            if dialect == 'mysql':
+                connection.execute(create_schema.format(old_schema))
+                renames = ['`{0}`.`{2}` TO `{1}`.`{2}`'.format(target, old_schema, table) for table in existing]
+                renames += ['`{0}`.`{2}` TO `{1}`.`{2}`'.format(shadow_schema, target, table) for table in tables]
+                connection.execute('RENAME TABLE ' + ', '.join(renames))
+            else:
+                connection.execute(create_schema.format(old_schema))
+                for table in existing:
+                    connection.execute('ALTER TABLE "{}"."{}" SET SCHEMA "{}"'.format(target, table, old_schema))
+                for table in tables:
+                    connection.execute('ALTER TABLE "{}"."{}" SET SCHEMA "{}"'.format(shadow_schema, table, target))
+
+        with self.engine.begin() as connection:
+            for schema in (shadow_schema, old_schema):
+                connection.execute(drop_schema.format(schema))
+
+    def export_snapshot(self, path, silent=False):
+        """exports all tables and the release into a compressed, versioned snapshot file (see :mod:`.snapshot`)
+
+        :param str path: path of the snapshot file (e.g. 'pyhgnc.sqlite.gz')
+        :param bool silent: no output
+        :return: snapshot information (format, PyHGNC version, creation time, release, rows per table)
+        :rtype: dict
+        """
+        info = snapshot.export_snapshot(self.engine, path)
+        if not silent:
+            print('Exported snapshot {} ({} rows)'.format(path, sum(info['rows'].values())))
+        return info
+
+    def export_tables(self, directory, file_format='parquet', silent=False):
+        """exports every table into a Parquet or Arrow file in batches (see :mod:`.columnar`)
+
+        :param str directory: output directory
+        :param str file_format: 'parquet' or 'arrow' (uncompressed Arrow IPC files, memory-mappable)
+        :param bool silent: no output
+        :return: path and number of rows per table name
+        :rtype: dict
+        """
+        exported = columnar.export_tables(self.engine, directory, file_format=file_format)
+        if not silent:
+            print('Exported {} tables ({} rows) to {}'.format(
+                len(exported), sum(table['rows'] for table in exported.values()), directory))
+        return exported
 
-        super(DbManager, self).__init__(connection=connection)
+    def restore_snapshot(self, path, silent=False, force=False):
+        """restores a snapshot (see :meth:`export_snapshot`) instead of importing the source files
 
-    def db_import(self, silent=False, hgnc_file_path=None, hcop_file_path=None, low_memory=False):
-        self._drop_tables()
-        self._create_tables()
-        json_data = DbManager.load_hgnc_json(hgnc_file_path=hgnc_file_path)
-        self.insert_hgnc(hgnc_dict=json_data, silent=silent, low_memory=low_memory)
-        self.insert_hcop(silent=silent, hcop_file_path=hcop_file_path)
+        A SQLite database file is replaced by the decompressed snapshot (atomic rename), other databases are bulk
+        loaded from it. The restore is skipped if the release of the snapshot is already imported.
+
+        :param str path: path of the snapshot file
+        :param bool silent: no output
+        :param bool force: restore even if the release of the snapshot is already imported
+        :return: import report (see :meth:`db_import`)
+        :rtype: dict
+        """
+        self.report = ImportReport()
+
+        if snapshot.is_sqlite_file(self.engine):
+            snapshot_path = self.engine.url.database + defaults.SHADOW_SUFFIX
+        else:
+            file_descriptor, snapshot_path = tempfile.mkstemp(suffix='.sqlite')
+            os.close(file_descriptor)
+
+        try:
+            with self.report.measure('snapshot_decompress'):
+                snapshot.decompress_snapshot(path, snapshot_path)
+            info = snapshot.read_snapshot_info(snapshot_path)
+
+            release = {row['source']: row for row in info['release']}
+            if not force and self.is_imported(release):
+                log_text = 'release of snapshot {} is already imported, skip restore (use force)'.format(path)
+                log.info(log_text)
+                if not silent:
+                    print(log_text)
+                self.report.finish(imported=False)
+                return self.report.to_dict()
+
+            log_text = 'Restore snapshot {} (PyHGNC {}, created {})'.format(path, info['pyhgnc_version'],
+                                                                           info['created'])
+            log.info(log_text)
+            if not silent:
+                print(log_text)
+
+            if snapshot.is_sqlite_file(self.engine):
+                snapshot.remove_snapshot_info(snapshot_path)
+                self.session.remove()
+                self.engine.dispose()
+                replace_file(snapshot_path, self.engine.url.database)
+                self.report.add_rows('snapshot_insert', info['rows'])
+            else:
+                self._restore_snapshot_tables(snapshot_path)
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+
+        self.report.finish(imported=True)
+        self.report.log_summary()
+        return self.report.to_dict()
+
+    def _restore_snapshot_tables(self, snapshot_path):
+        """bulk loads all tables of a decompressed snapshot into this database"""
+        with self.report.measure('create_tables'):
+            self._drop_tables()
+            self._create_tables(indexes=False)
+
+        snapshot_engine = create_engine('sqlite:///' + snapshot_path)
+        try:
+            with snapshot_engine.connect() as source_connection, self._transaction('snapshot_commit') as connection:
+                with self.report.measure('snapshot_insert'):
+                    row_counts = snapshot.copy_tables(source_connection, connection, snapshot.get_snapshot_tables())
+        finally:
+            snapshot_engine.dispose()
+        self.report.add_rows('snapshot_insert', row_counts)
+
+        with self.report.measure('create_indexes'):
+            self._create_indexes()
+        with self.report.measure('optimize'):
+            self.optimize()
+
+    def _has_hgnc_data(self):
+        """checks if the HGNC table exists and is not empty"""
+        with self.engine.connect() as connection:
+            if not self.engine.dialect.has_table(connection, models.HGNC.__tablename__, schema=self.schema):
+                return False
+            return connection.execute(select([models.HGNC.__table__.c.id]).limit(1)).first() is not None
+
+    def _intern(self, kind, key, create):
+        """returns the entity of a natural key from the registry of the running ORM import or creates it
+
+        :param str kind: kind of entity
+        :param key: natural key
+        :param create: function which creates the entity
+        """
+        entity = self.registry.get(kind, key)
+        if entity is None:
+            entity = create()
+            self.registry.add(kind, key, entity)
+        elif isinstance(entity, tuple):
+            # committed by a previous chunk, attach a stub with the primary key instead of loading the row
+            model, pk = entity
+            entity = model(id=pk)
+            make_transient_to_detached(entity)
+            self.session.add(entity)
+            self.registry.add(kind, key, entity)
+        return entity
+
+    def _commit_chunk(self):
+        """commits the session of a bounded-memory ORM import and expunges all objects, only the model and primary
+        key of the shared entities are kept in the registry"""
+        self.session.commit()
+        for entries in self.registry.entries.values():
+            for key, entity in entries.items():
+                if not isinstance(entity, tuple):
+                    entries[key] = (type(entity), inspect(entity).identity[0])
+        self.session.expunge_all()
+
+    def get_lookup_entry(self, model, name):
+        """returns the (interned) lookup table entry of a name (e.g. :class:`.models.Status` 'Approved') or None"""
+        if name is None:
+            return None
+        return self._intern(model.__tablename__, name, lambda: model(name=name))
 
     @classmethod
     def get_date(cls, hgnc, key):
-        date_value = hgnc.get(key)
-        if date_value:
-            return datetime.strptime(date_value, "%Y-%m-%d",).date()
+        return bulk.get_date(hgnc, key)
 
     @classmethod
     def get_alias_symbols(cls, hgnc):
@@ -163,12 +863,11 @@ class DbManager(BaseDbManager):
 
                 family_identifier = hgnc['gene_family_id'][i]
 
-                if family_identifier not in self.gene_families:
-
-                    gene_family = models.GeneFamily(family_identifier=family_identifier, family_name=family)
-                    self.gene_families[family_identifier] = gene_family
-
-                gene_families.append(self.gene_families[family_identifier])
+                gene_family = self._intern(
+                    'genefamily', family_identifier,
+                    lambda: models.GeneFamily(family_identifier=family_identifier, family_name=family)
+                )
+                gene_families.append(gene_family)
 
         return gene_families
 
@@ -178,28 +877,21 @@ class DbManager(BaseDbManager):
         if 'refseq_accession' in hgnc:
             for accession in hgnc['refseq_accession']:
 
-                if accession not in self.refseqs:
-                    self.refseqs[accession] = models.RefSeq(accession=accession)
-
-                refseqs.append(self.refseqs[accession])
+                refseqs.append(self._intern('refseq', accession, lambda: models.RefSeq(accession=accession)))
 
         return refseqs
 
     def get_mgds(self, hgnc):
         mgds = []
-        regex_mgdid = re.compile("MGI:(?P<mgdid>\d+)")
-
         if 'mgd_id' in hgnc:
 
             for mgd in hgnc['mgd_id']:
 
-                mgdid_found = regex_mgdid.search(mgd)
+                mgdid_found = bulk.REGEX_MGDID.search(mgd)
 
-                if mgd not in self.mgds and mgdid_found:
-                    mgdid = mgdid_found.groupdict()['mgdid']
-                    self.mgds[mgd] = models.MGD(mgdid=int(mgdid))
                 if mgdid_found:
-                    mgds.append(self.mgds[mgd])
+                    mgdid = int(mgdid_found.groupdict()['mgdid'])
+                    mgds.append(self._intern('mgd', mgd, lambda: models.MGD(mgdid=mgdid)))
         return mgds
 
     def get_rgds(self, hgnc):
@@ -209,11 +901,7 @@ class DbManager(BaseDbManager):
 
             for rgd in hgnc['rgd_id']:
 
-                if rgd not in self.rgds:
-                    rgdid = int(rgd.split(':')[-1])
-                    self.rgds[rgd] = models.RGD(rgdid=rgdid)
-
-                rgds.append(self.rgds[rgd])
+                rgds.append(self._intern('rgd', rgd, lambda: models.RGD(rgdid=int(rgd.split(':')[-1]))))
 
         return rgds
 
@@ -233,10 +921,7 @@ class DbManager(BaseDbManager):
         if 'uniprot_ids' in hgnc:
             for uniprot in hgnc['uniprot_ids']:
 
-                if uniprot not in self.uniprots:
-                    self.uniprots[uniprot] = models.UniProt(uniprotid=uniprot)
-
-                uniprots.append(self.uniprots[uniprot])
+                uniprots.append(self._intern('uniprot', uniprot, lambda: models.UniProt(uniprotid=uniprot)))
 
         return uniprots
 
@@ -255,10 +940,7 @@ class DbManager(BaseDbManager):
         if 'pubmed_id' in hgnc:
             for pubmed in hgnc['pubmed_id']:
 
-                if pubmed not in self.pubmeds:
-                    self.pubmeds[pubmed] = models.PubMed(pubmedid=int(pubmed))
-
-                pubmeds.append(self.pubmeds[pubmed])
+                pubmeds.append(self._intern('pubmed', pubmed, lambda: models.PubMed(pubmedid=int(pubmed))))
 
         return pubmeds
 
@@ -267,10 +949,7 @@ class DbManager(BaseDbManager):
 
         if 'ena' in hgnc:
             for ena in hgnc['ena']:
-                if ena not in self.enas:
-                    self.enas[ena] = models.ENA(enaid=ena)
-
-                enas.append(self.enas[ena])
+                enas.append(self._intern('ena', ena, lambda: models.ENA(enaid=ena)))
 
         return enas
 
@@ -292,27 +971,61 @@ class DbManager(BaseDbManager):
 
             for ec_number in hgnc['enzyme_id']:
 
-                if ec_number not in self.enzymes:
-                    self.enzymes[ec_number] = models.Enzyme(ec_number=ec_number)
-
-                enzymes.append(self.enzymes[ec_number])
+                enzymes.append(self._intern('enzyme', ec_number, lambda: models.Enzyme(ec_number=ec_number)))
 
         return enzymes
 
-    def insert_hgnc(self, hgnc_dict, silent=False, low_memory=False):
+    def insert_hgnc(self, hgnc_dict, silent=False, low_memory=False, orm=False, jobs=1, pipelined=False,
+                    memory_budget=None, skip=0):
+        """inserts HGNC documents into the database
+
+        By default the bulk insert engine (:class:`.bulk.BulkLoader`) is used. With `orm=True` every document is
+        added as :class:`.models.HGNC` object to the session (slow, but kept as fallback).
+
+        Bounded-memory mode (`low_memory` or `memory_budget`): the ORM import commits every
+        :data:`defaults.LOW_MEMORY_CHUNKSIZE` documents and expunges the committed objects from the session. With a
+        memory budget the chunk size (ORM) or batch size (bulk insert engine) is adjusted to the resident memory
+        after every chunk (see :class:`.bulk.AdaptiveChunkSize`).
+
+        :param hgnc_dict: HGNC JSON response with key 'docs' or an iterable of HGNC documents
+                          (e.g. :meth:`iter_hgnc_docs`)
+        :type hgnc_dict: dict or iter
+        :param bool silent: no progress bar
+        :param bool low_memory: commit chunks of documents (only ORM)
+        :param bool orm: use the ORM instead of the bulk insert engine
+        :param int jobs: number of processes which transform the documents (only bulk insert engine)
+        :param bool pipelined: parse the documents in a background thread while inserting
+        :param int memory_budget: target memory of the process in bytes (implies `low_memory`)
+        :param int skip: number of documents already committed by an interrupted import (only bulk insert engine)
+        """
+        docs = hgnc_dict['docs'] if isinstance(hgnc_dict, dict) else hgnc_dict
+
+        if not orm:
+            return self.insert_hgnc_bulk(docs, silent=silent, jobs=jobs, pipelined=pipelined,
+                                         memory_budget=memory_budget, skip=skip)
 
         log.info('low_memory set to {}'.format(low_memory))
 
-        for hgnc_data in tqdm(hgnc_dict['docs'], disable=silent):
+        # the ORM needs the (pending) entity objects, after a chunk commit only their primary keys are kept
+        self.registry = bulk.InternRegistry()
+        number_of_docs = 0
+        chunk_size = None
+        if low_memory or memory_budget:
+            chunk_size = bulk.AdaptiveChunkSize(defaults.LOW_MEMORY_CHUNKSIZE, memory_budget=memory_budget)
+        docs_in_chunk = 0
+
+        docs = self._prefetch(self.report.measure_iter('hgnc_parse', docs), pipelined)
+
+        for hgnc_data in tqdm(docs, disable=silent):
             hgnc_table = {
                 'symbol': hgnc_data['symbol'],
                 'identifier': int(hgnc_data['hgnc_id'].split(':')[-1]),
                 'name': hgnc_data['name'],
-                'status': hgnc_data['status'],
+                'status_entry': self.get_lookup_entry(models.Status, hgnc_data['status']),
                 'orphanet': hgnc_data.get('orphanet'),
-                'uuid': hgnc_data['uuid'],
-                'locus_group': hgnc_data['locus_group'],
-                'locus_type': hgnc_data['locus_type'],
+                'uuid': hgnc_data.get('uuid'),
+                'locus_group_entry': self.get_lookup_entry(models.LocusGroup, hgnc_data['locus_group']),
+                'locus_type_entry': self.get_lookup_entry(models.LocusType, hgnc_data['locus_type']),
                 'ensembl_gene': hgnc_data.get('ensembl_gene_id'),
                 'horde': hgnc_data.get('horde_id'),
                 'vega': hgnc_data.get('vega_id'),
@@ -348,79 +1061,459 @@ class DbManager(BaseDbManager):
                 'enzymes': self.get_enzymes(hgnc_data)
             }
 
-            self.session.add(models.HGNC(**hgnc_table))
-            if low_memory:
-                self.session.flush()
+            with self.report.measure('hgnc_insert'):
+                self.session.add(models.HGNC(**hgnc_table))
+            number_of_docs += 1
+
+            docs_in_chunk += 1
+            if chunk_size and docs_in_chunk >= chunk_size.size:
+                with self.report.measure('hgnc_commit'):
+                    self._commit_chunk()
+                chunk_size.adjust()
+                docs_in_chunk = 0
 
         if not silent:
             print('Insert HGNC data into database')
 
-        self.session.commit()
+        with self.report.measure('hgnc_commit'):
+            self.session.commit()
+        self.report.add_rows('hgnc_insert', {models.HGNC.__tablename__: number_of_docs})
+        log.info('interned {entries} shared entities, hit rate {hit_rate:.1%}'.format(**self.registry.stats()))
+        self.registry = None
+
+    def insert_hgnc_bulk(self, docs, silent=False, batch_size=bulk.DEFAULT_BATCH_SIZE, jobs=1, pipelined=False,
+                         memory_budget=None, skip=0):
+        """inserts HGNC documents as plain rows with batched `executemany` (SQLAlchemy Core)
+
+        Every :data:`defaults.CHECKPOINT_INTERVAL` documents are committed together with a checkpoint of a resumable
+        import (see :meth:`_save_checkpoint`).
+
+        With `jobs > 1` the documents are converted into flat records (:func:`.bulk.doc_to_record`) by a pool of
+        worker processes. The current process is the only writer and dedupes the shared entities. With `pipelined`
+        (and one job) the documents are parsed and transformed in a background thread while rows are written.
+
+        :param iter docs: HGNC JSON documents
+        :param bool silent: no progress bar
+        :param int batch_size: number of buffered rows which triggers a write
+        :param int jobs: number of worker processes
+        :param bool pipelined: parse and transform in a background thread
+        :param int memory_budget: target memory of the process in bytes, the batch size is adjusted after every write
+        :param int skip: number of documents already committed by an interrupted import; primary keys and shared
+                         entities are continued from the database
+        :return: number of inserted rows per table
+        :rtype: collections.Counter
+        """
+        if skip:
+            log.info('skip {} already committed HGNC documents'.format(skip))
+            docs = itertools.islice(docs, skip, None)
+
+        pool = None
+        if jobs > 1:
+            log.info('transform HGNC documents with {} processes'.format(jobs))
+            pool = multiprocessing.Pool(jobs)
+            # documents are parsed by the feeder thread of the pool, waiting for records counts as transform
+            records = pool.imap(bulk.doc_to_record, docs, chunksize=defaults.JOBS_CHUNKSIZE)
+            records = self.report.measure_iter('hgnc_transform', records)
+        else:
+            records = self._prefetch(self._iter_records(self.report.measure_iter('hgnc_parse', docs)), pipelined)
 
-    def insert_hcop(self, silent=False, hcop_file_path=None):
+        loader = bulk.BulkLoader(None, batch_size=batch_size, memory_budget=memory_budget)
+        committed = skip
 
+        try:
+            if skip:
+                with self.engine.connect() as connection:
+                    loader.connection = connection
+                    loader.load_existing()
+
+            for chunk in bulk.iter_chunks(tqdm(records, disable=silent), defaults.CHECKPOINT_INTERVAL):
+                with self._transaction('hgnc_commit') as connection:
+                    loader.connection = connection
+
+                    for record in chunk:
+                        with self.report.measure('hgnc_insert'):
+                            loader.add(record)
+                        committed += 1
+
+                    with self.report.measure('hgnc_insert'):
+                        loader.flush()
+                    self._save_checkpoint(connection, 'hgnc', committed)
+
+            if not silent:
+                print('Inserted HGNC data into database')
+        finally:
+            loader.connection = None
+            if pool:
+                pool.terminate()
+                pool.join()
+            if isinstance(records, pipeline.Prefetch):
+                records.close()
+
+        loader.release()
+        self.report.add_rows('hgnc_insert', loader.row_counts)
+        log.info('inserted rows: {}'.format(dict(loader.row_counts)))
+        return loader.row_counts
+
+    @contextmanager
+    def _transaction(self, commit_stage):
+        """like :meth:`Engine.begin`, but the commit is measured as stage of the import report
+
+        :param str commit_stage: name of the stage
+        """
+        with self.engine.connect() as connection:
+            transaction = connection.begin()
+            try:
+                yield connection
+            except BaseException:
+                transaction.rollback()
+                raise
+            with self.report.measure(commit_stage):
+                transaction.commit()
+
+    @staticmethod
+    def _prefetch(iterable, enabled):
+        """iterates HGNC documents or records in a background thread (:class:`.pipeline.Prefetch`) if `enabled`"""
+        if not enabled:
+            return iterable
+        return pipeline.Prefetch(iterable, size=defaults.PIPELINE_QUEUE_SIZE, batch_size=defaults.PIPELINE_BATCH_SIZE)
+
+    def _iter_records(self, docs):
+        """converts HGNC documents into flat records (:func:`.bulk.doc_to_record`) and measures the transformation"""
+        for hgnc_data in docs:
+            with self.report.measure('hgnc_transform'):
+                record = bulk.doc_to_record(hgnc_data)
+            yield record
+
+    def insert_hgnc_incremental(self, docs, silent=False, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        """updates only new, changed and withdrawn HGNC entries of an already imported release
+
+        A document counts as changed if its `uuid` or `date_modified` differs from the row in the database.
+        Changed HGNC rows are updated in place (primary key and orthology predictions are kept), their child and
+        association rows are replaced. HGNC rows not in `docs` anymore are deleted with all related rows.
+
+        :param iter docs: HGNC JSON documents
+        :param bool silent: no progress bar
+        :param int batch_size: number of buffered rows which triggers a write
+        :return: HGNC identifiers of new entries
+        :rtype: set[int]
+        """
+        hgnc_table = models.HGNC.__table__
+
+        with self._transaction('hgnc_commit') as connection:
+            existing = {
+                identifier: (pk, uuid, date_modified)
+                for pk, identifier, uuid, date_modified in connection.execute(
+                    select([hgnc_table.c.id, hgnc_table.c.identifier, hgnc_table.c.uuid, hgnc_table.c.date_modified])
+                )
+            }
+
+            seen, new_records, changed_records = set(), [], []
+
+            for hgnc_data in tqdm(self.report.measure_iter('hgnc_parse', docs), disable=silent):
+                identifier = bulk.get_identifier(hgnc_data)
+                seen.add(identifier)
+
+                with self.report.measure('hgnc_transform'):
+                    if identifier not in existing:
+                        new_records.append(bulk.doc_to_record(hgnc_data))
+                        continue
+
+                    pk, uuid, date_modified = existing[identifier]
+                    if uuid != hgnc_data.get('uuid') or date_modified != bulk.get_date(hgnc_data, 'date_modified'):
+                        changed_records.append((pk, bulk.doc_to_record(hgnc_data)))
+
+            deleted_pks = [pk for identifier, (pk, _, _) in existing.items() if identifier not in seen]
+
+            log_text = 'Incremental update: {} new, {} changed, {} deleted HGNC entries'.format(
+                len(new_records), len(changed_records), len(deleted_pks))
+            log.info(log_text)
+            if not silent:
+                print(log_text)
+
+            with self.report.measure('hgnc_delete'):
+                loader = bulk.BulkLoader(connection, batch_size=batch_size)
+                loader.delete_hgncs([pk for pk, _ in changed_records], keep_hgnc=True)
+                loader.delete_hgncs(deleted_pks)
+                loader.load_existing()
+
+            with self.report.measure('hgnc_insert'):
+                for pk, record in changed_records:
+                    loader.add(record, hgnc_pk=pk)
+
+                for record in new_records:
+                    loader.add(record)
+
+                loader.flush()
+
+        loader.release()
+        self.report.add_rows('hgnc_insert', loader.row_counts)
+        return {record['hgnc'][0] for record in new_records}
+
+    def insert_hcop(self, silent=False, hcop_file_path=None, identifiers=None, chunksize=defaults.HCOP_CHUNKSIZE,
+                    species=None, chunks=None, skip=0):
+        """inserts HCOP orthology predictions and links them to the HGNC entries
+
+        The HCOP file is streamed in chunks of `chunksize` rows. Every chunk is cleaned, mapped to the primary keys
+        of the HGNC entries, inserted with `executemany` and committed (with a checkpoint of a resumable import), so
+        memory usage only depends on the chunk size.
+
+        :param bool silent: no output
+        :param str hcop_file_path: path to local HCOP file; if None the file is downloaded
+        :param identifiers: if set, only predictions of these HGNC identifiers and predictions without HGNC entry
+                            are inserted
+        :type identifiers: set[int] or None
+        :param int chunksize: number of rows read, cleaned and inserted at once
+        :param species: only predictions of these NCBI taxonomy identifiers, other species are skipped while reading
+        :type species: iter[int] or None
+        :param chunks: already opened chunks of the HCOP file (e.g. read ahead in a background thread, see
+                       :meth:`_iter_hcop_chunks`); if None `hcop_file_path` is read
+        :type chunks: iter[pandas.DataFrame] or None
+        :param int skip: number of HCOP rows already committed by an interrupted import (independent of the chunk
+                         size)
+        :return: number of inserted rows
+        :rtype: int
+        """
         log_text = 'Load OrthologyPrediction data from {}'.format((hcop_file_path or constants.HCOP_GZIP))
         log.info(log_text)
         if not silent:
             print(log_text)
 
-        df_hcop = pandas.read_table((hcop_file_path or constants.HCOP_GZIP), low_memory=False)
-        df_hcop.replace('-', numpy.NaN, inplace=True)
-        df_hcop.replace(to_replace={'hgnc_id': 'HGNC:'}, value='', regex=True, inplace=True)
-        df_hcop.hgnc_id = df_hcop.hgnc_id.fillna(-1).astype(int)
-        df_hcop.rename(columns={'hgnc_id': 'identifier'}, inplace=True)
-        df_hcop.set_index('identifier', inplace=True)
-
-        log_text = 'Join HGNC with HGNC'
+        hgnc_table = models.HGNC.__table__
+        hcop_table = models.OrthologyPrediction.__table__
+        resource_table = models.SupportResource.__table__
+        support_table = models.orthology_prediction_support_resource
+
+        number_of_rows = 0
+        number_of_support_rows = 0
+        number_of_resources = 0
+
+        with self.engine.connect() as connection:
+            hgnc_pks = dict(connection.execute(select([hgnc_table.c.identifier, hgnc_table.c.id])).fetchall())
+            next_id = 1 + (connection.execute(select([func.max(hcop_table.c.id)])).scalar() or 0)
+            resource_pks = dict(connection.execute(select([resource_table.c.name, resource_table.c.id])).fetchall())
+
+        if chunks is None:
+            chunks = reader.iter_hcop_chunks(hcop_file_path, chunksize=chunksize, species=species)
+            chunks = self.report.measure_iter('hcop_parse', chunks)
+
+        if skip:
+            log.info('skip {} already committed HCOP rows'.format(skip))
+            chunks = reader.skip_rows(chunks, skip)
+        committed = skip
+
+        for df_hcop in tqdm(chunks, disable=silent, unit='chunk'):
+            number_of_chunk_rows = len(df_hcop)
+            with self.report.measure('hcop_transform'):
+                identifier = df_hcop.pop('identifier')
+                df_hcop['hgnc_id'] = identifier.map(hgnc_pks).astype('Int64')
+
+                if identifiers is not None:
+                    df_hcop = df_hcop[identifier.isin(identifiers) | df_hcop.hgnc_id.isnull()]
+
+                df_hcop.index = pandas.RangeIndex(next_id, next_id + len(df_hcop), name='id')
+                next_id += len(df_hcop)
+
+                support_counts, new_resources, support_rows = bulk.get_support_rows(
+                    list(df_hcop.index), df_hcop.support, resource_pks)
+                df_hcop = df_hcop.assign(support_count=support_counts)
+
+                df_hcop = df_hcop.reset_index()
+                rows = self._df_to_rows(df_hcop)
+
+            with self._transaction('hcop_commit') as connection:
+                with self.report.measure('hcop_insert'):
+                    if new_resources:
+                        bulk.executemany(connection, resource_table, ('id', 'name'), new_resources)
+                    if rows:
+                        bulk.executemany(connection, hcop_table, tuple(df_hcop.columns), rows)
+                    if support_rows:
+                        bulk.executemany(connection, support_table, ('orthologyprediction_id', 'supportresource_id'),
+                                         support_rows)
+                committed += number_of_chunk_rows
+                self._save_checkpoint(connection, 'hcop', committed)
+            number_of_rows += len(rows)
+            number_of_support_rows += len(support_rows)
+            number_of_resources += len(new_resources)
+
+        self.report.add_rows('hcop_insert', {
+            hcop_table.name: number_of_rows,
+            support_table.name: number_of_support_rows,
+            resource_table.name: number_of_resources,
+        })
+
+        stage = self.report.get_stage('hcop_insert')
+        log_text = 'Inserted {} OrthologyPrediction rows in {:.1f}s'.format(number_of_rows, stage.wall_time)
         log.info(log_text)
         if not silent:
             print(log_text)
 
-        data = self.session.query(models.HGNC).options(load_only(models.HGNC.id, models.HGNC.identifier))
-        data = [{'hgnc_id': x.id, 'identifier': x.identifier} for x in data]
-        df_hgnc = pandas.DataFrame(data)
-        df_hgnc.set_index('identifier', inplace=True)
+        return number_of_rows
+
+    def insert_best_orthologs(self, silent=False, batch_size=bulk.DEFAULT_BATCH_SIZE):
+        """materializes the best supported orthology prediction of every HGNC entry per species
+        (:class:`.models.BestOrtholog`)
 
-        df_hcnp4db = df_hcop.join(df_hgnc)
-        df_hcnp4db.reset_index(inplace=True)
-        df_hcnp4db.index += 1
-        df_hcnp4db.drop('identifier', axis=1, inplace=True)
-        df_hcnp4db.index.rename('id', inplace=True)
+        The linked predictions are streamed sorted by HGNC entry, species, support count (descending) and primary
+        key; the first prediction of every HGNC entry and species is kept. The table is rebuilt completely, also by
+        incremental imports.
 
-        log_text = 'Load OrthologyPrediction data in database'
+        :param bool silent: no output
+        :param int batch_size: number of rows written at once
+        :return: number of inserted rows
+        :rtype: int
+        """
+        hcop_table = models.OrthologyPrediction.__table__
+        best_table = models.BestOrtholog.__table__
+
+        columns = ('hgnc_id', 'ortholog_species', 'support_count', 'ortholog_species_symbol',
+                   'ortholog_species_entrez_gene', 'ortholog_species_ensembl_gene', 'ortholog_species_db_id')
+        keys = ('id', 'orthologyprediction_id') + columns
+        query = select([hcop_table.c.id] + [hcop_table.c[column] for column in columns]).where(
+            hcop_table.c.hgnc_id.isnot(None)
+        ).order_by(
+            hcop_table.c.hgnc_id, hcop_table.c.ortholog_species, hcop_table.c.support_count.desc(), hcop_table.c.id
+        )
+
+        number_of_rows = 0
+        with self._transaction('best_ortholog_commit') as connection:
+            with self.report.measure('best_ortholog'):
+                connection.execute(best_table.delete())
+
+                result = connection.execute(query)
+                last_key = None
+                while True:
+                    predictions = result.fetchmany(batch_size)
+                    if not predictions:
+                        break
+                    rows = []
+                    for prediction in predictions:
+                        key = (prediction[1], prediction[2])
+                        if key != last_key:
+                            last_key = key
+                            number_of_rows += 1
+                            rows.append((number_of_rows,) + tuple(prediction))
+                    if rows:
+                        bulk.executemany(connection, best_table, keys, rows)
+
+        self.report.add_rows('best_ortholog', {best_table.name: number_of_rows})
+
+        log_text = 'Inserted {} best orthologs'.format(number_of_rows)
         log.info(log_text)
         if not silent:
             print(log_text)
 
-        df_hcnp4db.to_sql(name=models.OrthologyPrediction.__tablename__, con=self.connection, if_exists='append')
+        return number_of_rows
 
     @staticmethod
-    def load_hgnc_json(hgnc_file_path=None):
+    def _df_to_rows(df):
+        """converts a DataFrame into a list of tuples with builtin Python types (NaN -> None)"""
+        df = df.astype(object).where(df.notnull(), None)
+        return list(df.itertuples(index=False, name=None))
 
-        if hgnc_file_path:
-            with open(hgnc_file_path) as response:
-                log.info('loading json data from {}'.format(hgnc_file_path))
-                hgnc_dict = json.loads(response.read())
-        else:
-            response = urlopen(HGNC_JSON)
-            hgnc_dict = json.loads(response.read().decode())
+    @staticmethod
+    def iter_hgnc_docs(hgnc_file_path=None):
+        """streams the HGNC JSON file and yields one document (response.docs) at a time
 
-        return hgnc_dict['response']
+        :param str hgnc_file_path: path to local file; if None the file is downloaded
+        :return: generator of dict
+        """
+        return reader.iter_hgnc_docs(hgnc_file_path=hgnc_file_path)
 
 
-def update(connection=None, silent=False, hgnc_file_path=None, hcop_file_path=None, low_memory=False):
+def update(connection=None, silent=False, hgnc_file_path=None, hcop_file_path=None, low_memory=False, orm=False,
+           incremental=False, shadow=False, hcop_chunksize=defaults.HCOP_CHUNKSIZE, jobs=1, force=False, cache=True,
+           sqlite_fast=True, sqlite_in_memory=False, report_path=None, hcop_species=None, pipelined=True,
+           memory_budget=None, resume=False, snapshot_path=None):
     """Update the database with current version of HGNC
 
     :param str connection: conncetion string
     :param bool silent: silent while import
     :param str hgnc_file_path: import from path HGNC
     :param str hcop_file_path: import from path HCOP (orthologs)
-    :param bool low_memory: set to `True` if you have low memory
-    :return:
+    :param bool low_memory: bounded-memory import, the ORM import commits chunks of documents
+    :param bool orm: use the (slower) ORM import instead of the bulk insert engine
+    :param bool incremental: only update new, changed and withdrawn HGNC entries of an existing import
+                             (orthology predictions are reloaded if the HCOP file has changed)
+    :param bool shadow: import into a side database/schema and swap it in atomically (no downtime for readers)
+    :param int hcop_chunksize: number of HCOP rows processed at once (limits memory usage)
+    :param int jobs: number of processes which transform the HGNC documents
+    :param bool force: import even if HGNC and HCOP have not changed since the last import
+    :param bool cache: keep downloads in a cache and fetch them again only if they have changed
+    :param bool sqlite_fast: SQLite only, use fast import pragmas (no journal, no fsync) for full imports
+    :param bool sqlite_in_memory: SQLite only, build the database in memory and write it to disk when finished
+    :param str report_path: write the import report as JSON to this path
+    :param hcop_species: only import orthology predictions of these NCBI taxonomy identifiers
+                         (e.g. [10090, 10116, 7955] for mouse, rat and zebrafish)
+    :type hcop_species: iter[int] or None
+    :param bool pipelined: download both files concurrently and parse while inserting
+    :param int memory_budget: target memory of the import in bytes (e.g. 800 * 2 ** 20 in a 1 GB container)
+    :param bool resume: continue an interrupted import of the same source files at its last checkpoint
+                        (SQLite: implies `sqlite_fast=False`)
+    :param str snapshot_path: restore this snapshot (see :func:`export_snapshot`) instead of importing the source
+                              files
+    :return: import report (see :meth:`DbManager.db_import`)
+    :rtype: dict
+    """
+    database = DbManager(connection)
+
+    if snapshot_path:
+        report = database.restore_snapshot(snapshot_path, silent=silent, force=force)
+        database.session.close()
+        if report_path:
+            database.report.write(report_path)
+        return report
+
+    report = database.db_import(silent=silent, hgnc_file_path=hgnc_file_path, hcop_file_path=hcop_file_path,
+                                low_memory=low_memory, orm=orm, incremental=incremental, shadow=shadow,
+                                hcop_chunksize=hcop_chunksize, jobs=jobs, force=force, cache=cache,
+                                sqlite_fast=sqlite_fast, sqlite_in_memory=sqlite_in_memory, hcop_species=hcop_species,
+                                pipelined=pipelined, memory_budget=memory_budget, resume=resume)
+    database.session.close()
+
+    if report_path:
+        database.report.write(report_path)
+
+    return report
+
+
+def export_snapshot(path, connection=None, silent=False):
+    """Export the imported database into a compressed snapshot file which other installations restore with
+    `update(snapshot_path=path)`
+
+    :param str path: path of the snapshot file (e.g. 'pyhgnc.sqlite.gz')
+    :param str connection: connection string
+    :param bool silent: no output
+    :return: snapshot information (format, PyHGNC version, creation time, release, rows per table)
+    :rtype: dict
+    """
+    database = DbManager(connection)
+    info = database.export_snapshot(path, silent=silent)
+    database.session.close()
+    return info
+
+
+def export_tables(directory, file_format='parquet', connection=None, silent=False):
+    """Export every table of the database into one Parquet or Arrow file per table (needs pyarrow)
+
+    .. code-block:: python
+
+        import pyarrow
+        import pyhgnc
+
+        pyhgnc.manager.database.export_tables('pyhgnc_arrow', file_format='arrow')
+        hgnc = pyarrow.ipc.open_file(pyarrow.memory_map('pyhgnc_arrow/pyhgnc_hgnc.arrow')).read_all()
+
+    :param str directory: output directory
+    :param str file_format: 'parquet' or 'arrow'
+    :param str connection: connection string
+    :param bool silent: no output
+    :return: path and number of rows per table name
+    :rtype: dict
     """
     database = DbManager(connection)
-    database.db_import(silent=silent, hgnc_file_path=hgnc_file_path, hcop_file_path=hcop_file_path, low_memory=low_memory)
+    exported = database.export_tables(directory, file_format=file_format, silent=silent)
     database.session.close()
+    return exported
 
 
 def set_connection(connection=defaults.sqlalchemy_connection_string_default):
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""Cache of downloaded HGNC/HCOP files which are only fetched again if the remote file has changed."""
+
+import os
+import sys
+import json
+import ftplib
+import hashlib
+import logging
+import tempfile
+import threading
+
+from email.utils import formatdate
+
+if sys.version_info[0] == 3:
+    from urllib.request import urlopen, Request
+    from urllib.error import HTTPError
+    from urllib.parse import urlparse
+else:
+    from urllib2 import urlopen, Request, HTTPError
+    from urlparse import urlparse
+
+from . import defaults
+
+log = logging.getLogger('pyhgnc')
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
+def replace_file(source, destination):
+    """renames source to destination (atomic on POSIX, replaces an existing destination)"""
+    if sys.version_info[0] == 3:
+        os.replace(source, destination)
+    else:
+        os.rename(source, destination)
+
+
+def is_url(location):
+    """checks if location is an URL (e.g. 'ftp://...', 'https://...', 'file:///...') and not a local path"""
+    return '://' in location
+
+
+def md5sum(path):
+    """calculates the MD5 checksum of a file without loading it into memory
+
+    :param str path: path to file
+    :rtype: str
+    """
+    md5 = hashlib.md5()
+    with open(path, 'rb') as source_file:
+        for chunk in iter(lambda: source_file.read(DOWNLOAD_CHUNK_SIZE), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def file_fingerprint(path):
+    """size, modification time and checksum of a local file
+
+    :param str path: path to file
+    :rtype: dict
+    """
+    stat = os.stat(path)
+    return {
+        'location': path,
+        'path': path,
+        'size': stat.st_size,
+        'last_modified': formatdate(stat.st_mtime, usegmt=True),
+        'md5': md5sum(path),
+        'bytes_downloaded': 0,
+    }
+
+
+def ftp_validators(url):
+    """size and modification time (MDTM) of a file on a FTP server
+
+    :param str url: FTP URL
+    :return: size and modification time or (None, None) if the server does not answer
+    :rtype: tuple
+    """
+    parsed = urlparse(url)
+    try:
+        ftp = ftplib.FTP(parsed.hostname, timeout=60)
+        try:
+            ftp.login(parsed.username or 'anonymous', parsed.password or '')
+            ftp.voidcmd('TYPE I')
+            size = ftp.size(parsed.path)
+            last_modified = ftp.voidcmd('MDTM ' + parsed.path).split()[-1]
+        finally:
+            ftp.close()
+    except ftplib.all_errors as error:
+        log.warning('no size/modification time of {}: {}'.format(url, error))
+        return None, None
+    return size, last_modified
+
+
+class DownloadCache(object):
+    """Stores downloaded files in :data:`defaults.DOWNLOAD_CACHE_DIR` together with size, modification time,
+    ETag and MD5 checksum (`index.json`, keyed by URL).
+
+    A file is downloaded again only if the remote file has changed:
+
+    - HTTP(S): conditional request with `If-None-Match`/`If-Modified-Since` (304 means unchanged)
+    - FTP: size and modification time (MDTM) are compared before the download
+    - file: size and modification time are compared
+
+    If the server provides no size or modification time the file is downloaded and compared by checksum. Several
+    files can be fetched concurrently (threads), updates of the index are serialized.
+    """
+
+    index_lock = threading.Lock()
+
+    def __init__(self, cache_dir=None):
+        """
+        :param str cache_dir: folder of cached files; default :data:`defaults.DOWNLOAD_CACHE_DIR`
+        """
+        self.cache_dir = cache_dir or defaults.DOWNLOAD_CACHE_DIR
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as index_file:
+            return json.load(index_file)
+
+    def _save_index(self, index):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as index_file:
+            json.dump(index, index_file, indent=2, sort_keys=True)
+        replace_file(tmp_path, self.index_path)
+
+    def get(self, url):
+        """returns the cache entry of an URL or None if the file is not cached
+
+        :param str url: URL
+        :rtype: dict or None
+        """
+        entry = self._load_index().get(url)
+        if entry and os.path.exists(entry['path']):
+            return entry
+
+    def get_path(self, url):
+        """path of the cached file of an URL; the file name keeps the extension (e.g. `.gz`) of the URL"""
+        name = os.path.basename(urlparse(url).path) or 'download'
+        return os.path.join(self.cache_dir, hashlib.md5(url.encode('utf-8')).hexdigest()[:12] + '_' + name)
+
+    def fetch(self, url, silent=False):
+        """returns the cache entry of an URL, downloads the file only if it is not cached or has changed
+
+        The entry contains `path`, `size`, `last_modified`, `etag`, `md5`, `changed` (True if the content is
+        different from the previously cached file) and `bytes_downloaded`.
+
+        :param str url: URL of the file
+        :param bool silent: no output
+        :rtype: dict
+        """
+        entry = self.get(url)
+        request = Request(url)
+
+        ftp_size, ftp_last_modified = ftp_validators(url) if url.startswith('ftp://') else (None, None)
+
+        if entry and url.startswith('http'):
+            if entry.get('etag'):
+                request.add_header('If-None-Match', entry['etag'])
+            if entry.get('last_modified'):
+                request.add_header('If-Modified-Since', entry['last_modified'])
+
+        if entry and ftp_last_modified and (ftp_size, ftp_last_modified) == (entry['size'], entry['last_modified']):
+            return self._unchanged(url, entry)
+
+        try:
+            response = urlopen(request)
+        except HTTPError as error:
+            if entry and error.code == 304:
+                return self._unchanged(url, entry)
+            raise
+
+        try:
+            headers = response.info()
+            size = ftp_size or headers.get('Content-Length')
+            size = int(size) if size is not None else None
+            last_modified = ftp_last_modified or headers.get('Last-Modified')
+            etag = headers.get('ETag')
+
+            if entry and last_modified and (size, last_modified) == (entry['size'], entry['last_modified']):
+                return self._unchanged(url, entry)
+
+            log_text = 'download {}'.format(url)
+            log.info(log_text)
+            if not silent:
+                print(log_text)
+
+            new_entry = self._download(url, response)
+        finally:
+            response.close()
+
+        new_entry.update(size=size if size is not None else new_entry['size'],
+                         last_modified=last_modified,
+                         etag=etag,
+                         changed=entry is None or entry['md5'] != new_entry['md5'])
+
+        with self.index_lock:
+            index = self._load_index()
+            index[url] = {key: value for key, value in new_entry.items()
+                          if key not in ('changed', 'bytes_downloaded')}
+            self._save_index(index)
+
+        return new_entry
+
+    @staticmethod
+    def _unchanged(url, entry):
+        log.info('{} is unchanged, use cached file {}'.format(url, entry['path']))
+        return dict(entry, changed=False, bytes_downloaded=0)
+
+    def _download(self, url, response):
+        """streams the response into the cache and calculates the checksum on the fly"""
+        path = self.get_path(url)
+        md5 = hashlib.md5()
+        size = 0
+
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.part')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as cache_file:
+                for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b''):
+                    md5.update(chunk)
+                    size += len(chunk)
+                    cache_file.write(chunk)
+            replace_file(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return {'location': url, 'path': path, 'size': size, 'md5': md5.hexdigest(), 'bytes_downloaded': size}
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""In-process lookup index of HGNC symbols and identifiers.
+
+All lookups are answered from dictionaries in memory (microseconds instead of a SQL query per lookup). The index
+remembers the imported release (see :class:`.models.Release`) and is rebuilt automatically after a new import; the
+release is checked at most every `check_interval` seconds.
+"""
+
+import time
+import logging
+import threading
+
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from . import models
+from . import defaults
+from .database import BaseDbManager
+from .query import SYMBOL_MATCH_TYPES, ResolvedSymbol
+
+log = logging.getLogger('pyhgnc')
+
+
+def get_release_marker(connection, schema=None):
+    """marker of the imported release (source, checksum, parameters and import time of every source file), None if
+    nothing is imported
+
+    :param connection: SQLAlchemy connection
+    :param str schema: schema of the tables (None: default schema)
+    :rtype: tuple or None
+    """
+    if not connection.dialect.has_table(connection, models.Release.__tablename__, schema=schema):
+        return None
+    release_table = models.Release.__table__
+    query = select([release_table.c.source, release_table.c.md5, release_table.c.parameters,
+                    release_table.c.date_imported]).order_by(release_table.c.source)
+    return tuple(tuple(row) for row in connection.execute(query)) or None
+
+
+def get_identifier(hgnc_identifier):
+    """HGNC identifier as int (e.g. 5 for 'HGNC:5', '5' or 5)"""
+    if isinstance(hgnc_identifier, int):
+        return hgnc_identifier
+    return int(str(hgnc_identifier).split(':')[-1])
+
+
+class LookupIndex(BaseDbManager):
+    """Optional in-memory index of HGNC symbols, alias and previous symbols, Entrez, Ensembl, UniProt and HGNC
+    identifiers.
+
+    .. code-block:: python
+
+        from pyhgnc.manager.lookup import LookupIndex
+
+        index = LookupIndex()
+        index.resolve('P53')  # ResolvedSymbol(identifier=11998, match_type='alias_symbol', ambiguous=False)
+        index.entrez(7157)  # 11998
+
+    The index is built on the first lookup and rebuilt if the release in the database has changed.
+    """
+
+    def __init__(self, connection=None, check_interval=defaults.LOOKUP_CHECK_INTERVAL, **kwargs):
+        """
+        :param str connection: SQLAlchemy connection string
+        :param float check_interval: seconds between two checks of the imported release (0: before every lookup)
+        """
+        super(LookupIndex, self).__init__(connection=connection, **kwargs)
+        self.check_interval = check_interval
+        self.marker = None
+        self.checked = None
+        self.maps = None
+        self.lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """rebuilds the index if the imported release has changed (or `force`)
+
+        :param bool force: rebuild even if the release has not changed
+        :return: True if the index was rebuilt
+        :rtype: bool
+        """
+        with self.lock:
+            rebuilt = False
+            with self.engine.connect() as connection:
+                marker = get_release_marker(connection, self.schema)
+                if force or self.maps is None or marker != self.marker:
+                    start = time.time()
+                    self.maps = self._build(connection)
+                    self.marker = marker
+                    rebuilt = True
+                    log.info('built lookup index of {} HGNC entries in {:.2f}s'.format(
+                        len(self.maps['hgnc']), time.time() - start))
+            self.checked = time.time()
+        return rebuilt
+
+    @staticmethod
+    def _build(connection):
+        """reads all maps of the index from the database"""
+        hgnc_table = models.HGNC.__table__
+        alias_table = models.AliasSymbol.__table__
+        uniprot_table = models.UniProt.__table__
+        hgnc_uniprot = models.hgnc_uniprot
+
+        maps = {'hgnc': {}, 'entrez': {}, 'ensembl': {}}
+        matches = {match_type: defaultdict(set) for match_type in SYMBOL_MATCH_TYPES}
+
+        query = select([hgnc_table.c.identifier, hgnc_table.c.symbol, hgnc_table.c.entrez, hgnc_table.c.ensembl_gene])
+        for identifier, symbol, entrez, ensembl_gene in connection.execute(query):
+            maps['hgnc'][identifier] = symbol
+            matches['symbol'][symbol].add(identifier)
+            if entrez:
+                maps['entrez'][entrez] = identifier
+            if ensembl_gene:
+                maps['ensembl'][ensembl_gene] = identifier
+
+        query = select([alias_table.c.alias_symbol, hgnc_table.c.identifier, alias_table.c.is_previous_symbol])
+        query = query.select_from(alias_table.join(hgnc_table, alias_table.c.hgnc_id == hgnc_table.c.id))
+        for alias_symbol, identifier, is_previous_symbol in connection.execute(query):
+            matches['previous_symbol' if is_previous_symbol else 'alias_symbol'][alias_symbol].add(identifier)
+
+        # symbol -> ResolvedSymbol, same priorities as QueryManager.resolve_symbols
+        resolved = {}
+        for match_type in SYMBOL_MATCH_TYPES:
+            for symbol, identifiers in matches[match_type].items():
+                if symbol not in resolved:
+                    resolved[symbol] = ResolvedSymbol(min(identifiers), match_type, len(identifiers) > 1)
+        maps['resolved'] = resolved
+
+        uniprots = defaultdict(list)
+        query = select([uniprot_table.c.uniprotid, hgnc_table.c.identifier]).select_from(
+            uniprot_table.join(hgnc_uniprot, uniprot_table.c.id == hgnc_uniprot.c.uniprot_id).join(
+                hgnc_table, hgnc_uniprot.c.hgnc_id == hgnc_table.c.id)
+        )
+        for uniprotid, identifier in connection.execute(query):
+            uniprots[uniprotid].append(identifier)
+        maps['uniprot'] = {uniprotid: tuple(sorted(identifiers)) for uniprotid, identifiers in uniprots.items()}
+
+        return maps
+
+    def _get_maps(self):
+        if self.checked is None or time.time() - self.checked >= self.check_interval:
+            self.refresh()
+        return self.maps
+
+    def resolve(self, symbol):
+        """resolves an approved, previous or alias symbol (see :meth:`.QueryManager.resolve_symbols`)
+
+        :param str symbol: gene symbol
+        :return: HGNC identifier, match type and ambiguity or None
+        :rtype: ResolvedSymbol or None
+        """
+        return self._get_maps()['resolved'].get(symbol)
+
+    def symbol(self, symbol):
+        """HGNC identifier of an approved symbol or None"""
+        resolved = self._get_maps()['resolved'].get(symbol)
+        if resolved is not None and resolved.match_type == 'symbol':
+            return resolved.identifier
+
+    def hgnc(self, hgnc_identifier):
+        """approved symbol of a HGNC identifier (e.g. 5 or 'HGNC:5') or None"""
+        return self._get_maps()['hgnc'].get(get_identifier(hgnc_identifier))
+
+    def entrez(self, entrez_id):
+        """HGNC identifier of an Entrez gene identifier (e.g. 7157 or '7157') or None"""
+        return self._get_maps()['entrez'].get(str(entrez_id))
+
+    def ensembl(self, ensembl_gene):
+        """HGNC identifier of an Ensembl gene identifier (e.g. 'ENSG00000141510') or None"""
+        return self._get_maps()['ensembl'].get(ensembl_gene)
+
+    def uniprot(self, uniprotid):
+        """HGNC identifiers of a UniProt accession (e.g. 'P04637'), empty if unknown
+
+        :rtype: tuple(int)
+        """
+        return self._get_maps()['uniprot'].get(uniprotid, ())
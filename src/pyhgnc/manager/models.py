@@ -2,24 +2,40 @@
 
 import datetime
 
-from sqlalchemy import Column, ForeignKey, Integer, String, Text, Boolean, Date, Table, Unicode
+from sqlalchemy import Column, ForeignKey, Integer, BigInteger, String, Text, Boolean, Date, DateTime, Table, Unicode
+from sqlalchemy import Index, select
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 
 from .defaults import TABLE_PREFIX
 
 Base = declarative_base()
 
 
-def foreign_key_to(table_name):
+def foreign_key_to(table_name, index=False):
     """Creates a standard foreign key to a table in the database
 
     :param str table_name: name of the table without TABLE_PREFIX
+    :param bool index: create an index on the foreign key
     :return: foreign key column
     :rtype: sqlalchemy.Column
     """
     foreign_column = TABLE_PREFIX + table_name + '.id'
-    return Column(Integer, ForeignKey(foreign_column))
+    return Column(Integer, ForeignKey(foreign_column), index=index)
+
+
+def lookup_name(model, foreign_key, label):
+    """Creates a read-only attribute with the name of the lookup table entry a foreign key refers to (loaded with the
+    row by a scalar subquery)
+
+    :param model: lookup model (e.g. :class:`Status`)
+    :param sqlalchemy.Column foreign_key: foreign key column to the lookup table
+    :param str label: column label in queries (e.g. 'status' for DataFrames)
+    :rtype: sqlalchemy.orm.ColumnProperty
+    """
+    name_query = select([model.name]).where(model.id == foreign_key)
+    scalar_query = name_query.scalar_subquery() if hasattr(name_query, 'scalar_subquery') else name_query.as_scalar()
+    return column_property(scalar_query.label(label))
 
 
 def get_many2many_table(table1, table2):
@@ -89,6 +105,47 @@ hgnc_uniprot = get_many2many_table('hgnc', 'uniprot')
 hgnc_rgd = get_many2many_table('hgnc', 'rgd')
 
 
+class Status(Base, MasterModel):
+    """Status of HGNC symbol reports (lookup table of :attr:`HGNC.status`)
+
+    :cvar str name: status, either "Approved" or "Entry Withdrawn"
+    """
+    name = Column(String(255), unique=True)
+
+    def __repr__(self):
+        return self.name
+
+
+class LocusGroup(Base, MasterModel):
+    """Locus groups as defined by the HGNC (lookup table of :attr:`HGNC.locus_group`)
+
+    :cvar str name: group name for a set of related locus types (e.g. non-coding RNA)
+    """
+    name = Column(String(255), unique=True)
+
+    def __repr__(self):
+        return self.name
+
+
+class LocusType(Base, MasterModel):
+    """Locus types as defined by the HGNC (lookup table of :attr:`HGNC.locus_type`)
+
+    :cvar str name: locus type (e.g. RNA, transfer)
+    """
+    name = Column(String(255), unique=True)
+
+    def __repr__(self):
+        return self.name
+
+
+# (attribute of HGNC, lookup model) of low cardinality attributes stored as integer foreign keys
+HGNC_LOOKUPS = (
+    ('status', Status),
+    ('locus_group', LocusGroup),
+    ('locus_type', LocusType),
+)
+
+
 class HGNC(Base, MasterModel):
     """Root class (table, model) for all other classes (tables, models) in PyHGNC. Basic information with 1:1
     relationship to identifier are stored here
@@ -112,11 +169,14 @@ class HGNC(Base, MasterModel):
                         report
     :cvar int orphanet: Orphanet ID
     :cvar str identifier: Unique ID created by the HGNC for every approved symbol (HGNC ID)
-    :cvar str status: Status of the symbol report, which can be either "Approved" or "Entry Withdrawn"
+    :cvar str status: Status of the symbol report, which can be either "Approved" or "Entry Withdrawn" (read-only,
+                      stored as foreign key `status_id` to :class:`Status`)
     :cvar str uuid: universally unique identifier
 
     :cvar str locus_group: Group name for a set of related locus types as defined by the HGNC (e.g. non-coding RNA)
-    :cvar str locus_type: Locus type as defined by the HGNC (e.g. RNA, transfer)
+                           (read-only, stored as foreign key `locus_group_id` to :class:`LocusGroup`)
+    :cvar str locus_type: Locus type as defined by the HGNC (e.g. RNA, transfer) (read-only, stored as foreign key
+                          `locus_type_id` to :class:`LocusType`)
 
     :cvar date date_name_changed: date the gene name was last changed
     :cvar date date_modified: date the entry was last modified
@@ -159,13 +219,21 @@ class HGNC(Base, MasterModel):
     """
     name = Column(String(255), nullable=True)
     symbol = Column(Unicode(255), index=True)
-    identifier = Column(Integer, unique=True)
-    status = Column(String(255))
+    identifier = Column(Integer, unique=True, index=True)
+    status_id = foreign_key_to('status', index=True)
     uuid = Column(String(255))
     orphanet = Column(Integer, nullable=True)
 
-    locus_group = Column(String(255))
-    locus_type = Column(String(255))
+    locus_group_id = foreign_key_to('locusgroup', index=True)
+    locus_type_id = foreign_key_to('locustype', index=True)
+
+    status = lookup_name(Status, status_id, 'status')
+    locus_group = lookup_name(LocusGroup, locus_group_id, 'locus_group')
+    locus_type = lookup_name(LocusType, locus_type_id, 'locus_type')
+
+    status_entry = relationship('Status')
+    locus_group_entry = relationship('LocusGroup')
+    locus_type_entry = relationship('LocusType')
 
     # Date information
     date_name_changed = Column(Date, nullable=True)
@@ -245,6 +313,15 @@ class HGNC(Base, MasterModel):
         back_populates="hgncs"
     )
 
+    def to_dict(self):
+        """values of all columns, lookup attributes (e.g. status) as names instead of foreign keys"""
+        data_dict = self._to_dict()
+        for name, _ in HGNC_LOOKUPS:
+            data_dict.pop(name + '_id', None)
+            data_dict.pop(name + '_entry', None)
+            data_dict[name] = getattr(self, name)
+        return data_dict
+
     def __repr__(self):
         return self.symbol
 
@@ -263,7 +340,7 @@ class AliasSymbol(Base, MasterModel):
     :cvar hgnc: back populates to :class:`.HGNC`
     """
 
-    alias_symbol = Column(Unicode(255))
+    alias_symbol = Column(Unicode(255), index=True)
     is_previous_symbol = Column(Boolean, default=False)
 
     hgnc_id = foreign_key_to('hgnc')
@@ -311,7 +388,7 @@ class GeneFamily(Base, MasterModel):
     :cvar list hgncs: back populates to :class:`.HGNC`
     """
 
-    family_identifier = Column(Integer, unique=True)
+    family_identifier = Column(Integer, unique=True, index=True)
     family_name = Column(String(255))
 
     hgncs = relationship(
@@ -543,6 +620,35 @@ class LSDB(Base, MasterModel):
         return self.lsdb
 
 
+class SupportResource(Base, MasterModel):
+    """Resources (e.g. Ensembl, HomoloGene, Panther) which support HCOP orthology predictions
+
+    :cvar str name: name of the resource as in the HCOP column `support`
+    :cvar orthology_predictions: relationship to :class:`.OrthologyPrediction`
+    """
+    name = Column(String(255), unique=True)
+
+    orthology_predictions = relationship(
+        'OrthologyPrediction',
+        secondary='{}orthologyprediction__supportresource'.format(TABLE_PREFIX),
+        back_populates='support_resources'
+    )
+
+    def __repr__(self):
+        return self.name
+
+
+orthology_prediction_support_resource = Table(
+    '{}orthologyprediction__supportresource'.format(TABLE_PREFIX), Base.metadata,
+    Column('orthologyprediction_id', Integer, ForeignKey('{}orthologyprediction.id'.format(TABLE_PREFIX)),
+           index=True),
+    Column('supportresource_id', Integer, ForeignKey('{}supportresource.id'.format(TABLE_PREFIX))),
+    # predictions of a resource are read from the index only
+    Index('ix_{}orthologyprediction__supportresource_resource'.format(TABLE_PREFIX), 'supportresource_id',
+          'orthologyprediction_id')
+)
+
+
 class OrthologyPrediction(Base, MasterModel):
     """Orthology Predictions
 
@@ -564,7 +670,9 @@ class OrthologyPrediction(Base, MasterModel):
     :cvar str ortholog_species_symbol: Ortholog species gene symbol
     :cvar str ortholog_species_chr: Ortholog species gene chromosome location
     :cvar str ortholog_species_assert_ids:
-    :cvar str support:
+    :cvar str support: comma separated resources which support the prediction
+    :cvar int support_count: number of supporting resources
+    :cvar list support_resources: relationship to :class:`.SupportResource`
     :cvar hgnc: back populates to :class:`.HGNC`
 
     """
@@ -583,6 +691,13 @@ class OrthologyPrediction(Base, MasterModel):
     ortholog_species_chr = Column(String(255))
     ortholog_species_assert_ids = Column(String(255))
     support = Column(String(255))
+    support_count = Column(Integer, index=True)
+
+    support_resources = relationship(
+        'SupportResource',
+        secondary=orthology_prediction_support_resource,
+        back_populates='orthology_predictions'
+    )
 
     hgnc_id = foreign_key_to('hgnc')
     hgnc = relationship('HGNC', back_populates='orthology_predictions')
@@ -594,6 +709,86 @@ class OrthologyPrediction(Base, MasterModel):
         return '{}: {}: {}'.format(self.ortholog_species, self.ortholog_species_name, self.ortholog_species_symbol)
 
 
+class BestOrtholog(Base, MasterModel):
+    """Best supported orthology prediction of every HGNC entry per species, materialized at import. The prediction
+    with most supporting resources is chosen, ties are won by the prediction listed first in HCOP.
+
+    :cvar int ortholog_species: NCBI taxonomy identifier
+    :cvar int support_count: number of resources which support the prediction
+    :cvar str ortholog_species_symbol: Ortholog species gene symbol
+    :cvar int ortholog_species_entrez_gene: Ortholog species Entrez gene identifier
+    :cvar str ortholog_species_ensembl_gene: Ortholog species Ensembl gene identifier
+    :cvar str ortholog_species_db_id: Ortholog species database identifier
+    :cvar hgnc: relationship to :class:`.HGNC`
+    :cvar orthology_prediction: relationship to :class:`.OrthologyPrediction`
+    """
+    __table_args__ = (
+        Index('ix_{}bestortholog_hgnc_species'.format(TABLE_PREFIX), 'hgnc_id', 'ortholog_species', unique=True),
+        Index('ix_{}bestortholog_species_hgnc'.format(TABLE_PREFIX), 'ortholog_species', 'hgnc_id'),
+    )
+
+    ortholog_species = Column(Integer)
+    support_count = Column(Integer)
+    ortholog_species_symbol = Column(Unicode(255))
+    ortholog_species_entrez_gene = Column(Integer)
+    ortholog_species_ensembl_gene = Column(String(255))
+    ortholog_species_db_id = Column(String(255))
+
+    hgnc_id = foreign_key_to('hgnc')
+    hgnc = relationship('HGNC')
+
+    orthologyprediction_id = foreign_key_to('orthologyprediction')
+    orthology_prediction = relationship('OrthologyPrediction')
+
+    def to_dict(self):
+        return self.to_dict_with_hgnc()
+
+    def __repr__(self):
+        return '{}: {}: {}'.format(self.hgnc_id, self.ortholog_species, self.ortholog_species_symbol)
+
+
+class Release(Base, MasterModel):
+    """Source files (HGNC, HCOP) of the imported release with size, modification time and checksum. Used to skip
+    imports if the source files have not changed.
+
+    :cvar str source: name of the source ('hgnc' or 'hcop')
+    :cvar str location: URL or path of the source file
+    :cvar int size: size in bytes
+    :cvar str last_modified: modification time of the source file
+    :cvar str md5: MD5 checksum of the source file
+    :cvar str parameters: import parameters which change the imported content as JSON (e.g. HCOP species)
+    :cvar datetime date_imported: time of import
+    """
+    source = Column(String(50), unique=True)
+    location = Column(Text)
+    size = Column(BigInteger)
+    last_modified = Column(String(255))
+    md5 = Column(String(32))
+    parameters = Column(Text)
+    date_imported = Column(DateTime)
+
+    def __repr__(self):
+        return '{}: {}'.format(self.source, self.md5)
+
+
+class ImportCheckpoint(Base, MasterModel):
+    """Progress of a running (or interrupted) import, committed together with the imported rows. Used to resume an
+    import of the same source files.
+
+    :cvar str stage: stage of the import ('hgnc' or 'hcop')
+    :cvar int committed: number of committed HGNC documents or HCOP rows
+    :cvar str sources: checksums and import parameters of the source files as JSON
+    :cvar datetime date_updated: time of the last checkpoint
+    """
+    stage = Column(String(50))
+    committed = Column(Integer)
+    sources = Column(Text)
+    date_updated = Column(DateTime)
+
+    def __repr__(self):
+        return '{}: {}'.format(self.stage, self.committed)
+
+
 class AppUser(Base, MasterModel):
     name = Column(String(255))
     email = Column(String(255), unique=True)
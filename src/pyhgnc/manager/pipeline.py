@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Concurrent import stages: background tasks (e.g. downloads) and bounded prefetch queues between a producer
+(e.g. parser) and a consumer (e.g. database writer)."""
+
+import sys
+import logging
+import threading
+
+if sys.version_info[0] == 3:
+    import queue
+else:
+    import Queue as queue
+
+log = logging.getLogger('pyhgnc')
+
+_DONE = object()
+
+
+class _Error(object):
+    """exception raised by the producer, re-raised by the consumer"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class Task(object):
+    """Runs a function in a background thread (or directly if `background` is False).
+
+    :meth:`result` waits for the function and returns its result or raises its exception.
+    """
+
+    def __init__(self, function, args=(), kwargs=None, background=True):
+        """
+        :param function: function to run
+        :param tuple args: positional arguments
+        :param dict kwargs: keyword arguments
+        :param bool background: run in a background thread
+        """
+        self._result = None
+        self._error = None
+        self._thread = None
+
+        if background:
+            self._thread = threading.Thread(target=self._run, args=(function, args, kwargs or {}))
+            self._thread.daemon = True
+            self._thread.start()
+        else:
+            self._run(function, args, kwargs or {})
+
+    def _run(self, function, args, kwargs):
+        try:
+            self._result = function(*args, **kwargs)
+        except BaseException as error:
+            self._error = error
+
+    def done(self):
+        """True if the function has finished"""
+        return self._thread is None or not self._thread.is_alive()
+
+    def result(self):
+        """waits for the function and returns its result (or raises its exception)"""
+        if self._thread is not None:
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class Prefetch(object):
+    """Iterates an iterable in a background thread while the items are consumed.
+
+    Items are passed in batches of `batch_size` through a queue of at most `size` batches, so the producer is never
+    more than `size * batch_size` items ahead (bounded memory). Exceptions of the producer are raised by the
+    consumer. :meth:`close` stops the producer.
+    """
+
+    def __init__(self, iterable, size=4, batch_size=1):
+        """
+        :param iter iterable: producer (e.g. parser), iterated in a background thread
+        :param int size: maximal number of buffered batches
+        :param int batch_size: number of items passed at once (reduces locking overhead for small items)
+        """
+        self.iterable = iterable
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=size)
+        self.stop = threading.Event()
+
+        self.thread = threading.Thread(target=self._produce)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _put(self, item):
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            batch = []
+            for item in self.iterable:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    if not self._put(batch):
+                        return
+                    batch = []
+            if batch:
+                self._put(batch)
+            self._put(_DONE)
+        except BaseException as error:
+            self._put(_Error(error))
+        finally:
+            close = getattr(self.iterable, 'close', None)
+            if close is not None and self.stop.is_set():
+                close()
+
+    def __iter__(self):
+        try:
+            while True:
+                batch = self.queue.get()
+                if batch is _DONE:
+                    return
+                if isinstance(batch, _Error):
+                    raise batch.error
+                for item in batch:
+                    yield item
+        finally:
+            self.close()
+
+    def close(self):
+        """stops the producer (it ends the next time it hands over a batch)"""
+        self.stop.set()
@@ -1,12 +1,88 @@
 # -*- coding: utf-8 -*-
 
-from collections import Iterable
+from collections import Iterable, namedtuple, defaultdict
 
 from pandas import read_sql
+from sqlalchemy import select, func, or_
 
 from . import models
+from . import defaults
 from .database import BaseDbManager
 
+# match types of QueryManager.resolve_symbols in order of priority
+SYMBOL_MATCH_TYPES = ('symbol', 'previous_symbol', 'alias_symbol')
+
+ResolvedSymbol = namedtuple('ResolvedSymbol', ['identifier', 'match_type', 'ambiguous'])
+
+# match modes of string arguments in QueryManager queries (see get_match_clause)
+MATCH_MODES = ('exact', 'prefix', 'pattern', 'case_insensitive')
+
+LIKE_WILDCARDS = ('%', '_')
+
+LIKE_ESCAPE = '\\'
+
+
+def get_match_mode(search4, match=None):
+    """match mode of a search string: `match` or, if `match` is None, 'pattern' for values with a LIKE wildcard and
+    'exact' for all other values
+
+    :param str search4: search string
+    :param str match: match mode (one of MATCH_MODES) or None
+    :rtype: str
+    """
+    if match is None:
+        return 'pattern' if any(wildcard in search4 for wildcard in LIKE_WILDCARDS) else 'exact'
+    return match
+
+
+def escape_like(value):
+    """escapes the LIKE wildcards in a string (used with `escape=LIKE_ESCAPE`)"""
+    for character in (LIKE_ESCAPE,) + LIKE_WILDCARDS:
+        value = value.replace(character, LIKE_ESCAPE + character)
+    return value
+
+
+def get_match_clause(model_attrib, search4, match=None):
+    """filter clause of a model attribute and a search value
+
+    Match modes of strings:
+        - 'exact': equality (uses the index of the column)
+        - 'prefix': values starting with `search4` (wildcards in `search4` are escaped)
+        - 'pattern': SQL LIKE pattern (e.g. 'TP%', case sensitivity depends on the database)
+        - 'case_insensitive': equality of the lower case values
+
+    Integers are always compared with equality, iterables match if one of their values matches (exact: IN).
+
+    :param model_attrib: attribute in model
+    :param search4: search value(s)
+    :type search4: str or int or tuple
+    :param str match: match mode (one of MATCH_MODES), None: 'pattern' if `search4` contains a LIKE wildcard,
+        else 'exact'
+    :raises ValueError: if `match` is no match mode
+    """
+    if match is not None and match not in MATCH_MODES:
+        raise ValueError('unknown match mode {}, use one of {}'.format(match, ', '.join(MATCH_MODES)))
+
+    if isinstance(search4, str):
+        match = get_match_mode(search4, match)
+        if match == 'exact':
+            return model_attrib == search4
+        if match == 'prefix':
+            return model_attrib.like(escape_like(search4) + '%', escape=LIKE_ESCAPE)
+        if match == 'case_insensitive':
+            return func.lower(model_attrib) == search4.lower()
+        return model_attrib.like(search4)
+
+    if isinstance(search4, int):
+        return model_attrib == search4
+
+    values = list(search4)
+    if match in (None, 'exact') or not values:
+        return model_attrib.in_(values)
+    if match == 'case_insensitive':
+        return func.lower(model_attrib).in_([value.lower() if isinstance(value, str) else value for value in values])
+    return or_(*[get_match_clause(model_attrib, value, match) for value in values])
+
 
 class QueryManager(BaseDbManager):
     """Query interface to database."""
@@ -41,82 +117,104 @@ class QueryManager(BaseDbManager):
 
         return results
 
-    def get_model_queries(self, query_obj, model_queries_config):
+    def get_model_queries(self, query_obj, model_queries_config, match=None):
         """use this if your are searching for a field in the same model"""
         for search4, model_attrib in model_queries_config:
 
             if search4 is not None:
-                query_obj = self._model_query(query_obj, search4, model_attrib)
+                query_obj = self._model_query(query_obj, search4, model_attrib, match)
         return query_obj
 
-    def get_many_to_many_queries(self, query_obj, many_to_many_queries_config):
+    def get_many_to_many_queries(self, query_obj, many_to_many_queries_config, match=None):
         for search4, model_attrib, many2many_attrib in many_to_many_queries_config:
             if search4 is not None:
-                query_obj = self._many_to_many_query(query_obj, search4, model_attrib, many2many_attrib)
+                query_obj = self._many_to_many_query(query_obj, search4, model_attrib, many2many_attrib, match)
         return query_obj
 
-    def get_one_to_many_queries(self, query_obj, one_to_many_queries):
+    def get_one_to_many_queries(self, query_obj, one_to_many_queries, match=None):
         for search4, model_attrib in one_to_many_queries:
             if search4 is not None:
-                query_obj = self._one_to_many_query(query_obj, search4, model_attrib)
+                query_obj = self._one_to_many_query(query_obj, search4, model_attrib, match)
         return query_obj
 
+    def get_lookup_queries(self, query_obj, lookup_queries_config, match=None):
+        """use this if your are searching for the name of a lookup table entry (e.g. HGNC status)"""
+        for search4, foreign_key, lookup_model in lookup_queries_config:
+            if search4 is not None:
+                query_obj = self._lookup_query(query_obj, search4, foreign_key, lookup_model, match)
+        return query_obj
+
+    def _lookup_query(self, query_obj, search4, foreign_key, lookup_model, match=None):
+        """extends and returns a SQLAlchemy query object to filter an integer foreign key by the names of the lookup
+        table entries (e.g. status 'Approved'); the small lookup table is searched, the foreign key is an index lookup
+
+        :param query_obj: SQL Alchemy query object
+        :param str search4: search string
+        :param foreign_key: foreign key attribute in model (e.g. HGNC.status_id)
+        :param lookup_model: lookup model (e.g. Status)
+        :param str match: match mode (see :func:`get_match_clause`)
+        """
+        lookup_ids = self._model_query(self.session.query(lookup_model.id), search4, lookup_model.name, match)
+        return query_obj.filter(foreign_key.in_(lookup_ids.statement))
+
+    def _support_resource_query(self, query_obj, support_resource, match=None):
+        """extends and returns a SQLAlchemy query object to filter orthology predictions by supporting resources
+
+        The primary keys of the (few) resources are resolved first, so the predictions of the resources are read
+        from the index of the association table.
+
+        :param query_obj: SQL Alchemy query object
+        :param support_resource: name(s) of resources (e.g. 'Ensembl')
+        :type support_resource: str or tuple(str)
+        :param str match: match mode (see :func:`get_match_clause`)
+        """
+        support_table = models.orthology_prediction_support_resource
+        resource_query = self._model_query(self.session.query(models.SupportResource.id), support_resource,
+                                           models.SupportResource.name, match)
+        resource_ids = [resource_id for resource_id, in resource_query]
+        prediction_ids = select([support_table.c.orthologyprediction_id]).where(
+            support_table.c.supportresource_id.in_(resource_ids))
+        return query_obj.filter(models.OrthologyPrediction.id.in_(prediction_ids))
+
     @classmethod
-    def _one_to_many_query(cls, query_obj, search4, model_attrib):
+    def _one_to_many_query(cls, query_obj, search4, model_attrib, match=None):
         """extends and returns a SQLAlchemy query object to allow one-to-many queries
 
         :param query_obj: SQL Alchemy query object
         :param str search4: search string
         :param model_attrib: attribute in model
+        :param str match: match mode (see :func:`get_match_clause`)
         """
         model = model_attrib.parent.class_
 
         already_joined_tables = [mapper.class_ for mapper in query_obj._join_entities]
 
-        if isinstance(search4, (str, int, Iterable)) and model not in already_joined_tables:
-            query_obj = query_obj.join(model)
-
-        if isinstance(search4, str):
-            query_obj = query_obj.filter(model_attrib.like(search4))
-
-        elif isinstance(search4, int):
-            query_obj = query_obj.filter(model_attrib == search4)
-
-        elif isinstance(search4, Iterable):
-            query_obj = query_obj.filter(model_attrib.in_(search4))
+        if isinstance(search4, (str, int, Iterable)):
+            if model not in already_joined_tables:
+                query_obj = query_obj.join(model)
+            query_obj = query_obj.filter(get_match_clause(model_attrib, search4, match))
 
         return query_obj
 
     @classmethod
-    def _many_to_many_query(cls, query_obj, search4, join_attrib, many2many_attrib):
+    def _many_to_many_query(cls, query_obj, search4, join_attrib, many2many_attrib, match=None):
 
         model = join_attrib.property.mapper.class_
 
         already_joined_tables = [mapper.class_ for mapper in query_obj._join_entities]
 
-        if isinstance(search4, (str, int, Iterable)) and model not in already_joined_tables:
-            query_obj = query_obj.join(join_attrib)
-
-        if isinstance(search4, str):
-            query_obj = query_obj.filter(many2many_attrib.like(search4))
-
-        elif isinstance(search4, int):
-            query_obj = query_obj.filter(many2many_attrib == search4)
-
-        elif isinstance(search4, Iterable):
-            query_obj = query_obj.filter(many2many_attrib.in_(search4))
+        if isinstance(search4, (str, int, Iterable)):
+            if model not in already_joined_tables:
+                query_obj = query_obj.join(join_attrib)
+            query_obj = query_obj.filter(get_match_clause(many2many_attrib, search4, match))
 
         return query_obj
 
     @classmethod
-    def _model_query(cls, query_obj, search4, model_attrib):
-
-        if isinstance(search4, str):
-            query_obj = query_obj.filter(model_attrib.like(search4))
-        elif isinstance(search4, int):
-            query_obj = query_obj.filter(model_attrib == search4)
-        elif isinstance(search4, Iterable):
-            query_obj = query_obj.filter(model_attrib.in_(search4))
+    def _model_query(cls, query_obj, search4, model_attrib, match=None):
+
+        if isinstance(search4, (str, int, Iterable)):
+            query_obj = query_obj.filter(get_match_clause(model_attrib, search4, match))
         return query_obj
 
     def hgnc(self, name=None, symbol=None, identifier=None, status=None, uuid=None, locus_group=None, orphanet=None,
@@ -126,7 +224,7 @@ class QueryManager(BaseDbManager):
              pseudogeneorg=None, bioparadigmsslc=None, locationsortable=None, ec_number=None, refseq_accession=None,
              merops=None, location=None, cosmic=None, imgt=None, enaid=None, alias_symbol=None, alias_name=None,
              rgdid=None, omimid=None, ccdsid=None, lsdbs=None, ortholog_species=None, gene_family_identifier=None,
-             limit=None, as_df=False):
+             limit=None, as_df=False, match=None):
         """Method to query :class:`pyhgnc.manager.models.Pmid`
 
 
@@ -267,6 +365,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.Keyword`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -279,10 +380,7 @@ class QueryManager(BaseDbManager):
             (name, models.HGNC.name),
             (symbol, models.HGNC.symbol),
             (identifier, models.HGNC.identifier),
-            (status, models.HGNC.status),
             (uuid, models.HGNC.uuid),
-            (locus_group, models.HGNC.locus_group),
-            (locus_type, models.HGNC.locus_type),
             (date_name_changed, models.HGNC.date_name_changed),
             (date_modified, models.HGNC.date_modified),
             (date_symbol_changed, models.HGNC.date_symbol_changed),
@@ -304,7 +402,14 @@ class QueryManager(BaseDbManager):
             (cosmic, models.HGNC.cosmic),
             (imgt, models.HGNC.imgt),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
+
+        lookup_queries_config = (
+            (status, models.HGNC.status_id, models.Status),
+            (locus_group, models.HGNC.locus_group_id, models.LocusGroup),
+            (locus_type, models.HGNC.locus_type_id, models.LocusType),
+        )
+        q = self.get_lookup_queries(q, lookup_queries_config, match)
 
         many_to_many_queries_config = (
             (ec_number, models.HGNC.enzymes, models.Enzyme.ec_number),
@@ -316,7 +421,7 @@ class QueryManager(BaseDbManager):
             (pubmedid, models.HGNC.pubmeds, models.PubMed.pubmedid),
             (enaid, models.HGNC.enas, models.ENA.enaid),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         one_to_many_queries_config = (
             (alias_symbol, models.AliasSymbol.alias_symbol),
@@ -327,10 +432,62 @@ class QueryManager(BaseDbManager):
             (lsdbs, models.LSDB.lsdb),
             (ortholog_species, models.OrthologyPrediction.ortholog_species),
         )
-        q = self.get_one_to_many_queries(q, one_to_many_queries_config)
+        q = self.get_one_to_many_queries(q, one_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
+    def resolve_symbols(self, symbols, chunk_size=defaults.RESOLVE_CHUNKSIZE):
+        """resolves many gene symbols to HGNC identifiers with a few chunked `IN` queries
+
+        Symbols are compared exactly (no wildcards). Approved symbols win over previous symbols, previous symbols
+        over alias symbols; only symbols which are no approved symbol are looked up in :class:`.models.AliasSymbol`.
+        A symbol is ambiguous if it matches several HGNC entries of the same match type, the smallest HGNC identifier
+        is returned then.
+
+        :param iter symbols: gene symbols (e.g. ['TP53', 'P53'])
+        :param int chunk_size: number of symbols per query
+        :return: :class:`ResolvedSymbol` (HGNC identifier, match type, ambiguous) per resolved symbol and the
+                 unresolved symbols (in input order)
+        :rtype: tuple(dict, list)
+        """
+        unresolved = []
+        seen = set()
+        for symbol in symbols:
+            if symbol not in seen:
+                seen.add(symbol)
+                unresolved.append(symbol)
+
+        matches = {match_type: defaultdict(set) for match_type in SYMBOL_MATCH_TYPES}
+
+        hgnc_table = models.HGNC.__table__
+        alias_table = models.AliasSymbol.__table__
+
+        hgnc_query = select([hgnc_table.c.symbol, hgnc_table.c.identifier])
+        for start in range(0, len(unresolved), chunk_size):
+            chunk = unresolved[start:start + chunk_size]
+            for symbol, identifier in self.session.execute(hgnc_query.where(hgnc_table.c.symbol.in_(chunk))):
+                matches['symbol'][symbol].add(identifier)
+
+        # previous and alias symbols with one query
+        pending = [symbol for symbol in unresolved if symbol not in matches['symbol']]
+        alias_query = select([alias_table.c.alias_symbol, hgnc_table.c.identifier, alias_table.c.is_previous_symbol])
+        alias_query = alias_query.select_from(alias_table.join(hgnc_table, alias_table.c.hgnc_id == hgnc_table.c.id))
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            rows = self.session.execute(alias_query.where(alias_table.c.alias_symbol.in_(chunk)))
+            for symbol, identifier, is_previous_symbol in rows:
+                matches['previous_symbol' if is_previous_symbol else 'alias_symbol'][symbol].add(identifier)
+
+        resolved = {}
+        for match_type in SYMBOL_MATCH_TYPES:
+            for symbol, identifiers in matches[match_type].items():
+                # symbols are only compared exactly, even if the database compares case-insensitively
+                if symbol in seen and symbol not in resolved:
+                    resolved[symbol] = ResolvedSymbol(min(identifiers), match_type, len(identifiers) > 1)
+        unresolved = [symbol for symbol in unresolved if symbol not in resolved]
+
+        return resolved, unresolved
+
     def orthology_prediction(self,
                              ortholog_species=None,
                              human_entrez_gene=None,
@@ -347,10 +504,13 @@ class QueryManager(BaseDbManager):
                              ortholog_species_chr=None,
                              ortholog_species_assert_ids=None,
                              support=None,
+                             support_resource=None,
+                             min_support=None,
                              hgnc_identifier=None,
                              hgnc_symbol=None,
                              limit=None,
-                             as_df=False):
+                             as_df=False,
+                             match=None):
         """Method to query :class:`pyhgnc.manager.models.OrthologyPrediction`
 
         :param int ortholog_species: NCBI taxonomy identifier
@@ -367,7 +527,10 @@ class QueryManager(BaseDbManager):
         :param str ortholog_species_symbol: gene symbol of ortholog
         :param str ortholog_species_chr: chromosome identifier (ortholog)
         :param str ortholog_species_assert_ids:
-        :param str support:
+        :param str support: comma separated supporting resources (e.g. '%Ensembl%')
+        :param support_resource: predictions supported by this resource (or one of these resources), e.g. 'Ensembl'
+        :type support_resource: str or tuple(str) or None
+        :param int min_support: minimal number of supporting resources
         :param int hgnc_identifier: HGNC identifier
         :param str hgnc_symbol: HGNC symbol
 
@@ -379,6 +542,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.Keyword`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -403,13 +569,73 @@ class QueryManager(BaseDbManager):
             (ortholog_species_assert_ids, models.OrthologyPrediction.ortholog_species_assert_ids),
             (support, models.OrthologyPrediction.support),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
+
+        if support_resource is not None:
+            q = self._support_resource_query(q, support_resource, match)
+
+        if min_support is not None:
+            q = q.filter(models.OrthologyPrediction.support_count >= min_support)
 
         one_to_many_queries_config = (
             (hgnc_identifier, models.HGNC.identifier),
             (hgnc_symbol, models.HGNC.symbol),
         )
-        q = self.get_one_to_many_queries(q, one_to_many_queries_config)
+        q = self.get_one_to_many_queries(q, one_to_many_queries_config, match)
+
+        return self._limit_and_df(q, limit, as_df)
+
+    def best_ortholog(self, ortholog_species=None, ortholog_species_symbol=None, min_support=None, hgnc_symbol=None,
+                      hgnc_identifier=None, limit=None, as_df=False, match=None):
+        """Method to query :class:`.models.BestOrtholog` objects in database (best supported orthology prediction
+        of every HGNC entry per species)
+
+        :param ortholog_species: NCBI taxonomy identifier(s) (e.g. 10090 for mouse)
+        :type ortholog_species: int or tuple(int) or None
+
+        :param ortholog_species_symbol: gene symbol(s) of the ortholog
+        :type ortholog_species_symbol: str or tuple(str) or None
+
+        :param int min_support: minimal number of supporting resources
+
+        :param hgnc_symbol: HGNC symbol(s)
+        :type hgnc_symbol: str or tuple(str) or None
+
+        :param hgnc_identifier: identifiers(s) in :class:`.models.HGNC`
+        :type hgnc_identifier: int or tuple(int) or None
+
+        :param limit:
+            - if `isinstance(limit,int)==True` -> limit
+            - if `isinstance(limit,tuple)==True` -> format:= tuple(page_number, results_per_page)
+            - if limit == None -> all results
+        :type limit: int or tuple(int) or None
+
+        :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
+
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
+        :return:
+            - if `as_df == False` -> list(:class:`.models.BestOrtholog`)
+            - if `as_df == True`  -> :class:`pandas.DataFrame`
+        :rtype: list(:class:`.models.BestOrtholog`) or :class:`pandas.DataFrame`
+        """
+        q = self.session.query(models.BestOrtholog)
+
+        model_queries_config = (
+            (ortholog_species, models.BestOrtholog.ortholog_species),
+            (ortholog_species_symbol, models.BestOrtholog.ortholog_species_symbol),
+        )
+        q = self.get_model_queries(q, model_queries_config, match)
+
+        if min_support is not None:
+            q = q.filter(models.BestOrtholog.support_count >= min_support)
+
+        one_to_many_queries_config = (
+            (hgnc_symbol, models.HGNC.symbol),
+            (hgnc_identifier, models.HGNC.identifier)
+        )
+        q = self.get_one_to_many_queries(q, one_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
@@ -419,7 +645,8 @@ class QueryManager(BaseDbManager):
                      hgnc_symbol=None,
                      hgnc_identifier=None,
                      limit=None,
-                     as_df=False):
+                     as_df=False,
+                     match=None):
         """Method to query :class:`.models.AliasSymbol` objects in database
 
         :param alias_symbol: alias symbol(s)
@@ -442,6 +669,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.AliasSymbol`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -454,13 +684,13 @@ class QueryManager(BaseDbManager):
             (alias_symbol, models.AliasSymbol.alias_symbol),
             (is_previous_symbol, models.AliasSymbol.is_previous_symbol),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         one_to_many_queries_config = (
             (hgnc_symbol, models.HGNC.symbol),
             (hgnc_identifier, models.HGNC.identifier)
         )
-        q = self.get_one_to_many_queries(q, one_to_many_queries_config)
+        q = self.get_one_to_many_queries(q, one_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
@@ -470,7 +700,8 @@ class QueryManager(BaseDbManager):
                    hgnc_symbol=None,
                    hgnc_identifier=None,
                    limit=None,
-                   as_df=False):
+                   as_df=False,
+                   match=None):
         """Method to query :class:`.models.AliasName` objects in database
 
         :param alias_name: alias name(s)
@@ -493,6 +724,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.AliasSymbol`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -505,13 +739,13 @@ class QueryManager(BaseDbManager):
             (alias_name, models.AliasName.alias_name),
             (is_previous_name, models.AliasName.is_previous_name),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         one_to_many_queries_config = (
             (hgnc_symbol, models.HGNC.symbol),
             (hgnc_identifier, models.HGNC.identifier)
         )
-        q = self.get_one_to_many_queries(q, one_to_many_queries_config)
+        q = self.get_one_to_many_queries(q, one_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
@@ -521,7 +755,8 @@ class QueryManager(BaseDbManager):
                     hgnc_symbol=None,
                     hgnc_identifier=None,
                     limit=None,
-                    as_df=False):
+                    as_df=False,
+                    match=None):
         """Method to query :class:`.models.GeneFamily` objects in database
 
         :param family_identifier: gene family identifier(s)
@@ -544,6 +779,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.AliasSymbol`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -556,17 +794,17 @@ class QueryManager(BaseDbManager):
             (family_identifier, models.GeneFamily.family_identifier),
             (family_name, models.GeneFamily.family_name),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         many_to_many_queries_config = (
             (hgnc_symbol, models.GeneFamily.hgncs, models.HGNC.symbol),
             (hgnc_identifier, models.GeneFamily.hgncs, models.HGNC.identifier),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def ref_seq(self, accession=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def ref_seq(self, accession=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.RefSeq` objects in database
 
         :param accession: RefSeq accessionl(s)
@@ -586,6 +824,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.RefSeq`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -597,17 +838,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (accession, models.RefSeq.accession),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         many_to_many_queries_config = (
             (hgnc_symbol, models.RefSeq.hgncs, models.HGNC.symbol),
             (hgnc_identifier, models.RefSeq.hgncs, models.HGNC.identifier),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def rgd(self, rgdid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def rgd(self, rgdid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.RGD` objects in database
 
         :param rgdid: Rat genome database gene ID(s)
@@ -627,6 +868,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.RGD`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -638,17 +882,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (rgdid, models.RGD.rgdid),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         many_to_many_queries_config = (
             (hgnc_symbol, models.RGD.hgncs, models.HGNC.symbol),
             (hgnc_identifier, models.RGD.hgncs, models.HGNC.identifier),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def omim(self, omimid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def omim(self, omimid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.OMIM` objects in database
 
         :param omimid: Online Mendelian Inheritance in Man (OMIM) ID(s)
@@ -668,6 +912,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.OMIM`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -679,17 +926,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (omimid, models.OMIM.omimid),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         one_to_many_queries_config = (
             (hgnc_symbol, models.HGNC.symbol),
             (hgnc_identifier, models.HGNC.identifier)
         )
-        q = self.get_one_to_many_queries(q, one_to_many_queries_config)
+        q = self.get_one_to_many_queries(q, one_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def mgd(self, mgdid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def mgd(self, mgdid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.MGD` objects in database
 
         :param mgdid: Mouse genome informatics database ID(s)
@@ -709,6 +956,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.MGD`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -720,17 +970,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (mgdid, models.MGD.mgdid),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         many_to_many_queries_config = (
             (hgnc_symbol, models.MGD.hgncs, models.HGNC.symbol),
             (hgnc_identifier, models.MGD.hgncs, models.HGNC.identifier),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def uniprot(self, uniprotid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def uniprot(self, uniprotid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.UniProt` objects in database
 
         :param uniprotid: UniProt identifier(s)
@@ -750,6 +1000,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.UniProt`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -761,17 +1014,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (uniprotid, models.UniProt.uniprotid),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         many_to_many_queries_config = (
             (hgnc_symbol, models.UniProt.hgncs, models.HGNC.symbol),
             (hgnc_identifier, models.UniProt.hgncs, models.HGNC.identifier),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def ccds(self, ccdsid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def ccds(self, ccdsid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.CCDS` objects in database
 
         :param ccdsid: Consensus CDS ID(s)
@@ -791,6 +1044,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.CCDS`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -802,17 +1058,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (ccdsid, models.CCDS.ccdsid),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         one_to_many_queries_config = (
             (hgnc_symbol, models.HGNC.symbol),
             (hgnc_identifier, models.HGNC.identifier)
         )
-        q = self.get_one_to_many_queries(q, one_to_many_queries_config)
+        q = self.get_one_to_many_queries(q, one_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def pubmed(self, pubmedid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def pubmed(self, pubmedid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.PubMed` objects in database
 
         :param pubmedid: alias symbol(s)
@@ -832,6 +1088,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.PubMed`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -843,17 +1102,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (pubmedid, models.PubMed.pubmedid),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         many_to_many_queries_config = (
             (hgnc_symbol, models.PubMed.hgncs, models.HGNC.symbol),
             (hgnc_identifier, models.PubMed.hgncs, models.HGNC.identifier),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def ena(self, enaid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def ena(self, enaid=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.ENA` objects in database
 
         :param enaid: European Nucleotide Archive (ENA) identifier(s)
@@ -873,6 +1132,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.ENA`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -884,17 +1146,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (enaid, models.ENA.enaid),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         many_to_many_queries_config = (
             (hgnc_symbol, models.ENA.hgncs, models.HGNC.symbol),
             (hgnc_identifier, models.ENA.hgncs, models.HGNC.identifier),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def enzyme(self, ec_number=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def enzyme(self, ec_number=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.Enzyme` objects in database
 
         :param ec_number: Enzyme Commission number (EC number)(s)
@@ -914,6 +1176,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.Enzyme`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -925,17 +1190,17 @@ class QueryManager(BaseDbManager):
         model_queries_config = (
             (ec_number, models.Enzyme.ec_number),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         many_to_many_queries_config = (
             (hgnc_symbol, models.Enzyme.hgncs, models.HGNC.symbol),
             (hgnc_identifier, models.Enzyme.hgncs, models.HGNC.identifier),
         )
-        q = self.get_many_to_many_queries(q, many_to_many_queries_config)
+        q = self.get_many_to_many_queries(q, many_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
 
-    def lsdb(self, lsdb=None, url=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False):
+    def lsdb(self, lsdb=None, url=None, hgnc_symbol=None, hgnc_identifier=None, limit=None, as_df=False, match=None):
         """Method to query :class:`.models.LSDB` objects in database
 
         :param lsdb: name(s) of the Locus Specific Mutation Database
@@ -958,6 +1223,9 @@ class QueryManager(BaseDbManager):
 
         :param bool as_df: if `True` results are returned as :class:`pandas.DataFrame`
 
+        :param str match: match mode of string arguments ('exact', 'prefix', 'pattern' or 'case_insensitive'),
+            default: 'pattern' if the value contains a LIKE wildcard (% or _), else 'exact'
+
         :return:
             - if `as_df == False` -> list(:class:`.models.LSDB`)
             - if `as_df == True`  -> :class:`pandas.DataFrame`
@@ -970,12 +1238,12 @@ class QueryManager(BaseDbManager):
             (lsdb, models.LSDB.lsdb),
             (url, models.LSDB.url),
         )
-        q = self.get_model_queries(q, model_queries_config)
+        q = self.get_model_queries(q, model_queries_config, match)
 
         one_to_many_queries_config = (
             (hgnc_symbol, models.HGNC.symbol),
             (hgnc_identifier, models.HGNC.identifier)
         )
-        q = self.get_one_to_many_queries(q, one_to_many_queries_config)
+        q = self.get_one_to_many_queries(q, one_to_many_queries_config, match)
 
         return self._limit_and_df(q, limit, as_df)
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""Readers which stream HGNC data from local files or downloads without loading the whole file into memory.
+
+Files compressed with gzip (`.gz`), bzip2 (`.bz2`) or xz (`.xz`) are decompressed on the fly.
+"""
+
+import io
+import re
+import bz2
+import csv
+import sys
+import gzip
+import json
+import codecs
+import logging
+
+import pandas
+
+try:
+    import lzma
+except ImportError:  # Python 2
+    lzma = None
+
+if sys.version_info[0] == 3:
+    from urllib.request import urlopen
+else:
+    from urllib import urlopen
+
+from ..constants import HGNC_JSON, HCOP_GZIP
+
+log = logging.getLogger('pyhgnc')
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+REGEX_DOCS_START = re.compile(r'"docs"\s*:\s*\[')
+REGEX_SEPARATOR = re.compile(r'[\s,]*')
+
+# column types of the HCOP sixteen column file; columns of the human gene repeat for every species and are
+# categorical like all other low cardinality columns. Entrez identifiers are parsed as float and converted to Int64.
+HCOP_DTYPES = {
+    'ortholog_species': 'int64',
+    'human_entrez_gene': 'float64',
+    'human_ensembl_gene': 'category',
+    'hgnc_id': str,
+    'human_name': 'category',
+    'human_symbol': 'category',
+    'human_chr': 'category',
+    'human_assert_ids': 'category',
+    'ortholog_species_entrez_gene': 'float64',
+    'ortholog_species_ensembl_gene': str,
+    'ortholog_species_db_id': str,
+    'ortholog_species_name': str,
+    'ortholog_species_symbol': str,
+    'ortholog_species_chr': 'category',
+    'ortholog_species_assert_ids': str,
+    'support': 'category',
+}
+
+# marker for missing values in HCOP
+HCOP_NA_VALUES = ['-']
+
+# fields of the HGNC tab-separated complete set with several values (separated by '|') and integer fields, all other
+# fields are strings like in the HGNC JSON file
+HGNC_TSV_LIST_FIELDS = {
+    'alias_symbol', 'alias_name', 'prev_symbol', 'prev_name', 'gene_family', 'gene_family_id', 'gene_group',
+    'gene_group_id', 'refseq_accession', 'ccds_id', 'uniprot_ids', 'pubmed_id', 'mgd_id', 'rgd_id', 'lsdb',
+    'omim_id', 'ena', 'enzyme_id', 'rna_central_ids', 'mane_select',
+}
+HGNC_TSV_INT_FIELDS = {
+    'gene_family_id', 'gene_group_id', 'pubmed_id', 'orphanet', 'homeodb', 'kznf_gene_catalog', 'mamit-trnadb',
+}
+
+# functions which wrap a binary stream into a decompressing stream
+DECOMPRESSORS = {
+    '.gz': lambda stream: gzip.GzipFile(fileobj=stream),
+    '.bz2': bz2.BZ2File,
+    '.xz': lzma.LZMAFile if lzma else None,
+}
+
+
+def split_compression(location):
+    """splits the compression extension ('.gz', '.bz2', '.xz' or '') from a path or URL
+
+    :param str location: path or URL
+    :return: location without and compression extension
+    :rtype: tuple
+    """
+    for extension in DECOMPRESSORS:
+        if location.lower().endswith(extension):
+            return location[:-len(extension)], extension
+    return location, ''
+
+
+class ClosingReader(io.RawIOBase):
+    """Raw stream over a decompressing stream which also closes the underlying file or download"""
+
+    def __init__(self, stream, source):
+        self.stream = stream
+        self.source = source
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self.stream.close()
+            finally:
+                self.source.close()
+        super(ClosingReader, self).close()
+
+
+def open_source(location):
+    """opens a local file or URL as binary stream and decompresses `.gz`, `.bz2` and `.xz` files on the fly
+
+    :param str location: path or URL
+    :return: binary file like object
+    :rtype: io.BufferedReader
+    """
+    source = urlopen(location) if '://' in location else open(location, 'rb')
+    _, extension = split_compression(location)
+
+    if not extension:
+        return io.BufferedReader(ClosingReader(source, source)) if '://' in location else source
+
+    decompressor = DECOMPRESSORS[extension]
+    if decompressor is None:
+        source.close()
+        raise ValueError('{} files need Python 3'.format(extension))
+
+    log.info('decompress {} on the fly'.format(location))
+    return io.BufferedReader(ClosingReader(decompressor(source), source), buffer_size=DEFAULT_CHUNK_SIZE)
+
+
+def iter_json_docs(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields the entries of the first `"docs"` array in a JSON stream one at a time.
+
+    Only the current document and one chunk of the stream are kept in memory.
+
+    :param stream: file like object opened in binary or text mode
+    :param int chunk_size: number of bytes (or characters) read at once
+    :return: generator of dict
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def read():
+        chunk = stream.read(chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = utf8_decoder.decode(chunk, final=not chunk)
+        return chunk
+
+    buffer = ''
+    eof = False
+
+    # search the beginning of the docs array
+    while True:
+        found = REGEX_DOCS_START.search(buffer)
+        if found:
+            buffer = buffer[found.end():]
+            break
+        if eof:
+            raise ValueError('no "docs" array found in JSON stream')
+        chunk = read()
+        eof = not chunk
+        # keep a tail in case '"docs": [' is split between two chunks
+        buffer = buffer[-64:] + chunk
+
+    position = 0
+    while True:
+        position = REGEX_SEPARATOR.match(buffer, position).end()
+
+        if position < len(buffer) and buffer[position] == ']':
+            return
+
+        try:
+            doc, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise
+            # document is incomplete, drop everything already parsed and read the next chunk
+            chunk = read()
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield doc
+        position = end
+
+
+def open_hgnc_json(hgnc_file_path=None):
+    """opens the HGNC JSON file as binary stream from a local path or the HGNC download
+
+    :param str hgnc_file_path: path to local file or URL; if None the file is downloaded from :data:`HGNC_JSON`
+    :return: file like object
+    """
+    location = hgnc_file_path or HGNC_JSON
+    log.info('streaming json data from {}'.format(location))
+    return open_source(location)
+
+
+def get_hgnc_format(location, stream):
+    """returns the format ('json' or 'tsv') of a HGNC file by its extension or its first character
+
+    :param str location: path or URL (e.g. 'hgnc_complete_set.txt.gz')
+    :param stream: binary stream with `peek`
+    :rtype: str
+    """
+    name, _ = split_compression(location.split('?')[0].lower())
+    if name.endswith('.json'):
+        return 'json'
+    if name.endswith(('.txt', '.tsv')):
+        return 'tsv'
+    return 'json' if stream.peek(64).lstrip()[:1] == b'{' else 'tsv'
+
+
+def iter_tsv_docs(stream):
+    """Yields the rows of the HGNC tab-separated complete set as documents with the same keys and types as the
+    documents of the HGNC JSON file (empty fields are left out, fields with several values are lists).
+
+    :param stream: binary file like object
+    :return: generator of dict
+    """
+    lines = (line.decode('utf-8') for line in stream)
+    rows = csv.reader(lines, delimiter='\t', quotechar='"')
+
+    fields = []
+    for field in next(rows):
+        is_list, is_int = field in HGNC_TSV_LIST_FIELDS, field in HGNC_TSV_INT_FIELDS
+        fields.append((field, is_list, is_int))
+
+    for values in rows:
+        doc = {}
+        for (field, is_list, is_int), value in zip(fields, values):
+            if not value:
+                continue
+            if is_list:
+                value = value.split('|')
+                if is_int:
+                    value = [int(x) for x in value]
+            elif is_int:
+                value = int(value)
+            doc[field] = value
+
+        if 'lsdb' in doc:
+            # name and URL of a locus specific database are separated by '|' like the databases themselves
+            lsdbs = doc['lsdb']
+            doc['lsdb'] = ['|'.join(pair) for pair in zip(lsdbs[::2], lsdbs[1::2])]
+
+        yield doc
+
+
+def iter_hgnc_docs(hgnc_file_path=None):
+    """yields the documents (response.docs) of the HGNC JSON file or the rows of the HGNC tab-separated complete
+    set one at a time; compressed files are decompressed on the fly
+
+    :param str hgnc_file_path: path to local file or URL; if None the file is downloaded from :data:`HGNC_JSON`
+    :return: generator of dict
+    """
+    stream = open_hgnc_json(hgnc_file_path)
+    try:
+        if get_hgnc_format(hgnc_file_path or HGNC_JSON, stream) == 'tsv':
+            docs = iter_tsv_docs(stream)
+        else:
+            docs = iter_json_docs(stream)
+
+        for doc in docs:
+            yield doc
+    finally:
+        stream.close()
+
+
+class LineFilter(object):
+    """Read-only file like object which passes the header and only lines starting with one of the given prefixes.
+
+    Lines are compared as text before they are parsed, so filtered lines cost almost nothing.
+    """
+
+    def __init__(self, stream, prefixes):
+        """
+        :param stream: text stream
+        :param list prefixes: prefixes of lines to keep
+        """
+        self.stream = stream
+        self.prefixes = tuple(prefixes)
+        self.buffer = stream.readline()
+
+    def read(self, size=-1):
+        size = size if size is not None and size >= 0 else float('inf')
+        parts, length = [self.buffer], len(self.buffer)
+
+        while length < size:
+            line = self.stream.readline()
+            if not line:
+                break
+            if line.startswith(self.prefixes):
+                parts.append(line)
+                length += len(line)
+
+        data = ''.join(parts)
+        if length > size:
+            data, self.buffer = data[:size], data[size:]
+        else:
+            self.buffer = ''
+        return data
+
+    def close(self):
+        self.stream.close()
+
+
+def open_hcop_text(hcop_file_path=None):
+    """opens the (compressed) HCOP file as text stream
+
+    :param str hcop_file_path: path to local file or URL; if None the file is downloaded from :data:`HCOP_GZIP`
+    :return: file like object
+    """
+    return io.TextIOWrapper(open_source(hcop_file_path or HCOP_GZIP), encoding='utf-8')
+
+
+def skip_rows(chunks, number_of_rows):
+    """skips the first rows of DataFrame chunks (independent of the chunk size)
+
+    :param chunks: iterable of :class:`pandas.DataFrame`
+    :param int number_of_rows: number of rows to skip
+    :return: generator of :class:`pandas.DataFrame`
+    """
+    for df in chunks:
+        if number_of_rows >= len(df):
+            number_of_rows -= len(df)
+            continue
+        if number_of_rows:
+            df = df.iloc[number_of_rows:].copy()
+            number_of_rows = 0
+        yield df
+
+
+def iter_hcop_chunks(hcop_file_path=None, chunksize=100000, species=None):
+    """Yields the HCOP file as :class:`pandas.DataFrame` chunks with explicit column types.
+
+    `-` is parsed as missing value and the column `hgnc_id` (e.g. 'HGNC:5') is replaced by the numeric column
+    `identifier` (e.g. 5). Species, chromosomes and supporting resources are categorical columns.
+
+    :param str hcop_file_path: path to local file; if None the file is downloaded from :data:`HCOP_GZIP`
+    :param int chunksize: number of rows per chunk
+    :param species: only rows of these NCBI taxonomy identifiers (e.g. [10090, 10116]); lines of other species are
+                    skipped before they are parsed
+    :type species: iter[int] or None
+    :return: generator of :class:`pandas.DataFrame`
+    """
+    source = hcop_file_path or HCOP_GZIP
+    if species:
+        log.info('only load HCOP species {}'.format(', '.join(str(taxid) for taxid in species)))
+        source = LineFilter(open_hcop_text(hcop_file_path), ['{}\t'.format(int(taxid)) for taxid in species])
+
+    try:
+        chunks = pandas.read_csv(
+            source,
+            sep='\t',
+            dtype=HCOP_DTYPES,
+            na_values=HCOP_NA_VALUES,
+            chunksize=chunksize
+        )
+
+        for df_hcop in chunks:
+            identifier = pandas.to_numeric(df_hcop.pop('hgnc_id').str.slice(len('HGNC:')))
+            df_hcop['identifier'] = identifier.astype('Int64')
+            df_hcop['ortholog_species'] = df_hcop.ortholog_species.astype('category')
+            for column in ('human_entrez_gene', 'ortholog_species_entrez_gene'):
+                df_hcop[column] = df_hcop[column].astype('Int64')
+            yield df_hcop
+    finally:
+        if isinstance(source, LineFilter):
+            source.close()
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""Instrumentation of imports: wall time, CPU time, rows, peak memory and downloaded bytes per stage."""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+
+from collections import OrderedDict, Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+log = logging.getLogger('pyhgnc')
+
+if sys.version_info[0] == 3:
+    wall_clock, cpu_clock = time.perf_counter, time.process_time
+else:
+    wall_clock, cpu_clock = time.time, time.clock
+
+# stages run concurrently in several threads (see pipeline), so they are measured with the CPU time of the thread
+thread_cpu_clock = getattr(time, 'thread_time', cpu_clock)
+
+
+def get_peak_rss():
+    """peak resident set size of the current process in bytes (None if not available)"""
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+def get_rss():
+    """current resident set size of the current process in bytes (from /proc on Linux, otherwise the peak RSS)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, AttributeError):
+        return get_peak_rss()
+
+
+class Stage(object):
+    """Accumulated measurements of one import stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.rows = Counter()
+        self.bytes_downloaded = 0
+        self.peak_rss = None
+
+    def to_dict(self):
+        number_of_rows = sum(self.rows.values())
+        return OrderedDict([
+            ('name', self.name),
+            ('wall_time', round(self.wall_time, 6)),
+            ('cpu_time', round(self.cpu_time, 6)),
+            ('rows', dict(self.rows)),
+            ('rows_per_second', round(number_of_rows / self.wall_time, 1) if self.wall_time and number_of_rows
+                else None),
+            ('bytes_downloaded', self.bytes_downloaded),
+            ('peak_rss', self.peak_rss),
+        ])
+
+
+class ImportReport(object):
+    """Stage-by-stage report of an import.
+
+    Stages are measured with :meth:`measure`. A stage can be measured several times (e.g. once per document),
+    times and rows are accumulated. Stages can be measured from several threads at the same time (e.g. parsing in a
+    background thread while inserting), the CPU time of a stage is the time of the measuring thread, the total CPU
+    time is the time of the whole process. Work of worker processes is only visible as wall time of the stage
+    waiting for it.
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.imported = None
+        self.started = wall_clock()
+        self.started_cpu = cpu_clock()
+        self.wall_time = None
+        self.cpu_time = None
+        self.peak_rss = None
+        self.lock = threading.Lock()
+
+    def get_stage(self, name):
+        """returns a stage, creates it if it not exists
+
+        :param str name: name of the stage
+        :rtype: Stage
+        """
+        with self.lock:
+            if name not in self.stages:
+                self.stages[name] = Stage(name)
+            return self.stages[name]
+
+    @contextmanager
+    def measure(self, name):
+        """measures wall and CPU time of a block and adds them to a stage
+
+        :param str name: name of the stage
+        :return: the stage (to add rows or downloaded bytes)
+        :rtype: Stage
+        """
+        stage = self.get_stage(name)
+        wall_start, cpu_start = wall_clock(), thread_cpu_clock()
+        try:
+            yield stage
+        finally:
+            wall_time, cpu_time = wall_clock() - wall_start, thread_cpu_clock() - cpu_start
+            with self.lock:
+                stage.wall_time += wall_time
+                stage.cpu_time += cpu_time
+                stage.peak_rss = get_peak_rss()
+
+    def measure_iter(self, name, iterable):
+        """yields the items of an iterable and adds the time spent to produce them to a stage
+
+        :param str name: name of the stage
+        :param iter iterable: e.g. a parser
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.measure(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def add_rows(self, name, rows):
+        """adds written rows per table to a stage, the rows of all stages are summed up in the report
+
+        :param str name: name of the stage
+        :param dict rows: table name -> number of rows
+        """
+        stage = self.get_stage(name)
+        with self.lock:
+            stage.rows.update(rows)
+
+    def add_bytes_downloaded(self, name, number_of_bytes):
+        """adds downloaded bytes to a stage
+
+        :param str name: name of the stage
+        :param int number_of_bytes: downloaded bytes
+        """
+        stage = self.get_stage(name)
+        with self.lock:
+            stage.bytes_downloaded += number_of_bytes
+
+    def finish(self, imported):
+        """stops the total wall and CPU time of the import
+
+        :param bool imported: False if the import was skipped
+        """
+        self.imported = imported
+        self.wall_time = wall_clock() - self.started
+        self.cpu_time = cpu_clock() - self.started_cpu
+        self.peak_rss = get_peak_rss()
+
+    def to_dict(self):
+        """the report as dictionary (JSON serializable)
+
+        :rtype: dict
+        """
+        # only stages writing rows add rows (see add_rows), the total covers all of them
+        rows = Counter()
+        for stage in self.stages.values():
+            rows.update(stage.rows)
+
+        return OrderedDict([
+            ('imported', self.imported),
+            ('wall_time', round(self.wall_time if self.wall_time is not None else wall_clock() - self.started, 6)),
+            ('cpu_time', round(self.cpu_time if self.cpu_time is not None else cpu_clock() - self.started_cpu, 6)),
+            ('rows', dict(rows)),
+            ('bytes_downloaded', sum(stage.bytes_downloaded for stage in self.stages.values())),
+            ('peak_rss', self.peak_rss if self.peak_rss is not None else get_peak_rss()),
+            ('stages', [stage.to_dict() for stage in self.stages.values()]),
+        ])
+
+    def write(self, path):
+        """writes the report as JSON file
+
+        :param str path: path of the JSON file
+        """
+        with open(path, 'w') as report_file:
+            json.dump(self.to_dict(), report_file, indent=2)
+        log.info('import report written to {}'.format(path))
+
+    def log_summary(self):
+        """logs wall time and rows of all stages"""
+        for stage in self.stages.values():
+            log.info('stage {}: {:.2f}s wall, {:.2f}s cpu, {} rows'.format(
+                stage.name, stage.wall_time, stage.cpu_time, sum(stage.rows.values())))
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Snapshots of an imported database: a gzip compressed SQLite file with all PyHGNC tables, the release (source files
+with checksums) and a format version.
+
+One node imports HGNC/HCOP and exports a snapshot, all other nodes restore it: SQLite databases are replaced by the
+decompressed file, other databases are bulk loaded from it.
+"""
+
+import os
+import gzip
+import json
+import shutil
+import sqlite3
+import logging
+import tempfile
+
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import create_engine, select
+
+from . import models
+from . import bulk
+from .download import replace_file
+
+log = logging.getLogger('pyhgnc')
+
+# version of the snapshot layout, snapshots of newer versions are rejected
+SNAPSHOT_FORMAT = 1
+
+# table with format version, PyHGNC version, creation time, release and row counts (only in snapshot files)
+SNAPSHOT_INFO_TABLE = 'snapshot_info'
+
+COPY_BATCH_SIZE = 10000
+
+COMPRESS_CHUNK_SIZE = 1 << 20
+
+# gzip level of snapshots, higher levels are much slower and hardly smaller
+COMPRESS_LEVEL = 6
+
+
+def get_snapshot_tables():
+    """tables of a snapshot (parents before children), without app users and import checkpoints
+
+    :rtype: list[sqlalchemy.Table]
+    """
+    excluded = {models.AppUser.__tablename__, models.ImportCheckpoint.__tablename__}
+    return [table for table in models.Base.metadata.sorted_tables if table.name not in excluded]
+
+
+def copy_tables(source_connection, target_connection, tables, batch_size=COPY_BATCH_SIZE):
+    """copies all rows of the tables from one database into another with batched `executemany`
+
+    :param source_connection: connection of the source database
+    :param target_connection: connection of the target database (in a transaction)
+    :param list tables: tables in insert order
+    :param int batch_size: number of rows read and written at once
+    :return: number of copied rows per table
+    :rtype: collections.Counter
+    """
+    row_counts = Counter()
+    for table in tables:
+        keys = tuple(column.name for column in table.columns)
+        result = source_connection.execute(select([table]))
+        while True:
+            rows = result.fetchmany(batch_size)
+            if not rows:
+                break
+            bulk.executemany(target_connection, table, keys, [tuple(row) for row in rows])
+            row_counts[table.name] += len(rows)
+    return row_counts
+
+
+def is_sqlite_file(engine):
+    """checks if an engine is connected to a SQLite database file (not in memory)"""
+    return engine.dialect.name == 'sqlite' and engine.url.database not in (None, '', ':memory:')
+
+
+def get_release(connection):
+    """release rows (source, location, size, last_modified, md5, parameters) of a database
+
+    :rtype: list[dict]
+    """
+    release_table = models.Release.__table__
+    columns = ('source', 'location', 'size', 'last_modified', 'md5', 'parameters')
+    return [dict(zip(columns, row)) for row in connection.execute(select([release_table.c[x] for x in columns]))]
+
+
+def export_snapshot(engine, path):
+    """exports all tables of a database into a gzip compressed SQLite file
+
+    SQLite databases are copied with the SQLite backup API, other databases table by table.
+
+    :param engine: SQLAlchemy engine of the imported database
+    :param str path: path of the snapshot file (e.g. 'pyhgnc.sqlite.gz')
+    :return: snapshot information (format, PyHGNC version, creation time, release, rows per table)
+    :rtype: dict
+    """
+    import pyhgnc
+
+    tables = get_snapshot_tables()
+
+    with engine.connect() as connection:
+        release = get_release(connection)
+    if not release:
+        raise ValueError('{} contains no imported release'.format(engine.url))
+
+    file_descriptor, tmp_path = tempfile.mkstemp(suffix='.sqlite', dir=os.path.dirname(os.path.abspath(path)))
+    os.close(file_descriptor)
+
+    try:
+        if engine.dialect.name == 'sqlite' and hasattr(sqlite3.Connection, 'backup'):
+            raw_connection = engine.raw_connection()
+            destination = sqlite3.connect(tmp_path)
+            try:
+                raw_connection.connection.backup(destination)
+                for table in (models.AppUser.__table__, models.ImportCheckpoint.__table__):
+                    destination.execute('DELETE FROM {}'.format(table.name))
+                destination.commit()
+            finally:
+                destination.close()
+                raw_connection.close()
+        else:
+            snapshot_engine = create_engine('sqlite:///' + tmp_path)
+            models.Base.metadata.create_all(snapshot_engine, tables=tables)
+            with engine.connect() as source_connection, snapshot_engine.begin() as target_connection:
+                copy_tables(source_connection, target_connection, tables)
+            snapshot_engine.dispose()
+
+        snapshot = sqlite3.connect(tmp_path)
+        try:
+            row_counts = {table.name: snapshot.execute('SELECT COUNT(*) FROM {}'.format(table.name)).fetchone()[0]
+                          for table in tables}
+            info = {
+                'format': SNAPSHOT_FORMAT,
+                'pyhgnc_version': pyhgnc.__version__,
+                'created': datetime.now().isoformat(),
+                'release': release,
+                'rows': row_counts,
+            }
+            snapshot.execute('CREATE TABLE {} (key TEXT PRIMARY KEY, value TEXT)'.format(SNAPSHOT_INFO_TABLE))
+            snapshot.executemany('INSERT INTO {} VALUES (?, ?)'.format(SNAPSHOT_INFO_TABLE),
+                                 [(key, json.dumps(value)) for key, value in info.items()])
+            snapshot.commit()
+            snapshot.execute('VACUUM')
+        finally:
+            snapshot.close()
+
+        compress_path = path + '.part'
+        with open(tmp_path, 'rb') as snapshot_file, gzip.open(compress_path, 'wb', COMPRESS_LEVEL) as compressed_file:
+            shutil.copyfileobj(snapshot_file, compressed_file, COMPRESS_CHUNK_SIZE)
+        replace_file(compress_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    log.info('exported snapshot {} with {} rows'.format(path, sum(row_counts.values())))
+    return info
+
+
+def decompress_snapshot(path, target_path):
+    """decompresses a snapshot file
+
+    :param str path: path of the snapshot file
+    :param str target_path: path of the SQLite file
+    :raises ValueError: if the file is not gzip compressed
+    """
+    try:
+        with gzip.open(path, 'rb') as compressed_file, open(target_path, 'wb') as snapshot_file:
+            shutil.copyfileobj(compressed_file, snapshot_file, COMPRESS_CHUNK_SIZE)
+    except (IOError, OSError, EOFError) as error:
+        raise ValueError('{} is no PyHGNC snapshot: {}'.format(path, error))
+
+
+def read_snapshot_info(snapshot_path):
+    """reads and checks the information of a decompressed snapshot
+
+    :param str snapshot_path: path of the decompressed SQLite file
+    :return: snapshot information (see :func:`export_snapshot`)
+    :rtype: dict
+    :raises ValueError: if the file is no snapshot, has a newer format or other columns than the current models
+    """
+    snapshot = sqlite3.connect(snapshot_path)
+    try:
+        try:
+            info = {key: json.loads(value) for key, value in
+                    snapshot.execute('SELECT key, value FROM {}'.format(SNAPSHOT_INFO_TABLE))}
+        except sqlite3.DatabaseError:
+            raise ValueError('{} is no PyHGNC snapshot'.format(snapshot_path))
+
+        if info['format'] > SNAPSHOT_FORMAT:
+            raise ValueError('snapshot format {} is newer than the supported format {}, please update PyHGNC'.format(
+                info['format'], SNAPSHOT_FORMAT))
+
+        for table in get_snapshot_tables():
+            columns = {row[1] for row in snapshot.execute('PRAGMA table_info({})'.format(table.name))}
+            if columns != {column.name for column in table.columns}:
+                raise ValueError('table {} of the snapshot (PyHGNC {}) does not match this PyHGNC version'.format(
+                    table.name, info['pyhgnc_version']))
+    finally:
+        snapshot.close()
+
+    return info
+
+
+def remove_snapshot_info(snapshot_path):
+    """removes the snapshot information from a decompressed snapshot which is used as database"""
+    snapshot = sqlite3.connect(snapshot_path)
+    try:
+        snapshot.execute('DROP TABLE {}'.format(SNAPSHOT_INFO_TABLE))
+        snapshot.commit()
+    finally:
+        snapshot.close()
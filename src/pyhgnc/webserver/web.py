@@ -1,11 +1,11 @@
 from flasgger import Swagger
 from functools import wraps
-from flask import Flask, jsonify, request, render_template, flash, redirect, url_for, session
+from flask import Flask, jsonify, request, render_template, flash, redirect, url_for, session, abort, make_response
 from passlib.hash import sha256_crypt
 from wtforms import Form, StringField, PasswordField, validators
 from flask_cors import CORS
 from ..manager.models import AppUser
-from ..manager.query import QueryManager
+from ..manager.query import QueryManager, MATCH_MODES
 from .. import __title__ as project_title
 
 app = Flask(__name__)
@@ -57,7 +57,7 @@ query = QueryManager()
 
 
 def get_args(request_args, allowed_int_args=(), allowed_str_args=(), allowed_bool_args=()):
-    """Check allowed argument names and return is as dictionary"""
+    """Check allowed argument names and return is as dictionary (aborts with 400 if the match mode is unknown)"""
     args = {}
 
     for allowed_int_arg in allowed_int_args:
@@ -81,6 +81,10 @@ def get_args(request_args, allowed_int_args=(), allowed_str_args=(), allowed_boo
         elif str_value == 'false':
             args[allowed_bool_arg] = False
 
+    if 'match' in args and args['match'] not in MATCH_MODES:
+        abort(make_response(jsonify(error='unknown match mode {}'.format(args['match']), allowed=list(MATCH_MODES)),
+                            400))
+
     return args
 
 
@@ -403,6 +407,13 @@ def query_entry():
         description: 'Symbol used within international ImMunoGeneTics information system'
         default:
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
@@ -412,8 +423,8 @@ def query_entry():
     allowed_str_args = ['name', 'symbol', 'status', 'uuid', 'locus_group', 'locus_type',
                         'date_name_changed', 'date_modified', 'date_symbol_changed', 'date_approved_reserved',
                         'ensembl_gene', 'vega', 'lncrnadb', 'horde', 'mirbase', 'iuphar', 'ucsc', 'snornabase',
-                        'pseudogeneorg', 'bioparadigmsslc', 'locationsortable', 'merops', 'location', 'cosmic', 'imgt'
-                        ]
+                        'pseudogeneorg', 'bioparadigmsslc', 'locationsortable', 'merops', 'location', 'cosmic', 'imgt',
+                        'match']
 
     allowed_int_args = ['limit', 'identifier', 'orphanet', 'entrez', ]
 
@@ -466,13 +477,20 @@ def alias_name():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['alias_name', 'hgnc_symbol', 'hgnc_identifier']
+    allowed_str_args = ['alias_name', 'hgnc_symbol', 'hgnc_identifier', 'match']
 
     allowed_int_args = ['limit', ]
 
@@ -607,6 +625,20 @@ def orthology_prediction():
         description: 'Support on HGNC website'
         default: '%OrthoDB%'
 
+      - name: support_resource
+        in: query
+        type: string
+        required: false
+        description: 'Resource which supports the prediction'
+        default: 'OrthoDB'
+
+      - name: min_support
+        in: query
+        type: integer
+        required: false
+        description: 'Minimal number of supporting resources'
+        default: 5
+
       - name: hgnc_symbol
         in: query
         type: string
@@ -621,6 +653,13 @@ def orthology_prediction():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
@@ -631,9 +670,9 @@ def orthology_prediction():
                         'human_chr', 'human_assert_ids', 'ortholog_species_entrez_gene',
                         'ortholog_species_ensembl_gene', 'ortholog_species_db_id', 'ortholog_species_name',
                         'ortholog_species_symbol', 'ortholog_species_chr', 'ortholog_species_assert_ids', 'support',
-                        'hgnc_symbol', 'hgnc_identifier']
+                        'support_resource', 'hgnc_symbol', 'hgnc_identifier', 'match']
 
-    allowed_int_args = ['limit', 'ortholog_species']
+    allowed_int_args = ['limit', 'ortholog_species', 'min_support']
 
     args = get_args(
         request_args=request.args,
@@ -644,6 +683,79 @@ def orthology_prediction():
     return jsonify(query.orthology_prediction(**args))
 
 
+@app.route("/api/query/best_ortholog/", methods=['GET', 'POST'])
+def best_ortholog():
+    """
+    Returns the best supported orthology prediction of HGNC entries per species by query paramaters
+    ---
+
+    tags:
+
+      - Query functions
+
+    parameters:
+
+      - name: ortholog_species
+        in: query
+        type: integer
+        required: false
+        description: 'NCBI taxonomy identifier'
+        default: 10090
+
+      - name: ortholog_species_symbol
+        in: query
+        type: string
+        required: false
+        description: 'Ortholog species gene symbol'
+        default: 'App'
+
+      - name: min_support
+        in: query
+        type: integer
+        required: false
+        description: 'Minimal number of supporting resources'
+        default: 5
+
+      - name: hgnc_symbol
+        in: query
+        type: string
+        required: false
+        description: 'HGNC symbol'
+        default: 'APP'
+
+      - name: hgnc_identifier
+        in: query
+        type: integer
+        required: false
+        description: 'HGNC identifier'
+        default: 620
+
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 1
+    """
+    allowed_str_args = ['ortholog_species_symbol', 'hgnc_symbol', 'match']
+
+    allowed_int_args = ['ortholog_species', 'min_support', 'limit', 'hgnc_identifier']
+
+    args = get_args(
+        request_args=request.args,
+        allowed_int_args=allowed_int_args,
+        allowed_str_args=allowed_str_args
+    )
+
+    return jsonify(query.best_ortholog(**args))
+
+
 @app.route("/api/query/alias_symbol/", methods=['GET', 'POST'])
 def alias_symbol():
     """
@@ -684,13 +796,20 @@ def alias_symbol():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['alias_symbol', 'hgnc_symbol', 'hgnc_identifier']
+    allowed_str_args = ['alias_symbol', 'hgnc_symbol', 'hgnc_identifier', 'match']
 
     allowed_int_args = ['limit', ]
 
@@ -746,13 +865,20 @@ def gene_family():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['family_name', 'hgnc_symbol']
+    allowed_str_args = ['family_name', 'hgnc_symbol', 'match']
 
     allowed_int_args = ['limit', 'family_identifier', 'hgnc_identifier']
 
@@ -798,13 +924,20 @@ def ref_seq():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['accession', 'hgnc_symbol']
+    allowed_str_args = ['accession', 'hgnc_symbol', 'match']
 
     allowed_int_args = ['limit', 'hgnc_identifier']
 
@@ -850,13 +983,20 @@ def rgd():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol']
+    allowed_str_args = ['hgnc_symbol', 'match']
 
     allowed_int_args = ['rgdid', 'limit', 'hgnc_identifier']
 
@@ -902,13 +1042,20 @@ def omim():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol']
+    allowed_str_args = ['hgnc_symbol', 'match']
 
     allowed_int_args = ['omimid', 'limit', 'hgnc_identifier']
 
@@ -954,13 +1101,20 @@ def mgd():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol']
+    allowed_str_args = ['hgnc_symbol', 'match']
 
     allowed_int_args = ['mgdid', 'limit', 'hgnc_identifier']
 
@@ -1006,13 +1160,20 @@ def uniprot():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol', 'uniprotid']
+    allowed_str_args = ['hgnc_symbol', 'uniprotid', 'match']
 
     allowed_int_args = ['limit', 'hgnc_identifier']
 
@@ -1058,13 +1219,20 @@ def ccds():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol', 'ccdsid']
+    allowed_str_args = ['hgnc_symbol', 'ccdsid', 'match']
 
     allowed_int_args = ['limit', 'hgnc_identifier']
 
@@ -1110,13 +1278,20 @@ def pubmed():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol']
+    allowed_str_args = ['hgnc_symbol', 'match']
 
     allowed_int_args = ['pubmedid', 'limit', 'hgnc_identifier']
 
@@ -1162,13 +1337,20 @@ def ena():
         description: 'HGNC identifier'
         default: 620
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol', 'enaid']
+    allowed_str_args = ['hgnc_symbol', 'enaid', 'match']
 
     allowed_int_args = ['limit', 'hgnc_identifier']
 
@@ -1214,13 +1396,20 @@ def enzyme():
         description: 'HGNC identifier'
         default: 256
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol', 'ec_number']
+    allowed_str_args = ['hgnc_symbol', 'ec_number', 'match']
 
     allowed_int_args = ['limit', 'hgnc_identifier']
 
@@ -1273,13 +1462,20 @@ def lsdb():
         description: 'HGNC identifier'
         default: 18149
 
+      - name: match
+        in: query
+        type: string
+        required: false
+        enum: ['exact', 'prefix', 'pattern', 'case_insensitive']
+        description: 'match mode of string parameters (default: pattern if a value contains % or _, else exact)'
+
       - name: limit
         in: query
         type: integer
         required: false
         default: 1
     """
-    allowed_str_args = ['hgnc_symbol', 'lsdb', 'url']
+    allowed_str_args = ['hgnc_symbol', 'lsdb', 'url', 'match']
 
     allowed_int_args = ['limit', 'hgnc_identifier']
 
@@ -0,0 +1,696 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import bz2
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+
+import pandas
+from sqlalchemy import event
+
+try:
+    import lzma
+except ImportError:  # Python 2
+    lzma = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+from pyhgnc.manager import models, reader, defaults, bulk, pipeline, snapshot, columnar
+from pyhgnc.manager import lookup
+from pyhgnc.manager.lookup import LookupIndex
+from pyhgnc.manager.database import DbManager, update
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+test_data = os.path.join(dir_path, 'data')
+hgnc_test_file = os.path.join(test_data, 'hgnc_test.json')
+hcop_test_file = os.path.join(test_data, 'hcop_test.txt')
+
+count_models = (
+    models.HGNC,
+    models.AliasSymbol,
+    models.AliasName,
+    models.GeneFamily,
+    models.RefSeq,
+    models.RGD,
+    models.OMIM,
+    models.MGD,
+    models.UniProt,
+    models.CCDS,
+    models.PubMed,
+    models.ENA,
+    models.Enzyme,
+    models.LSDB,
+    models.OrthologyPrediction,
+)
+
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def get_manager(self, name):
+        return DbManager(connection='sqlite:///' + os.path.join(self.tmp_dir, name))
+
+    @staticmethod
+    def get_counts(manager):
+        return {model.__tablename__: manager.session.query(model).count() for model in count_models}
+
+    def test_bulk_equals_orm(self):
+        bulk_manager = self.get_manager('bulk.db')
+        bulk_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+
+        orm_manager = self.get_manager('orm.db')
+        orm_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file, orm=True)
+
+        self.assertEqual(self.get_counts(orm_manager), self.get_counts(bulk_manager))
+
+        # indexes are created after the load, statistics are up to date
+        with bulk_manager.engine.connect() as connection:
+            index_names = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+            analyzed = {row[0] for row in connection.execute('SELECT tbl FROM sqlite_stat1')}
+        self.assertTrue({index.name for index in models.HGNC.__table__.indexes} <= index_names)
+        self.assertIn(models.HGNC.__tablename__, analyzed)
+
+        for manager in (bulk_manager, orm_manager):
+            a1cf = manager.session.query(models.HGNC).filter(models.HGNC.symbol == 'A1CF').one()
+            self.assertEqual(['NM_014576'], [x.accession for x in a1cf.refseqs])
+            self.assertEqual(4, len(a1cf.ccdss))
+            self.assertEqual({11815617, 11072063}, {x.pubmedid for x in a1cf.pubmeds})
+            manager.session.close()
+
+    def test_parallel_import(self):
+        serial_manager = self.get_manager('serial.db')
+        serial_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+
+        parallel_manager = self.get_manager('parallel.db')
+        parallel_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file, jobs=2)
+
+        self.assertEqual(self.get_counts(serial_manager), self.get_counts(parallel_manager))
+
+        for manager in (serial_manager, parallel_manager):
+            manager.session.close()
+
+    def test_pipelined_import(self):
+        sequential_manager = self.get_manager('sequential.db')
+        sequential_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file,
+                                     pipelined=False)
+
+        pipelined_manager = self.get_manager('pipelined.db')
+        report = pipelined_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+
+        self.assertEqual(self.get_counts(sequential_manager), self.get_counts(pipelined_manager))
+        self.assertIn('hcop_parse', [stage['name'] for stage in report['stages']])
+
+        for manager in (sequential_manager, pipelined_manager):
+            manager.session.close()
+
+    def test_prefetch(self):
+        self.assertEqual(list(range(10)), list(pipeline.Prefetch(iter(range(10)), size=1, batch_size=3)))
+
+        def failing():
+            yield 1
+            raise ValueError('parse error')
+
+        with self.assertRaises(ValueError):
+            list(pipeline.Prefetch(failing()))
+
+        with self.assertRaises(IOError):
+            pipeline.Task(open, (os.path.join(self.tmp_dir, 'missing.json'),)).result()
+
+    def test_resume_import(self):
+        self.check_resume_import(sqlite_fast=False)
+
+    def test_resume_import_default_flags(self):
+        # resume disables the SQLite import pragmas (default), otherwise no checkpoints would be recorded
+        self.check_resume_import()
+
+    def test_resume_import_other_hcop_chunksize(self):
+        # the checkpoint counts HCOP rows, so the resumed import may read chunks of another size
+        self.check_resume_import(resume_hcop_chunksize=3, sqlite_fast=False)
+
+    def check_resume_import(self, resume_hcop_chunksize=10, **profile_kwargs):
+        with open(hgnc_test_file) as json_file:
+            docs = json.load(json_file)['response']['docs']
+        hgnc_file = self.dump_hgnc_json('hgnc_resume.json', docs)
+        import_kwargs = dict(silent=True, hgnc_file_path=hgnc_file, hcop_file_path=hcop_test_file, hcop_chunksize=10,
+                             pipelined=False, **profile_kwargs)
+
+        full_manager = self.get_manager('full.db')
+        full_manager.db_import(**import_kwargs)
+
+        class Interrupted(Exception):
+            pass
+
+        class InterruptedManager(DbManager):
+            """dies after a number of HGNC records or HCOP chunks"""
+
+            def __init__(self, connection, records=None, chunks=None):
+                super(InterruptedManager, self).__init__(connection)
+                self.records, self.chunks = records, chunks
+
+            def _iter_records(self, docs):
+                for number, record in enumerate(super(InterruptedManager, self)._iter_records(docs)):
+                    if number == self.records:
+                        raise Interrupted
+                    yield record
+
+            def _df_to_rows(self, df):
+                if self.chunks == 0:
+                    raise Interrupted
+                self.chunks = self.chunks - 1 if self.chunks else self.chunks
+                return DbManager._df_to_rows(df)
+
+        connection = 'sqlite:///' + os.path.join(self.tmp_dir, 'resume.db')
+        interval = defaults.CHECKPOINT_INTERVAL
+        defaults.CHECKPOINT_INTERVAL = 1
+        try:
+            for records, chunks, checkpoint in ((2, None, ('hgnc', 2)), (None, 1, ('hcop', 10))):
+                interrupted = InterruptedManager(connection, records=records, chunks=chunks)
+                with self.assertRaises(Interrupted):
+                    interrupted.db_import(resume=True, **import_kwargs)
+                sources = interrupted.fetch_sources(hgnc_file, hcop_test_file)
+                self.assertEqual(checkpoint, interrupted.get_checkpoint(sources))
+                interrupted.session.close()
+                interrupted.engine.dispose()
+
+            manager = DbManager(connection)
+            manager.db_import(resume=True, **dict(import_kwargs, hcop_chunksize=resume_hcop_chunksize))
+        finally:
+            defaults.CHECKPOINT_INTERVAL = interval
+
+        self.assertIsNone(manager.get_checkpoint(manager.fetch_sources(hgnc_file, hcop_test_file)))
+        self.assertEqual(self.get_counts(full_manager), self.get_counts(manager))
+
+        for manager in (full_manager, manager):
+            manager.session.close()
+
+    def test_snapshot(self):
+        source_manager = self.get_manager('source.db')
+        source_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+        counts = self.get_counts(source_manager)
+
+        snapshot_path = os.path.join(self.tmp_dir, 'pyhgnc.sqlite.gz')
+        info = source_manager.export_snapshot(snapshot_path, silent=True)
+        self.assertEqual(snapshot.SNAPSHOT_FORMAT, info['format'])
+        self.assertEqual({'hgnc', 'hcop'}, {release['source'] for release in info['release']})
+
+        # SQLite file: the snapshot replaces the database file
+        file_manager = self.get_manager('restored.db')
+        self.assertTrue(file_manager.restore_snapshot(snapshot_path, silent=True)['imported'])
+        self.assertEqual(counts, self.get_counts(file_manager))
+        with file_manager.engine.connect() as connection:
+            self.assertFalse(file_manager.engine.dialect.has_table(connection, snapshot.SNAPSHOT_INFO_TABLE))
+        self.assertFalse(file_manager.restore_snapshot(snapshot_path, silent=True)['imported'])
+
+        # other databases: bulk load
+        memory_manager = DbManager(connection='sqlite://')
+        self.assertTrue(memory_manager.restore_snapshot(snapshot_path, silent=True)['imported'])
+        self.assertEqual(counts, self.get_counts(memory_manager))
+
+        with self.assertRaises(ValueError):
+            memory_manager.restore_snapshot(self.dump_hgnc_json('no_snapshot.json', []), silent=True)
+
+        for manager in (source_manager, file_manager, memory_manager):
+            manager.session.close()
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_export_tables(self):
+        manager = self.get_manager('columnar.db')
+        manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+
+        for file_format in columnar.EXPORT_FORMATS:
+            directory = os.path.join(self.tmp_dir, file_format)
+            exported = manager.export_tables(directory, file_format=file_format, silent=True)
+            self.assertEqual({table.name for table in snapshot.get_snapshot_tables()}, set(exported))
+
+            path = exported[models.HGNC.__tablename__]['path']
+            if file_format == 'arrow':
+                hgnc = pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+            else:
+                hgnc = pyarrow.parquet.read_table(path, memory_map=True)
+            self.assertEqual(3, hgnc.num_rows)
+            self.assertEqual(pyarrow.int32(), hgnc.schema.field('identifier').type)
+            self.assertEqual(pyarrow.date32(), hgnc.schema.field('date_approved_reserved').type)
+            self.assertEqual(exported[models.OrthologyPrediction.__tablename__]['rows'],
+                             manager.session.query(models.OrthologyPrediction).count())
+
+        with self.assertRaises(ValueError):
+            manager.export_tables(self.tmp_dir, file_format='csv', silent=True)
+        manager.session.close()
+
+    def test_skip_unchanged_release(self):
+        manager = self.get_manager('release.db')
+        self.assertTrue(manager.db_import(silent=True, hgnc_file_path=hgnc_test_file,
+                                          hcop_file_path=hcop_test_file)['imported'])
+        self.assertEqual({'hgnc', 'hcop'}, {release.source for release in manager.session.query(models.Release)})
+        manager.session.close()
+
+        report = manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+        self.assertFalse(report['imported'])
+        self.assertTrue(manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file,
+                                          force=True)['imported'])
+
+        with open(hgnc_test_file) as json_file:
+            docs = json.load(json_file)['response']['docs']
+        changed_hgnc_file = self.dump_hgnc_json('hgnc_changed.json', docs[:1])
+        self.assertTrue(manager.db_import(silent=True, hgnc_file_path=changed_hgnc_file,
+                                          hcop_file_path=hcop_test_file)['imported'])
+        self.assertEqual(1, manager.session.query(models.HGNC).count())
+        manager.session.close()
+
+    def test_lookup_index(self):
+        manager = self.get_manager('lookup.db')
+        manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+
+        index = LookupIndex(connection=manager.connection, check_interval=0)
+        self.assertEqual((5, 'symbol', False), index.resolve('A1BG'))
+        self.assertEqual((16155, 'previous_symbol', False), index.resolve('C20orf162'))
+        self.assertEqual((24086, 'alias_symbol', False), index.resolve('ACF'))
+        self.assertIsNone(index.resolve('UNKNOWN'))
+        self.assertEqual(24086, index.symbol('A1CF'))
+        self.assertIsNone(index.symbol('ACF'))
+        self.assertEqual('A1BG', index.hgnc('HGNC:5'))
+        self.assertEqual(16155, index.entrez(90204))
+        self.assertEqual(24086, index.ensembl('ENSG00000148584'))
+        self.assertEqual((5,), index.uniprot('P04217'))
+        self.assertEqual((), index.uniprot('UNKNOWN'))
+        self.assertFalse(index.refresh())
+
+        # a new import changes the release, the index is rebuilt before the next lookup
+        with open(hgnc_test_file) as json_file:
+            docs = json.load(json_file)['response']['docs']
+        manager.db_import(silent=True, hgnc_file_path=self.dump_hgnc_json('hgnc_a1bg.json', docs[:1]),
+                          hcop_file_path=hcop_test_file)
+        self.assertIsNone(index.resolve('A1CF'))
+        self.assertEqual('A1BG', index.hgnc(5))
+        manager.session.close()
+
+    def test_sqlite_import_profile(self):
+        manager = self.get_manager('profile.db')
+        with manager.engine.connect() as connection:
+            connection.execute('PRAGMA journal_mode = WAL')
+
+        manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+
+        with manager.engine.connect() as connection:
+            self.assertEqual('wal', connection.execute('PRAGMA journal_mode').scalar())
+            self.assertEqual(2, connection.execute('PRAGMA synchronous').scalar())
+        self.assertEqual(3, manager.session.query(models.HGNC).count())
+        manager.session.close()
+
+    def test_sqlite_in_memory_import(self):
+        file_manager = self.get_manager('file.db')
+        file_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+
+        memory_manager = self.get_manager('memory.db')
+        memory_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file,
+                                 sqlite_in_memory=True)
+
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, 'memory.db' + defaults.SHADOW_SUFFIX)))
+        self.assertEqual(self.get_counts(file_manager), self.get_counts(memory_manager))
+        for manager in (file_manager, memory_manager):
+            manager.session.close()
+
+    def test_import_report(self):
+        report_path = os.path.join(self.tmp_dir, 'report.json')
+        connection = 'sqlite:///' + os.path.join(self.tmp_dir, 'report.db')
+        report = update(connection=connection, silent=True, hgnc_file_path=hgnc_test_file,
+                        hcop_file_path=hcop_test_file, report_path=report_path)
+
+        with open(report_path) as report_file:
+            self.assertEqual(json.loads(json.dumps(report)), json.load(report_file))
+
+        self.assertTrue(report['imported'])
+        self.assertEqual(3, report['rows'][models.HGNC.__tablename__])
+        self.assertEqual(70, report['rows'][models.OrthologyPrediction.__tablename__])
+
+        stages = {stage['name']: stage for stage in report['stages']}
+        for name in ('download', 'hgnc_parse', 'hgnc_transform', 'hgnc_insert', 'hgnc_commit', 'hcop_parse',
+                     'hcop_insert', 'hcop_commit', 'create_indexes', 'optimize'):
+            self.assertIn(name, stages)
+            self.assertGreaterEqual(stages[name]['wall_time'], 0)
+        self.assertEqual(0, report['bytes_downloaded'])
+        self.assertIsNotNone(stages['hcop_insert']['rows_per_second'])
+
+        best_orthologs = stages['best_ortholog']['rows'][models.BestOrtholog.__tablename__]
+        self.assertGreater(best_orthologs, 0)
+        self.assertEqual(best_orthologs, report['rows'][models.BestOrtholog.__tablename__])
+        self.assertEqual(sum(sum(stage['rows'].values()) for stage in report['stages']), sum(report['rows'].values()))
+
+    def test_intern_registry(self):
+        registry = bulk.InternRegistry()
+        self.assertIsNone(registry.get('refseq', 'NM_1'))
+        registry.add('refseq', 'NM_1', 1)
+        self.assertEqual(1, registry.get('refseq', 'NM_1'))
+        self.assertEqual(0.5, registry.hit_rate)
+        self.assertEqual(1, registry.stats()['entries'])
+        self.assertGreater(registry.memory_size(), 0)
+        registry.clear()
+        self.assertEqual(0, len(registry))
+
+    def test_repeated_orm_import(self):
+        manager = self.get_manager('repeated.db')
+        import_kwargs = dict(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file, orm=True,
+                             force=True)
+
+        manager.db_import(**import_kwargs)
+        counts = self.get_counts(manager)
+        manager.session.close()
+
+        # shared entities of the first import must neither leak into nor be reattached by the second import
+        manager.db_import(**import_kwargs)
+        self.assertIsNone(manager.registry)
+        self.assertEqual(counts, self.get_counts(manager))
+        manager.session.close()
+
+    def test_bounded_memory_orm_import(self):
+        with open(hgnc_test_file) as json_file:
+            docs = json.load(json_file)['response']['docs']
+        # a copy of the first gene shares all families, RefSeqs, PubMeds, ... with it
+        copy = dict(docs[0], hgnc_id='HGNC:999999', symbol='COPY1', uuid='copy')
+        shared_file = self.dump_hgnc_json('hgnc_shared.json', docs + [copy])
+
+        bulk_manager = self.get_manager('bulk_shared.db')
+        bulk_manager.db_import(silent=True, hgnc_file_path=shared_file, hcop_file_path=hcop_test_file)
+
+        chunk_sizes = defaults.LOW_MEMORY_CHUNKSIZE, defaults.MIN_CHUNKSIZE
+        defaults.LOW_MEMORY_CHUNKSIZE, defaults.MIN_CHUNKSIZE = 1, 1
+        try:
+            chunked_manager = self.get_manager('chunked.db')
+            chunked_manager.db_import(silent=True, hgnc_file_path=shared_file, hcop_file_path=hcop_test_file,
+                                      orm=True, low_memory=True)
+        finally:
+            defaults.LOW_MEMORY_CHUNKSIZE, defaults.MIN_CHUNKSIZE = chunk_sizes
+
+        # every document is committed separately, shared entities of earlier chunks are reused and not duplicated
+        self.assertEqual(self.get_counts(bulk_manager), self.get_counts(chunked_manager))
+
+        for manager in (bulk_manager, chunked_manager):
+            manager.session.close()
+
+    def test_adaptive_chunk_size(self):
+        self.assertEqual(1000, bulk.AdaptiveChunkSize(1000).adjust())
+        self.assertEqual(500, bulk.AdaptiveChunkSize(1000, memory_budget=1).adjust())
+        self.assertEqual(2000, bulk.AdaptiveChunkSize(1000, memory_budget=2 ** 50).adjust())
+        self.assertEqual(defaults.MIN_CHUNKSIZE, bulk.AdaptiveChunkSize(1, memory_budget=1).adjust())
+
+    def test_hcop_chunksize(self):
+        def get_hcop_rows(manager):
+            session = manager.session
+            prediction_rows = session.query(
+                models.OrthologyPrediction.ortholog_species, models.OrthologyPrediction.ortholog_species_symbol,
+                models.OrthologyPrediction.hgnc_id, models.OrthologyPrediction.support,
+                models.OrthologyPrediction.support_count,
+            ).order_by(models.OrthologyPrediction.id).all()
+            support_rows = session.query(models.OrthologyPrediction.id, models.SupportResource.name).join(
+                models.OrthologyPrediction.support_resources).order_by(
+                models.OrthologyPrediction.id, models.SupportResource.name).all()
+            return prediction_rows, support_rows
+
+        single_manager = self.get_manager('single_chunk.db')
+        single_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+
+        chunked_manager = self.get_manager('hcop_chunks.db')
+        chunked_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file,
+                                  hcop_chunksize=7)
+        self.assertEqual(10, len(list(reader.iter_hcop_chunks(hcop_test_file, chunksize=7))))
+
+        self.assertEqual(self.get_counts(single_manager), self.get_counts(chunked_manager))
+        prediction_rows, support_rows = get_hcop_rows(chunked_manager)
+        self.assertEqual(70, len(prediction_rows))
+        self.assertGreater(len(support_rows), len(prediction_rows))
+        self.assertEqual(get_hcop_rows(single_manager), (prediction_rows, support_rows))
+        self.assertEqual(single_manager.session.query(models.SupportResource).count(),
+                         chunked_manager.session.query(models.SupportResource).count())
+        for manager in (single_manager, chunked_manager):
+            manager.session.close()
+
+    def test_hcop_dtypes(self):
+        with open(hcop_test_file) as hcop_file:
+            header, line = hcop_file.readline(), hcop_file.readline().rstrip('\n').split('\t')
+        # ortholog_species_entrez_gene, ortholog_species_ensembl_gene, ortholog_species_db_id,
+        # ortholog_species_symbol and ortholog_species_chr
+        line[8:11] = ['-', '00012345', 'ZDB-GENE-040426-0007']
+        line[12:14] = ['0610009B22Rik', '-']
+        path = os.path.join(self.tmp_dir, 'hcop_dtypes.txt')
+        with open(path, 'w') as hcop_file:
+            hcop_file.write(header + '\t'.join(line) + '\n')
+
+        df_hcop = next(reader.iter_hcop_chunks(path))
+        for column, dtype in reader.HCOP_DTYPES.items():
+            if column == 'hgnc_id':
+                continue
+            if dtype == 'category' or column == 'ortholog_species':
+                self.assertEqual('category', df_hcop[column].dtype.name, column)
+            elif dtype == 'float64':
+                self.assertEqual('Int64', df_hcop[column].dtype.name, column)
+            else:
+                self.assertEqual(object, df_hcop[column].dtype, column)
+        self.assertEqual('Int64', df_hcop.identifier.dtype.name)
+        self.assertNotIn('hgnc_id', df_hcop.columns)
+
+        row = df_hcop.iloc[0]
+        self.assertEqual(5, row.identifier)
+        self.assertEqual(1, row.human_entrez_gene)
+        self.assertEqual('00012345', row.ortholog_species_ensembl_gene)
+        self.assertEqual('ZDB-GENE-040426-0007', row.ortholog_species_db_id)
+        self.assertEqual('0610009B22Rik', row.ortholog_species_symbol)
+        self.assertTrue(pandas.isnull(row.ortholog_species_entrez_gene))
+        self.assertTrue(pandas.isnull(row.ortholog_species_chr))
+
+    def test_hcop_species(self):
+        manager = self.get_manager('species.db')
+        manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file,
+                          hcop_species=[10090, 10116, 7955])
+
+        species = {prediction.ortholog_species for prediction in manager.session.query(models.OrthologyPrediction)}
+        self.assertEqual({10090, 10116, 7955}, species)
+        self.assertEqual(18, manager.session.query(models.OrthologyPrediction).count())
+        manager.session.close()
+
+        # another species filter is another release
+        report = manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+        self.assertTrue(report['imported'])
+        self.assertEqual(70, manager.session.query(models.OrthologyPrediction).count())
+        manager.session.close()
+
+    def dump_hgnc_tsv(self, name, docs):
+        """writes documents in the format of the HGNC tab-separated complete set"""
+        fields = sorted({field for doc in docs for field in doc if field != '_version_'})
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as tsv_file:
+            tsv_file.write('\t'.join(fields) + '\n')
+            for doc in docs:
+                values = []
+                for field in fields:
+                    value = doc.get(field, '')
+                    if isinstance(value, list):
+                        value = '"{}"'.format('|'.join(str(x) for x in value)) if len(value) > 1 else str(value[0])
+                    values.append(str(value))
+                tsv_file.write('\t'.join(values) + '\n')
+        return path
+
+    def test_compressed_and_tsv_input(self):
+        with open(hgnc_test_file) as json_file:
+            docs = json.load(json_file)['response']['docs']
+        with open(hgnc_test_file, 'rb') as json_file:
+            content = json_file.read()
+
+        for extension, open_compressed in (('.gz', gzip.open), ('.bz2', bz2.BZ2File)):
+            self.check_compressed_input(extension, open_compressed, content, docs)
+
+        tsv_file = self.dump_hgnc_tsv('hgnc_complete_set.txt', docs)
+        tsv_docs = list(reader.iter_hgnc_docs(tsv_file))
+        self.assertEqual([bulk.doc_to_record(doc) for doc in docs], [bulk.doc_to_record(doc) for doc in tsv_docs])
+
+        json_manager = self.get_manager('json.db')
+        json_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+        tsv_manager = self.get_manager('tsv.db')
+        tsv_manager.db_import(silent=True, hgnc_file_path=tsv_file, hcop_file_path=hcop_test_file)
+        self.assertEqual(self.get_counts(json_manager), self.get_counts(tsv_manager))
+        for manager in (json_manager, tsv_manager):
+            manager.session.close()
+
+    @unittest.skipIf(lzma is None, 'lzma is not installed')
+    def test_xz_input(self):
+        with open(hgnc_test_file) as json_file:
+            docs = json.load(json_file)['response']['docs']
+        with open(hgnc_test_file, 'rb') as json_file:
+            content = json_file.read()
+        self.check_compressed_input('.xz', lzma.LZMAFile, content, docs)
+
+    def check_compressed_input(self, extension, open_compressed, content, docs):
+        path = os.path.join(self.tmp_dir, 'hgnc.json' + extension)
+        with open_compressed(path, 'wb') as compressed_file:
+            compressed_file.write(content)
+        self.assertEqual(docs, list(reader.iter_hgnc_docs(path)))
+
+    def test_iter_json_docs(self):
+        with open(hgnc_test_file) as json_file:
+            expected_docs = json.load(json_file)['response']['docs']
+
+        with open(hgnc_test_file, 'rb') as json_file:
+            content = json_file.read()
+
+        for chunk_size in (1, 7, 4096):
+            docs = list(reader.iter_json_docs(io.BytesIO(content), chunk_size=chunk_size))
+            self.assertEqual(expected_docs, docs)
+
+        self.assertEqual([], list(reader.iter_json_docs(io.StringIO(u'{"response": {"docs" : [ ]}}'))))
+
+    def dump_hgnc_json(self, name, docs):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as json_file:
+            json.dump({'response': {'docs': docs}}, json_file)
+        return path
+
+    def test_incremental_update(self):
+        with open(hgnc_test_file) as json_file:
+            a1bg, a1cf, zswim1 = sorted(json.load(json_file)['response']['docs'], key=lambda doc: doc['symbol'])
+
+        changed_a1cf = dict(a1cf, date_modified='2017-10-01', alias_symbol=['ACF_NEW'], pubmed_id=[11815617])
+        new_doc = dict(zswim1, hgnc_id='HGNC:99999', symbol='NEWGENE', uuid='new-uuid', pubmed_id=[1])
+
+        # A1BG is new (orthology predictions have to be linked), ZSWIM1 is withdrawn and A1CF changed
+        old_hgnc_file = self.dump_hgnc_json('hgnc_old.json', [a1cf, zswim1])
+        new_hgnc_file = self.dump_hgnc_json('hgnc_new.json', [a1bg, changed_a1cf, new_doc])
+
+        incremental_manager = self.get_manager('incremental.db')
+        incremental_manager.db_import(silent=True, hgnc_file_path=old_hgnc_file, hcop_file_path=hcop_test_file)
+        incremental_manager.db_import(silent=True, hgnc_file_path=new_hgnc_file, hcop_file_path=hcop_test_file,
+                                      incremental=True)
+
+        full_manager = self.get_manager('full.db')
+        full_manager.db_import(silent=True, hgnc_file_path=new_hgnc_file, hcop_file_path=hcop_test_file)
+
+        self.assertEqual(self.get_counts(full_manager), self.get_counts(incremental_manager))
+
+        session = incremental_manager.session
+        a1cf_row = session.query(models.HGNC).filter(models.HGNC.symbol == 'A1CF').one()
+        self.assertEqual(['ACF_NEW'], [x.alias_symbol for x in a1cf_row.alias_symbols])
+        self.assertEqual([11815617], [x.pubmedid for x in a1cf_row.pubmeds])
+        self.assertEqual(0, session.query(models.HGNC).filter(models.HGNC.symbol == 'ZSWIM1').count())
+        a1bg_row = session.query(models.HGNC).filter(models.HGNC.symbol == 'A1BG').one()
+        self.assertEqual(24, len(a1bg_row.orthology_predictions))
+
+        for manager in (incremental_manager, full_manager):
+            manager.session.close()
+
+    def test_incremental_update_changed_hcop(self):
+        with open(hcop_test_file) as hcop_file:
+            lines = hcop_file.readlines()
+        old_hcop_file = os.path.join(self.tmp_dir, 'hcop_old.txt')
+        with open(old_hcop_file, 'w') as hcop_file:
+            hcop_file.writelines(lines[:40])
+
+        manager = self.get_manager('changed_hcop.db')
+        manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=old_hcop_file)
+        self.assertEqual(39, manager.session.query(models.OrthologyPrediction).count())
+        manager.session.close()
+
+        # only the HCOP file has changed
+        report = manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file,
+                                   incremental=True)
+        self.assertTrue(report['imported'])
+        self.assertEqual(len(lines) - 1, manager.session.query(models.OrthologyPrediction).count())
+        manager.session.close()
+
+        full_manager = self.get_manager('full.db')
+        full_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+        self.assertEqual(self.get_counts(full_manager), self.get_counts(manager))
+        self.assertEqual(full_manager.session.query(models.BestOrtholog).count(),
+                         manager.session.query(models.BestOrtholog).count())
+        full_manager.session.close()
+
+        report = manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+        self.assertFalse(report['imported'])
+        manager.session.close()
+
+    def test_incremental_update_foreign_keys(self):
+        with open(hgnc_test_file) as json_file:
+            docs = json.load(json_file)['response']['docs']
+        hgnc_file = self.dump_hgnc_json('hgnc_all.json', docs)
+        withdrawn_hgnc_file = self.dump_hgnc_json('hgnc_withdrawn.json', docs[1:])
+
+        manager = self.get_manager('foreign_keys.db')
+
+        def enforce_foreign_keys(dbapi_connection, connection_record):
+            dbapi_connection.execute('PRAGMA foreign_keys = ON')
+
+        event.listen(manager.engine, 'connect', enforce_foreign_keys)
+        manager.engine.dispose()
+
+        manager.db_import(silent=True, hgnc_file_path=hgnc_file, hcop_file_path=hcop_test_file, sqlite_fast=False)
+        self.assertEqual(1, manager.session.query(models.HGNC).filter(models.HGNC.identifier == 5).count())
+        self.assertTrue(manager.session.query(models.BestOrtholog).filter(models.BestOrtholog.hgnc_id == 1).count())
+        manager.session.close()
+
+        # A1BG (with best orthologs) is withdrawn
+        manager.db_import(silent=True, hgnc_file_path=withdrawn_hgnc_file, hcop_file_path=hcop_test_file,
+                          incremental=True)
+        self.assertEqual(1, manager.engine.execute('PRAGMA foreign_keys').scalar())
+        self.assertEqual(0, manager.session.query(models.HGNC).filter(models.HGNC.identifier == 5).count())
+        self.assertEqual(0, manager.session.query(models.BestOrtholog).join(models.HGNC).filter(
+            models.HGNC.identifier == 5).count())
+        self.assertEqual(len(docs) - 1, manager.session.query(models.BestOrtholog.hgnc_id).distinct().count())
+        manager.session.close()
+
+        # A1BG is new again, its unlinked predictions are reloaded
+        manager.db_import(silent=True, hgnc_file_path=hgnc_file, hcop_file_path=hcop_test_file, incremental=True)
+        self.assertEqual(len(docs), manager.session.query(models.BestOrtholog.hgnc_id).distinct().count())
+        manager.session.close()
+
+    def test_shadow_schema_checks(self):
+        live_manager = self.get_manager('live.db')
+        live_manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file)
+        sources = live_manager.fetch_sources(hgnc_test_file, hcop_test_file)
+        self.assertTrue(live_manager.is_imported({source: task.result() for source, task in sources.items()}))
+
+        # an attached empty SQLite database stands in for the (dropped) shadow schema of MySQL/PostgreSQL
+        shadow_path = os.path.join(self.tmp_dir, 'shadow_schema.db')
+        shadow_manager = DbManager(connection=live_manager.connection, schema='shadow')
+
+        def attach_shadow(dbapi_connection, connection_record):
+            dbapi_connection.execute("ATTACH DATABASE '{}' AS shadow".format(shadow_path))
+
+        event.listen(shadow_manager.engine, 'connect', attach_shadow)
+
+        self.assertFalse(shadow_manager._has_hgnc_data())
+        self.assertFalse(shadow_manager.is_imported({source: task.result() for source, task in sources.items()}))
+        self.assertIsNone(shadow_manager.get_checkpoint(sources))
+        with shadow_manager.engine.connect() as connection:
+            self.assertIsNone(lookup.get_release_marker(connection, 'shadow'))
+        with live_manager.engine.connect() as connection:
+            self.assertIsNotNone(lookup.get_release_marker(connection))
+        live_manager.session.close()
+
+    def test_shadow_import(self):
+        with open(hgnc_test_file) as json_file:
+            docs = json.load(json_file)['response']['docs']
+        two_genes_file = self.dump_hgnc_json('hgnc_two.json', docs[:2])
+
+        database_path = os.path.join(self.tmp_dir, 'shadow.db')
+        manager = self.get_manager('shadow.db')
+        manager.db_import(silent=True, hgnc_file_path=two_genes_file, hcop_file_path=hcop_test_file)
+
+        reader_manager = self.get_manager('shadow.db')
+        self.assertEqual(2, reader_manager.session.query(models.HGNC).count())
+
+        manager.db_import(silent=True, hgnc_file_path=hgnc_test_file, hcop_file_path=hcop_test_file, shadow=True)
+
+        self.assertFalse(os.path.exists(database_path + defaults.SHADOW_SUFFIX))
+        new_manager = self.get_manager('shadow.db')
+        self.assertEqual(3, new_manager.session.query(models.HGNC).count())
+
+        for manager in (reader_manager, new_manager):
+            manager.session.close()
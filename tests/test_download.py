@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from functools import partial
+
+from pyhgnc.manager.download import DownloadCache, md5sum
+
+try:
+    from http.server import HTTPServer, SimpleHTTPRequestHandler
+except ImportError:
+    HTTPServer = None
+
+
+class TestDownloadCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.remote_dir = os.path.join(self.tmp_dir, 'remote')
+        os.mkdir(self.remote_dir)
+        self.cache = DownloadCache(cache_dir=os.path.join(self.tmp_dir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_remote(self, content, mtime):
+        path = os.path.join(self.remote_dir, 'hgnc.json')
+        with open(path, 'w') as remote_file:
+            remote_file.write(content)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def check_refetch(self, url, path):
+        first = self.cache.fetch(url, silent=True)
+        self.assertTrue(first['changed'])
+        self.assertEqual(md5sum(path), first['md5'])
+        self.assertTrue(first['path'].endswith('hgnc.json'))
+
+        # unchanged: cached file is not written again
+        os.utime(first['path'], (1, 1))
+        second = self.cache.fetch(url, silent=True)
+        self.assertFalse(second['changed'])
+        self.assertEqual(1, os.stat(second['path']).st_mtime)
+
+        # same content, new modification time: downloaded again, but content is unchanged
+        self.write_remote('{"docs": []}', mtime=1500000000)
+        self.assertFalse(self.cache.fetch(url, silent=True)['changed'])
+
+        self.write_remote('{"docs": [{}]}', mtime=1600000000)
+        third = self.cache.fetch(url, silent=True)
+        self.assertTrue(third['changed'])
+        with open(third['path']) as cached_file:
+            self.assertEqual('{"docs": [{}]}', cached_file.read())
+
+    def test_file_url(self):
+        path = self.write_remote('{"docs": []}', mtime=1400000000)
+        self.check_refetch('file://' + path, path)
+
+    @unittest.skipIf(HTTPServer is None, 'needs Python 3')
+    def test_http_conditional_request(self):
+        path = self.write_remote('{"docs": []}', mtime=1400000000)
+
+        handler = partial(SimpleHTTPRequestHandler, directory=self.remote_dir)
+        handler.log_message = lambda *args: None
+        server = HTTPServer(('127.0.0.1', 0), handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        try:
+            self.check_refetch('http://127.0.0.1:{}/hgnc.json'.format(server.server_port), path)
+        finally:
+            server.shutdown()
+            server.server_close()
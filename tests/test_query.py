@@ -96,6 +96,15 @@ class TestQuery(unittest.TestCase):
 
         hgnc_df = self.query.hgnc(symbol="A1BG", as_df=True)
         self.assertIsInstance(hgnc_df, DataFrame)
+        self.assertEqual('Approved', hgnc_df.status[0])
+
+    def test_query_hgnc_lookups(self):
+        self.assertEqual(1, self.query.session.query(models.Status).count())
+        self.assertEqual(3, len(self.query.hgnc(status='Approved')))
+        self.assertEqual(0, len(self.query.hgnc(status='Entry Withdrawn')))
+        self.assertEqual(3, len(self.query.hgnc(locus_group='protein%')))
+        self.assertEqual(['A1BG'], [x.symbol for x in self.query.hgnc(locus_type='gene with protein product',
+                                                                      symbol='A1BG')])
 
     def test_query_orthology_prediction(self):
         orthology_predictions = self.query.orthology_prediction(hgnc_identifier=5)
@@ -107,6 +116,64 @@ class TestQuery(unittest.TestCase):
         orthology_predictions_df = self.query.orthology_prediction(as_df=True)
         self.assertIsInstance(orthology_predictions_df, DataFrame)
 
+    def test_query_orthology_prediction_support(self):
+        self.assertEqual(13, self.query.session.query(models.SupportResource).count())
+        self.assertEqual(36, len(self.query.orthology_prediction(support_resource='Ensembl')))
+        self.assertEqual(11, len(self.query.orthology_prediction(support_resource='Ensembl', hgnc_identifier=5)))
+        self.assertEqual(4, len(self.query.orthology_prediction(support_resource=('HGNC', 'ZFIN'))))
+        self.assertEqual(9, len(self.query.orthology_prediction(min_support=5, hgnc_identifier=5)))
+
+        for prediction in self.query.orthology_prediction(support_resource='PhylomeDB'):
+            self.assertEqual(len(prediction.support.split(',')), prediction.support_count)
+            self.assertIn('PhylomeDB', [resource.name for resource in prediction.support_resources])
+
+    def test_query_best_ortholog(self):
+        self.assertEqual(41, self.query.session.query(models.BestOrtholog).count())
+        self.assertEqual(13, len(self.query.best_ortholog(hgnc_symbol='A1BG')))
+
+        best_orthologs = self.query.best_ortholog(hgnc_identifier=5, ortholog_species=10090)
+        self.assertEqual(1, len(best_orthologs))
+        self.assertEqual('A1bg', best_orthologs[0].ortholog_species_symbol)
+        self.assertEqual(12, best_orthologs[0].support_count)
+        self.assertEqual('A1BG', best_orthologs[0].to_dict()['hgnc_symbol'])
+
+        self.assertEqual(1, len(self.query.best_ortholog(hgnc_identifier=5, ortholog_species=8364)))
+        self.assertEqual(4, len(self.query.best_ortholog(hgnc_identifier=5, min_support=10)))
+
+    def test_resolve_symbols(self):
+        symbols = ['A1BG', 'C20orf162', 'ACF', 'unknown', 'A1BG', 'dJ337O18.5', 'a1bg']
+        for chunk_size in (1, 500):
+            resolved, unresolved = self.query.resolve_symbols(iter(symbols), chunk_size=chunk_size)
+            self.assertEqual({
+                'A1BG': (5, 'symbol', False),
+                'C20orf162': (16155, 'previous_symbol', False),
+                'dJ337O18.5': (16155, 'alias_symbol', False),
+                'ACF': (24086, 'alias_symbol', False),
+            }, resolved)
+            self.assertEqual(['unknown', 'a1bg'], unresolved)
+            self.assertEqual('symbol', resolved['A1BG'].match_type)
+
+    def test_query_match_modes(self):
+        def symbols(**kwargs):
+            return sorted(x.symbol for x in self.query.hgnc(**kwargs))
+
+        self.assertEqual(['A1BG'], symbols(symbol='A1BG'))
+        self.assertEqual([], symbols(symbol='a1bg'))
+        self.assertEqual(['A1BG'], symbols(symbol='a1bg', match='case_insensitive'))
+        self.assertEqual(['A1BG', 'A1CF'], symbols(symbol='A1%'))
+        self.assertEqual(['A1BG', 'A1CF'], symbols(symbol='A1', match='prefix'))
+        self.assertEqual([], symbols(symbol='A1%', match='prefix'))
+        self.assertEqual(['A1BG', 'ZSWIM1'], symbols(symbol=('A1B', 'ZSW'), match='prefix'))
+        self.assertEqual(['A1CF'], symbols(alias_symbol='acf', match='case_insensitive'))
+        self.assertEqual(['A1BG', 'A1CF', 'ZSWIM1'], symbols(status='approved', match='case_insensitive'))
+        self.assertEqual(['ZSWIM1'], symbols(uniprotid='Q9B', match='prefix'))
+        self.assertEqual(8, len(self.query.orthology_prediction(ortholog_species_symbol='A1BG')))
+        self.assertEqual(10, len(self.query.orthology_prediction(hgnc_symbol='a1bg', ortholog_species_symbol='a1bg',
+                                                                 match='case_insensitive')))
+
+        with self.assertRaises(ValueError):
+            self.query.hgnc(symbol='A1BG', match='fuzzy')
+
     def test_query_alias_symbol(self):
         ZSWIM1_aliases = [
             {